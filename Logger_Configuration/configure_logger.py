@@ -1,42 +1,207 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime, timezone
 
 LOGGER_NAME = "Logger"
 FORMATTER = "%(asctime)s - %(name)s - %(levelname)s : %(message)s"
 LOGGING_LEVEL = logging.DEBUG
 
+# Rotation defaults: a 10 MiB file with five backups, or a new file every midnight
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+ROTATE_WHEN = "midnight"
+
+# Attributes of every LogRecord; anything else was passed with extra={...}
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Renders tracebacks on the logging thread before records are queued
+_TRACEBACKS = logging.Formatter()
+
+# Queue listeners of queued loggers, by logger name
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line.
+
+    Fields passed with extra={...}, such as route, latency_ms or records,
+    are written alongside the time, level, logger, thread and message.
+    """
+
+    def format(self, record):
+        document = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.thread,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in RECORD_ATTRIBUTES and not name.startswith("_"):
+                document[name] = value
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            document["exception"] = record.exc_text
+        return json.dumps(document, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fixed fraction of records below a level and every record at or above it.
+
+    With a rate of 0.1 one INFO line in ten is kept, evenly spaced, while
+    warnings and errors are always kept.
+    """
+
+    def __init__(self, rate, level=logging.WARNING):
+        super().__init__()
+        if not 0 <= rate <= 1:
+            raise ValueError("The sample rate must be between 0 and 1")
+        self.rate = rate
+        self.level = level
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.level or self.rate == 1:
+            return True
+        with self._lock:
+            self._credit += self.rate
+            if self._credit < 1:
+                return False
+            self._credit -= 1
+            return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener with their message and traceback rendered
+    but not yet formatted, so the listener's formatter, JSON or text, still
+    sees the traceback and the extra fields separately.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _TRACEBACKS.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+
+def _file_handler(log_file_name, rotation, max_bytes, backup_count, when):
+    """this function will create the file handler for the given rotation mode"""
+    if rotation is None:
+        return logging.FileHandler(filename=log_file_name)
+    if rotation == "size":
+        return logging.handlers.RotatingFileHandler(
+            log_file_name, maxBytes=max_bytes, backupCount=backup_count
+        )
+    if rotation == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file_name, when=when, backupCount=backup_count
+        )
+    raise ValueError(f"Unknown log rotation {rotation!r}, use 'size' or 'time'")
+
+
+def stop_logging(logger_name=LOGGER_NAME):
+    """
+    Flushes and stops the queue listener of a logger and removes its handlers.
+
+    Args:
+        logger_name (str): The name of the logger. Default is “Logger”.
+    """
+    with _listeners_lock:
+        listener = _listeners.pop(logger_name, None)
+    if listener is not None:
+        listener.stop()
+    logger = logging.getLogger(logger_name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    if listener is not None:
+        for handler in listener.handlers:
+            handler.close()
+
 
 def config_logging(
     logger_name=LOGGER_NAME,
     formatter=FORMATTER,
     log_file_name=None,
     logging_level=LOGGING_LEVEL,
+    queued=False,
+    rotation=None,
+    max_bytes=MAX_BYTES,
+    backup_count=BACKUP_COUNT,
+    when=ROTATE_WHEN,
+    json_format=False,
+    sample_rate=1.0,
 ):
     """
     Configures and returns a logger object with the specified parameters.
 
+    Calling it again for the same logger replaces the handlers of the earlier
+    call instead of adding a second set.
+
     Args:
         logger_name (str): The name of the logger. Default is “Logger”.
         formatter (str): The format string for the log messages. Default is “%(asctime)s - %(name)s - %(levelname)s : %(message)s”.
         log_file_name (str): The name of the file where the log messages will be written. Default is None.
         logging_level (int): The level of logging. Default is logging.DEBUG.
-    
+        queued (bool): Hand records to a queue and write them from a listener thread, so logging never blocks the caller on I/O. Default is False.
+        rotation (str): "size" to rotate the log file at max_bytes, "time" to rotate it at when, or None to never rotate. Default is None.
+        max_bytes (int): The size at which a size-rotated file is rotated. Default is 10 MiB.
+        backup_count (int): The number of rotated files kept. Default is 5.
+        when (str): The TimedRotatingFileHandler interval of a time-rotated file. Default is “midnight”.
+        json_format (bool): Write each record as a JSON object carrying its extra fields instead of using formatter. Default is False.
+        sample_rate (float): The fraction of records below WARNING that are kept. Default is 1.0.
+
     Returns:
         logger (logging.Logger): The configured logger object.
-    
+
     """
 
+    stop_logging(logger_name)
     logger = logging.getLogger(logger_name)
-    logging_format = logging.Formatter(formatter)
+    logging_format = JsonFormatter() if json_format else logging.Formatter(formatter)
 
     if log_file_name:
-        file_handler = logging.FileHandler(filename=log_file_name)
-        file_handler.setFormatter(logging_format)
-        logger.addHandler(file_handler)
+        handler = _file_handler(log_file_name, rotation, max_bytes, backup_count, when)
     else:
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging_format)
-        logger.addHandler(console_handler)
+        handler = logging.StreamHandler()
+    handler.setFormatter(logging_format)
+
+    if queued:
+        records = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            records, handler, respect_handler_level=True
+        )
+        listener.start()
+        with _listeners_lock:
+            _listeners[logger_name] = listener
+        handler = _QueueHandler(records)
 
+    if sample_rate < 1:
+        handler.addFilter(SamplingFilter(sample_rate))
+    logger.addHandler(handler)
     logger.setLevel(logging_level)
 
     return logger
+
+
+@atexit.register
+def _stop_listeners():
+    """this function will flush every queued logger when the process exits"""
+    for logger_name in list(_listeners):
+        stop_logging(logger_name)
@@ -3,21 +3,98 @@ All Required APIs for the project
 
 """
 
-from fastapi import FastAPI
-from models.employee import Employee
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from enum import Enum
+from fastapi import Depends, FastAPI, Path, Query, Request, Response
+from models.employee import (
+    BatchItemResult,
+    BatchStatusEnum,
+    Employee,
+    EmployeeUpdate,
+    GenderEnum,
+    StatusEnum,
+)
 import helpers.features as f
 import helpers.report_functions as rep
+from helpers.changes import ChangeNotifier
+from helpers.http_cache import (
+    CACHEABLE_MEDIA_TYPES,
+    ResponseCache,
+    etag_matches,
+    make_etag,
+)
+from helpers.indexes import DEFAULT_SIMILARITY
+from helpers.pagination import DEFAULT_PAGE_SIZE
+from helpers.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    HTTP_ERRORS,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_SIZE,
+    registry,
+)
+from helpers.serialization import dumps
+from helpers.storage import ChangesExpiredError, ReadOnlyStoreError
 from Logger_Configuration.configure_logger import config_logging
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.routing import Match
+from datetime import date
 from uuid import uuid4
+import json
 import logging
 import os
+import time
+
+# Storage calls block on locks and disk I/O, so they run on a bounded pool
+# instead of the event loop thread
+STORAGE_WORKERS = int(os.environ.get("EMP_STORAGE_WORKERS", "8"))
+storage_executor = ThreadPoolExecutor(
+    max_workers=STORAGE_WORKERS, thread_name_prefix="emp-storage"
+)
+
+
+async def _run_storage(function, *args, **kwargs):
+    """
+    Runs a blocking storage function on the storage executor and awaits its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        storage_executor, partial(function, *args, **kwargs)
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the employee store once when the application starts and closes it
+    on shutdown.
+    """
+    await _run_storage(f.load_store)
+    yield
+    await _run_storage(f.close_store)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 ROOT_PATH = os.path.dirname(__file__)
-LOG_PATH = os.path.join(ROOT_PATH, "logs", "emp_log.log")
+
+# Logging is written from a listener thread so requests never wait on the
+# log file. Set EMP_LOG_PATH to write elsewhere than logs/emp_log.log,
+# EMP_LOG_QUEUE=0 to write synchronously, EMP_LOG_ROTATION to "size", "time"
+# or "none", EMP_LOG_JSON=1 for JSON lines and EMP_LOG_SAMPLE_RATE to the
+# fraction of INFO lines to keep.
+LOG_PATH = os.environ.get(
+    "EMP_LOG_PATH", os.path.join(ROOT_PATH, "logs", "emp_log.log")
+)
+LOG_QUEUED = os.environ.get("EMP_LOG_QUEUE", "1") != "0"
+LOG_ROTATION = os.environ.get("EMP_LOG_ROTATION", "size")
+LOG_JSON = os.environ.get("EMP_LOG_JSON", "0") == "1"
+LOG_SAMPLE_RATE = float(os.environ.get("EMP_LOG_SAMPLE_RATE", "1"))
 
 # Configuring logging
 logger = config_logging(
@@ -25,9 +102,257 @@ logger = config_logging(
     formatter="%(asctime)s %(levelname)s %(thread)d - %(message)s",
     log_file_name=LOG_PATH,
     logging_level=logging.INFO,
+    queued=LOG_QUEUED,
+    rotation=None if LOG_ROTATION == "none" else LOG_ROTATION,
+    json_format=LOG_JSON,
+    sample_rate=LOG_SAMPLE_RATE,
 )
 
 
+@app.exception_handler(ReadOnlyStoreError)
+async def read_only_store(request: Request, exc: ReadOnlyStoreError):
+    """
+    Answers writes sent to a read-only replica with 405 Method Not Allowed.
+    """
+    logger.error(exc)
+    return JSONResponse(
+        status_code=405, content={"detail": str(exc)}, headers={"Allow": "GET"}
+    )
+
+
+# Encoded GET responses, reused until the data version changes
+response_cache = ResponseCache()
+
+# GET routes answered without a data-version ETag or the response cache
+UNVERSIONED_PATHS = {"/metrics", "/changes", "/changes/stream"}
+
+# Wakes change feed requests waiting for a write handled by this process
+change_notifier = ChangeNotifier()
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """
+    Answers GET requests from the data version before touching the data.
+
+    Every successful GET carries an ETag built from the data version, the
+    path, the query and the Accept header. A request whose If-None-Match
+    still matches gets a 304, and a JSON response already built at the
+    current version is sent again from its cached bytes. Streamed NDJSON
+    and CSV responses get an ETag but are not cached. Successful writes
+    wake the change feed requests that are waiting for one.
+    """
+    if request.method != "GET":
+        response = await call_next(request)
+        if response.status_code < 400:
+            change_notifier.notify()
+        return response
+    if request.url.path in UNVERSIONED_PATHS:
+        return await call_next(request)
+    version = await _run_storage(f.get_data_version)
+    key = (request.url.path, request.url.query, request.headers.get("accept", ""))
+    etag = make_etag(version, key)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    cached = response_cache.get(key, version)
+    if cached is not None:
+        body, headers = cached
+        return Response(body, headers=headers)
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    response.headers["ETag"] = etag
+    media_type = response.headers.get("content-type", "").split(";")[0]
+    if media_type not in CACHEABLE_MEDIA_TYPES:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = dict(response.headers)
+    response_cache.put(key, version, body, headers)
+    return Response(body, headers=headers)
+
+
+def _route_template(request: Request):
+    """
+    Returns the path template of the route a request was routed to, e.g.
+    /employees/{id}, so metrics do not get one series per employee.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        # Requests answered by a middleware never reach the router
+        for candidate in app.router.routes:
+            if candidate.matches(request.scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return route.path if route is not None else "unmatched"
+
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    """
+    Counts every request and observes its latency and response size per route.
+
+    Registered last, so it wraps the conditional GET middleware and 304s and
+    cached responses are measured too. The latency of a streamed response
+    covers the time to its first byte.
+    """
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        _observe_request(request, 500, start)
+        raise
+    _observe_request(request, response.status_code, start)
+    length = response.headers.get("content-length")
+    if length is not None:
+        HTTP_RESPONSE_SIZE.observe(
+            int(length), method=request.method, route=_route_template(request)
+        )
+    return response
+
+
+def _observe_request(request: Request, status_code, start):
+    """this function will record the count, errors and latency of a request and log it"""
+    route = _route_template(request)
+    latency = time.perf_counter() - start
+    HTTP_REQUESTS.inc(method=request.method, route=route, status=str(status_code))
+    if status_code >= 400:
+        HTTP_ERRORS.inc(method=request.method, route=route)
+    HTTP_LATENCY.observe(latency, method=request.method, route=route)
+    logger.info(
+        "%s %s %s %.1f ms",
+        request.method,
+        route,
+        status_code,
+        latency * 1000,
+        extra={
+            "method": request.method,
+            "route": route,
+            "status": status_code,
+            "latency_ms": round(latency * 1000, 3),
+            "records": getattr(request.state, "record_count", None),
+        },
+    )
+
+
+# Largest number of changes sent in one /changes response, longest long-poll
+# wait, how often waiting requests look for writes made by other workers,
+# and the idle time after which an SSE stream sends a keep-alive comment
+MAX_CHANGES_LIMIT = 1000
+MAX_CHANGES_WAIT = 60
+CHANGE_POLL_SECONDS = 1.0
+SSE_KEEPALIVE_SECONDS = 15
+
+# Largest number of employees accepted by one batch request
+MAX_BATCH_SIZE = 10000
+
+# Pagination and streaming of employee lists
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MAX_PAGE_SIZE = 1000
+
+
+class OrderByEnum(str, Enum):
+    emp_id = "emp_id"
+    created_date = "created_date"
+
+
+class NameSearchModeEnum(str, Enum):
+    prefix = "prefix"
+    substring = "substring"
+    fuzzy = "fuzzy"
+
+
+def page_params(
+    limit: Optional[int] = Query(default=None, gt=0, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    order_by: OrderByEnum = Query(default=OrderByEnum.emp_id),
+):
+    """
+    Collects the keyset pagination query parameters of a list route.
+    """
+    return {"limit": limit, "cursor": cursor, "order_by": order_by.value}
+
+
+def _wants_ndjson(request: Request):
+    """
+    Returns True if the client asked for newline delimited JSON.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+class EmployeeJSONResponse(Response):
+    """
+    A JSON response for content that is already encoded as bytes.
+
+    Stored records are validated when written, so read routes send their
+    cached JSON bytes instead of rebuilding an Employee model per record.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content):
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def _ndjson_response(employees):
+    """
+    Streams employee records one JSON document per line as they are serialized.
+    """
+    return StreamingResponse(
+        (f.encode_employee(employee) + b"\n" for employee in employees),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def _employees_response(employees, headers=None):
+    """
+    Encodes a list of stored employees on the storage executor and returns it as JSON.
+    """
+    content = await _run_storage(f.encode_employees, employees)
+    return EmployeeJSONResponse(content, headers=headers)
+
+
+async def _page_response(request: Request, employees, next_cursor):
+    """
+    Returns a page of employees as JSON or NDJSON with its next-page cursor.
+    """
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    request.state.record_count = len(employees)
+    if _wants_ndjson(request):
+        streaming_response = _ndjson_response(employees)
+        streaming_response.headers.update(headers)
+        return streaming_response
+    return await _employees_response(employees, headers)
+
+
+async def _list_response(request: Request, page, criteria, find, *args):
+    """
+    Returns the result of a filter route as JSON or NDJSON.
+
+    Without a limit or cursor find(*args) returns the whole result. Otherwise
+    one page of the employees matching the criteria, the keyword arguments
+    of helpers.query.search_predicates, is read off the store's ordering,
+    DEFAULT_PAGE_SIZE long if no limit is given, so the whole result is
+    never built or sorted.
+    """
+    if page["limit"] is None and page["cursor"] is None:
+        employees = await _run_storage(find, *args)
+        return await _page_response(request, employees, None)
+    try:
+        employees, next_cursor = await _run_storage(
+            f.get_employees_page,
+            page["order_by"],
+            page["cursor"],
+            page["limit"] or DEFAULT_PAGE_SIZE,
+            **criteria,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return await _page_response(request, employees, next_cursor)
+
+
 @app.get("/")
 async def root():
     """
@@ -39,23 +364,301 @@ async def root():
     return "Welcome to Employee Management System"
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Get the request and storage metrics in the Prometheus text format.
+
+    Returns:
+        Response: Per-route request counts, error counts and latency and size
+        histograms, and storage operation latency and payload histograms.
+    """
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+async def _read_changes(since, limit):
+    """
+    Reads the changes after since, answering an expired sequence number with 410.
+    """
+    try:
+        return await _run_storage(f.get_changes, since, limit)
+    except ChangesExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e)) from e
+
+
+def _sse_event(event, data, id=None):
+    """
+    Formats one Server-Sent Event with a JSON data line.
+    """
+    lines = [f"id: {id}".encode("ascii")] if id is not None else []
+    lines += [f"event: {event}".encode("ascii"), b"data: " + dumps(data)]
+    return b"\n".join(lines) + b"\n\n"
+
+
+@app.get("/changes")
+async def get_changes(
+    since: Optional[int] = Query(default=None, ge=0),
+    limit: int = Query(default=MAX_CHANGES_LIMIT, gt=0, le=MAX_CHANGES_LIMIT),
+    wait: float = Query(default=0, ge=0, le=MAX_CHANGES_WAIT),
+):
+    """
+    Get the employee changes made after a sequence number.
+
+    Without since only the current head is returned. A client keeps it,
+    loads /employees and from then on applies the changes since the last
+    sequence number it has seen. With wait the request is held until a
+    change arrives or wait seconds have passed (long-poll).
+
+    Args:
+        since (int): The last sequence number the client has applied.
+        limit (int): The maximum number of changes to return.
+        wait (float): How many seconds to wait for a change when there is none yet.
+
+    Returns:
+        dict: The changes, each with its seq, op, emp_id and the employee
+        after the change (None for a delete), last_seq to send as since next
+        time, and the head of the change log.
+
+    Raises:
+        HTTPException: 410 if the changes after since are no longer kept;
+        the client must then reload the employees.
+    """
+    logger.info("Get changes called")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        changes, head = await _read_changes(since, limit)
+        remaining = deadline - loop.time()
+        if changes or since is None or remaining <= 0:
+            break
+        await change_notifier.wait(min(remaining, CHANGE_POLL_SECONDS))
+    if changes:
+        last_seq = changes[-1]["seq"]
+    else:
+        last_seq = head if since is None else since
+    return Response(
+        dumps({"changes": changes, "last_seq": last_seq, "head": head}),
+        media_type="application/json",
+    )
+
+
+@app.get("/changes/stream")
+async def stream_changes(
+    request: Request, since: Optional[int] = Query(default=None, ge=0)
+):
+    """
+    Stream the employee changes as Server-Sent Events.
+
+    Every change is sent as a "change" event whose id is its sequence
+    number, so a reconnecting EventSource resumes after the Last-Event-ID it
+    sends. Without since or Last-Event-ID the stream starts at the current
+    head. When the changes the stream needs are no longer kept a "reset"
+    event is sent and the stream ends; the client must reload the employees.
+
+    Args:
+        since (int): The last sequence number the client has applied.
+
+    Returns:
+        StreamingResponse: The text/event-stream of changes.
+
+    Raises:
+        HTTPException: 400 for a malformed Last-Event-ID, 410 if the changes
+        after since are no longer kept.
+    """
+    logger.info("Stream changes called")
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None:
+        try:
+            since = int(last_event_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from e
+    if since is None:
+        _, since = await _read_changes(None, 1)
+    changes, _ = await _read_changes(since, MAX_CHANGES_LIMIT)
+
+    async def events(position, changes):
+        loop = asyncio.get_running_loop()
+        last_sent = loop.time()
+        while not await request.is_disconnected():
+            for change in changes:
+                yield _sse_event("change", change, change["seq"])
+                position = change["seq"]
+                last_sent = loop.time()
+            if not changes:
+                await change_notifier.wait(CHANGE_POLL_SECONDS)
+                if loop.time() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                    yield b": keep-alive\n\n"
+                    last_sent = loop.time()
+            try:
+                changes, _ = await _run_storage(
+                    f.get_changes, position, MAX_CHANGES_LIMIT
+                )
+            except ChangesExpiredError as e:
+                yield _sse_event("reset", {"detail": str(e)})
+                return
+
+    return StreamingResponse(
+        events(since, changes),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.get("/employees", response_model=List[Employee])
-async def get_employees():
+async def get_employees(request: Request, page: dict = Depends(page_params)):
     """
     Get a list of employees.
 
+    Without a limit the whole roster is returned. With a limit one page is
+    returned in keyset order and the cursor of the next page is sent in the
+    X-Next-Cursor header. With Accept: application/x-ndjson the records are
+    streamed one JSON object per line.
+
+    Args:
+        page (dict): The limit, cursor and order_by pagination parameters.
+
     Returns:
         List[Employee]: A list of Employee objects representing the existing employees.
 
     Raises:
         HTTPException: If there is an error getting the employees.
     """
+    logger.info("Get employees called")
+    if page["limit"] is None and page["cursor"] is None:
+        if _wants_ndjson(request):
+            return _ndjson_response(f.iter_employees(page["order_by"]))
+        try:
+            employees = await _run_storage(f.get_existing_data)
+            request.state.record_count = len(employees)
+            return await _employees_response(employees)
+        except HTTPException as e:
+            logger.error(e)
+            raise HTTPException(
+                status_code=400, detail="Unable to get employees"
+            ) from e
     try:
-        logger.info("Get employees called")
-        return f.get_existing_data()
-    except HTTPException as e:
+        employees, next_cursor = await _run_storage(
+            f.get_employees_page,
+            page["order_by"],
+            page["cursor"],
+            page["limit"] or DEFAULT_PAGE_SIZE,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return await _page_response(request, employees, next_cursor)
+
+
+@app.get("/employees/search", response_model=List[Employee])
+async def search_employees(
+    request: Request,
+    page: dict = Depends(page_params),
+    department: Optional[str] = Query(default=None),
+    designation: Optional[str] = Query(default=None),
+    status: Optional[StatusEnum] = Query(default=None),
+    gender: Optional[GenderEnum] = Query(default=None),
+    skills: Optional[str] = Query(
+        default=None, description="Comma separated skills, all required"
+    ),
+    min_salary: Optional[float] = Query(default=None, ge=0),
+    max_salary: Optional[float] = Query(default=None, ge=0),
+    created_from: Optional[date] = Query(default=None),
+    created_to: Optional[date] = Query(default=None),
+    explain: bool = Query(default=False),
+):
+    """
+    Search employees matching any mix of criteria at once.
+
+    The search starts from the most selective index and intersects or
+    filters by the remaining criteria. With explain=true the chosen plan
+    and the number of rows examined are returned instead of the employees.
+
+    Args:
+        department (str): The department to match.
+        designation (str): The designation to match.
+        status (StatusEnum): The status to match.
+        gender (GenderEnum): The gender to match.
+        skills (str): Comma separated skills that every employee must have.
+        min_salary (float): The lowest salary to include.
+        max_salary (float): The highest salary to include.
+        created_from (date): The earliest creation date to include.
+        created_to (date): The latest creation date to include.
+        explain (bool): Return the query plan instead of the employees.
+
+    Returns:
+        List[Employee]: A list of Employee objects matching every criterion.
+
+    Raises:
+        HTTPException: If a range is empty or the criteria are invalid.
+    """
+    if min_salary is not None and max_salary is not None and min_salary > max_salary:
+        raise HTTPException(
+            status_code=400, detail="min_salary must not exceed max_salary"
+        )
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(
+            status_code=400, detail="created_from must not be after created_to"
+        )
+    criteria = {
+        "department": department,
+        "designation": designation,
+        "status": status.value if status else None,
+        "gender": gender.value if gender else None,
+        "skills": [skill for skill in (skills or "").split(",") if skill.strip()],
+        "min_salary": min_salary,
+        "max_salary": max_salary,
+        "created_from": created_from.isoformat() if created_from else None,
+        "created_to": created_to.isoformat() if created_to else None,
+    }
+    try:
+        logger.info("Search employees called")
+        if explain:
+            _, plan = await _run_storage(partial(f.search_employees, **criteria))
+            return JSONResponse(plan)
+        return await _list_response(
+            request, page, criteria, partial(f.get_employees_matching, **criteria)
+        )
+    except ValueError as e:
+        logger.error(e)
+        raise HTTPException(status_code=400, detail="Unable to search employees") from e
+
+
+@app.get("/employees/by-name", response_model=List[Employee])
+async def get_employees_by_name(
+    q: str = Query(min_length=1, description="The name, or part of it"),
+    mode: NameSearchModeEnum = Query(default=NameSearchModeEnum.prefix),
+    limit: int = Query(default=20, gt=0, le=MAX_PAGE_SIZE),
+    threshold: float = Query(default=DEFAULT_SIMILARITY, ge=0, le=1),
+):
+    """
+    Search employees by name, ignoring case.
+
+    In prefix mode names starting with q are returned and in substring mode
+    names containing it, both in name order. In fuzzy mode names similar to
+    q are returned most similar first, so typos are tolerated.
+
+    Args:
+        q (str): The name, or part of it, to search for.
+        mode (NameSearchModeEnum): prefix, substring or fuzzy.
+        limit (int): The maximum number of employees to return.
+        threshold (float): The lowest trigram similarity of a fuzzy match.
+
+    Returns:
+        List[Employee]: A list of Employee objects whose name matches.
+
+    Raises:
+        HTTPException: If the search is invalid.
+    """
+    try:
+        logger.info("Get employees by name called")
+        employees = await _run_storage(
+            f.search_employees_by_name, q, mode.value, limit, threshold
+        )
+    except ValueError as e:
         logger.error(e)
-        raise HTTPException(status_code=400, detail="Unable to get employees") from e
+        raise HTTPException(
+            status_code=400, detail="Unable to search employees by name"
+        ) from e
+    return await _employees_response(employees)
 
 
 @app.get("/employees/{id}", response_model=Employee)
@@ -70,17 +673,20 @@ async def get_employee(id: str):
         Employee: The retrieved employee.
 
     Raises:
-        HTTPException: If there is an error retrieving the employee.
+        HTTPException: If the employee does not exist or there is an error retrieving it.
 
     """
     try:
         logger.info("Get employee by id called")
-        return f.get_employee_by_id(id)
+        employee = await _run_storage(f.get_employee_by_id, id)
     except HTTPException as e:
         logger.error(e)
         raise HTTPException(
             status_code=400, detail="Unable to get employee for given id"
         ) from e
+    if employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return EmployeeJSONResponse(f.encode_employee(employee))
 
 
 @app.post("/create_employee", response_model=Employee)
@@ -99,7 +705,7 @@ async def create_employee(new_employee: Employee):
     """
     try:
         new_employee.emp_id = str(uuid4())
-        f.save_employee(new_employee.__dict__)
+        await _run_storage(f.save_employee, new_employee.__dict__)
         logger.info("Create employee called")
         return new_employee
     except HTTPException as e:
@@ -120,15 +726,19 @@ async def update_employee(id: str, updated_employee: Employee):
         Employee: The updated employee record.
 
     Raises:
-        HTTPException: If there is an error updating the employee record.
+        HTTPException: If the employee does not exist or there is an error updating it.
     """
     try:
-        f.update_employee_by_id(id, updated_employee.__dict__)
+        employee = await _run_storage(
+            f.update_employee_by_id, id, updated_employee.__dict__
+        )
         logger.info("update employee called")
-        return updated_employee
     except HTTPException as e:
         logger.error(e)
         raise HTTPException(status_code=400, detail="Unable to update employee") from e
+    if employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
 
 
 @app.delete("/delete_employee/{id}", response_model=Employee)
@@ -140,27 +750,144 @@ async def delete_employee(id: str):
     - id (str): The ID of the employee to be deleted.
 
     Returns:
-    - dict: A dictionary with a message indicating the success of the deletion.
+    - Employee: The deleted employee record.
 
     Raises:
-    - HTTPException: If there is an error deleting the employee.
+    - HTTPException: If the employee does not exist or there is an error deleting it.
     """
     try:
-        employee_data = f.delete_employee_by_id(id)
-        logger.info("Employee deleted successfully")
-        return employee_data
+        employee_data = await _run_storage(f.delete_employee_by_id, id)
     except HTTPException as e:
         logger.error(e)
         raise HTTPException(status_code=400, detail="Unable to delete employee") from e
+    if employee_data is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    logger.info("Employee deleted successfully")
+    return employee_data
+
+
+def _check_batch_size(items):
+    """
+    Rejects empty batches and batches larger than MAX_BATCH_SIZE.
+    """
+    if not items or len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch must hold between 1 and {MAX_BATCH_SIZE} items",
+        )
+
+
+def _batch_results(ids, employees, status):
+    """
+    Builds the per-item results of a batch from the store's return values.
+    """
+    return [
+        {
+            "emp_id": id,
+            "status": status if employee is not None else BatchStatusEnum.not_found,
+            "employee": employee,
+        }
+        for id, employee in zip(ids, employees)
+    ]
+
+
+@app.post("/employees:batchCreate", response_model=List[BatchItemResult])
+async def batch_create_employees(new_employees: List[Employee]):
+    """
+    Creates several employee records with a single write.
+
+    Args:
+        new_employees (List[Employee]): The employees to create; all are validated first.
+
+    Returns:
+        List[BatchItemResult]: The result for each employee, in request order.
+
+    Raises:
+        HTTPException: If the batch size is invalid or there is an error creating the employees.
+    """
+    _check_batch_size(new_employees)
+    try:
+        for new_employee in new_employees:
+            new_employee.emp_id = str(uuid4())
+        employees = await _run_storage(
+            f.save_employees, [new_employee.__dict__ for new_employee in new_employees]
+        )
+        logger.info("Batch create employees called")
+    except HTTPException as e:
+        logger.error(e)
+        raise HTTPException(status_code=400, detail="Unable to create employees") from e
+    return _batch_results(
+        [employee["emp_id"] for employee in employees],
+        employees,
+        BatchStatusEnum.created,
+    )
+
+
+@app.post("/employees:batchUpdate", response_model=List[BatchItemResult])
+async def batch_update_employees(updated_employees: List[EmployeeUpdate]):
+    """
+    Updates several employee records, identified by their emp_id, with a single write.
+
+    Every item must carry the emp_id of the employee it updates; a batch with
+    an item lacking it is rejected with 422 before anything is written.
+
+    Args:
+        updated_employees (List[EmployeeUpdate]): The updated employees; all are validated first.
+
+    Returns:
+        List[BatchItemResult]: The result for each employee, in request order.
+
+    Raises:
+        HTTPException: If the batch size is invalid or there is an error updating the employees.
+    """
+    _check_batch_size(updated_employees)
+    ids = [employee.emp_id for employee in updated_employees]
+    try:
+        employees = await _run_storage(
+            f.update_employees_by_id,
+            [(employee.emp_id, employee.__dict__) for employee in updated_employees],
+        )
+        logger.info("Batch update employees called")
+    except HTTPException as e:
+        logger.error(e)
+        raise HTTPException(status_code=400, detail="Unable to update employees") from e
+    return _batch_results(ids, employees, BatchStatusEnum.updated)
+
+
+@app.post("/employees:batchDelete", response_model=List[BatchItemResult])
+async def batch_delete_employees(ids: List[str]):
+    """
+    Deletes several employee records by ID with a single write.
+
+    Args:
+        ids (List[str]): The IDs of the employees to delete.
+
+    Returns:
+        List[BatchItemResult]: The result for each ID, in request order.
+
+    Raises:
+        HTTPException: If the batch size is invalid or there is an error deleting the employees.
+    """
+    _check_batch_size(ids)
+    try:
+        employees = await _run_storage(f.delete_employees_by_id, ids)
+        logger.info("Batch delete employees called")
+    except HTTPException as e:
+        logger.error(e)
+        raise HTTPException(status_code=400, detail="Unable to delete employees") from e
+    return _batch_results(ids, employees, BatchStatusEnum.deleted)
 
 
 @app.get("/department/{name}", response_model=List[Employee])
-async def get_employees_by_department(name: str):
+async def get_employees_by_department(
+    name: str, request: Request, page: dict = Depends(page_params)
+):
     """
     Get a list of employees by department.
 
     Args:
         name (str): The name of the department.
+        page (dict): The limit, cursor and order_by pagination parameters.
 
     Returns:
         List[Employee]: A list of Employee objects representing the employees in the specified department.
@@ -168,23 +895,22 @@ async def get_employees_by_department(name: str):
     Raises:
         HTTPException: If there is an error getting the employees by department.
     """
-    try:
-        logger.info("Get employees by department called")
-        return f.get_employees_by_department(name)
-    except HTTPException as e:
-        logger.error(e)
-        raise HTTPException(
-            status_code=400, detail="Unable to get employees by department"
-        ) from e
+    logger.info("Get employees by department called")
+    return await _list_response(
+        request, page, {"department": name}, f.get_employees_by_department, name
+    )
 
 
 @app.get("/designation/{name}", response_model=List[Employee])
-async def get_employees_by_designation(name: str):
+async def get_employees_by_designation(
+    name: str, request: Request, page: dict = Depends(page_params)
+):
     """
     Get a list of employees by designation.
 
     Args:
         name (str): The name of the designation.
+        page (dict): The limit, cursor and order_by pagination parameters.
 
     Returns:
         List[Employee]: A list of Employee objects representing the employees in the specified designation.
@@ -192,24 +918,24 @@ async def get_employees_by_designation(name: str):
     Raises:
         HTTPException: If there is an error getting the employees by designation.
     """
-    try:
-        logger.info("Get employees by designation called")
-        return f.get_employees_by_designation(name)
-
-    except HTTPException as e:
-        logger.error(e)
-        raise HTTPException(
-            status_code=400, detail="Unable to get employees by designation"
-        ) from e
+    logger.info("Get employees by designation called")
+    return await _list_response(
+        request, page, {"designation": name}, f.get_employees_by_designation, name
+    )
 
 
 @app.get("/skill/{skill_name}", response_model=List[Employee])
-async def get_employee_from_skill(skill_name: str):
+async def get_employee_from_skill(
+    skill_name: str,
+    request: Request,
+    page: dict = Depends(page_params),
+):
     """
     Get a list of employees by skill.
 
     Args:
         skill_name (str): The name of the skill.
+        page (dict): The limit, cursor and order_by pagination parameters.
 
     Returns:
         List[Employee]: A list of Employee objects representing the employees with the specified skill.
@@ -217,14 +943,65 @@ async def get_employee_from_skill(skill_name: str):
     Raises:
         HTTPException: If there is an error getting the employees by skill.
     """
-    try:
-        logger.info("Get employees by skill called")
-        return f.get_employees_by_skill(skill_name)
-    except HTTPException as e:
-        logger.error(e)
+    logger.info("Get employees by skill called")
+    return await _list_response(
+        request, page, {"skills": [skill_name]}, f.get_employees_by_skill, skill_name
+    )
+
+
+@app.get("/skills", response_model=List[Employee])
+async def get_employees_from_skills(
+    request: Request,
+    page: dict = Depends(page_params),
+    all_skills: Optional[str] = Query(
+        default=None, alias="all", description="Comma separated skills, all required"
+    ),
+    any_skills: Optional[str] = Query(
+        default=None, alias="any", description="Comma separated skills, one required"
+    ),
+):
+    """
+    Get a list of employees matching several skills at once.
+
+    Args:
+        all (str): Comma separated skills that every employee must have.
+        any (str): Comma separated skills of which every employee must have one.
+        page (dict): The limit, cursor and order_by pagination parameters.
+
+    Returns:
+        List[Employee]: A list of Employee objects matching the skill query.
+
+    Raises:
+        HTTPException: If no skills are given or there is an error getting the employees.
+    """
+    all_skills = [skill for skill in (all_skills or "").split(",") if skill.strip()]
+    any_skills = [skill for skill in (any_skills or "").split(",") if skill.strip()]
+    if not all_skills and not any_skills:
         raise HTTPException(
-            status_code=400, detail="Unable to get employees by skill"
-        ) from e
+            status_code=400, detail="Provide skills through 'all' and/or 'any'"
+        )
+    logger.info("Get employees by skills called")
+    return await _list_response(
+        request,
+        page,
+        {"skills": all_skills, "any_skills": any_skills},
+        f.get_employees_by_skills,
+        all_skills,
+        any_skills,
+    )
+
+
+def _csv_report_response(path):
+    """
+    Streams a CSV report file back to the client.
+    """
+    return StreamingResponse(
+        rep.stream_report(path),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{os.path.basename(path)}"'
+        },
+    )
 
 
 @app.get("/department_report")
@@ -232,15 +1009,21 @@ async def get_department_report():
     """
     A function that retrieves a department report.
 
+    Returns:
+        StreamingResponse: The department wise employees report as CSV.
+
     Raises:
         HTTPException: If unable to generate the report.
     """
     try:
-        rep.department_wise_employee_report()
-    except HTTPException as e:
+        logger.info("Get department report called")
+        path = await _run_storage(rep.department_wise_employee_report)
+    except OSError as e:
+        logger.error(e)
         raise HTTPException(
             status_code=400, detail="Unable to Generate this report"
         ) from e
+    return _csv_report_response(path)
 
 
 @app.get("/salary_report")
@@ -248,24 +1031,33 @@ async def get_salary_report():
     """
     Retrieves the salary report for all departments.
 
+    Returns:
+        StreamingResponse: The department wise salary report as CSV.
+
     Raises:
         HTTPException: If there is an error generating the report.
     """
     try:
-        rep.department_wise_salary_report()
-    except HTTPException as e:
+        logger.info("Get salary report called")
+        path = await _run_storage(rep.department_wise_salary_report)
+    except OSError as e:
+        logger.error(e)
         raise HTTPException(
             status_code=400, detail="Unable to Generate this report"
         ) from e
+    return _csv_report_response(path)
 
 
 @app.get("/status/{status}", response_model=List[Employee])
-async def filter_employees_by_status(status: str):
+async def filter_employees_by_status(
+    status: str, request: Request, page: dict = Depends(page_params)
+):
     """
     Filters the employees by status and returns a list of matching employees.
 
     Parameters:
         status (str): The status to filter by.
+        page (dict): The limit, cursor and order_by pagination parameters.
 
     Returns:
         List[Employee]: A list of employees with the given status.
@@ -273,25 +1065,26 @@ async def filter_employees_by_status(status: str):
     Raises:
         HTTPException: If there is an error fetching the employee records.
     """
-    try:
-        employees = f.get_employees_by_status(status)
-        logger.info("filter employees by status called")
-        return employees
-    except HTTPException as e:
-        logger.error(e)
-        raise HTTPException(
-            status_code=400, detail="Unable to filter employees by status"
-        ) from e
+    logger.info("filter employees by status called")
+    return await _list_response(
+        request, page, {"status": status}, f.get_employees_by_status, status
+    )
 
 
 @app.get("/salary/{min_salary}/{max_salary}", response_model=List[Employee])
-async def filter_employees_by_salary_range(min_salary: float, max_salary: float):
+async def filter_employees_by_salary_range(
+    min_salary: float,
+    max_salary: float,
+    request: Request,
+    page: dict = Depends(page_params),
+):
     """
     Filters the employees by salary range and returns a list of matching employees.
 
     Args:
         min_salary (float): The minimum salary to filter by.
         max_salary (float): The maximum salary to filter by.
+        page (dict): The limit, cursor and order_by pagination parameters.
 
     Returns:
         List[Employee]: A list of employees with salaries within the given range.
@@ -299,12 +1092,87 @@ async def filter_employees_by_salary_range(min_salary: float, max_salary: float)
     Raises:
         HTTPException: If there is an error fetching the employee records.
     """
+    logger.info("filter employees by salary range called")
+    return await _list_response(
+        request,
+        page,
+        {"min_salary": min_salary, "max_salary": max_salary},
+        f.get_employees_by_salary_range,
+        min_salary,
+        max_salary,
+    )
+
+
+@app.get("/top_earners/{n}", response_model=List[Employee])
+async def get_top_earners(n: int = Path(gt=0)):
+    """
+    Get the employees with the highest salaries.
+
+    Args:
+        n (int): The number of employees to return.
+
+    Returns:
+        List[Employee]: Up to n employees, highest salary first.
+
+    Raises:
+        HTTPException: If there is an error fetching the employee records.
+    """
+    try:
+        logger.info("Get top earners called")
+        employees = await _run_storage(f.get_top_earners, n)
+    except HTTPException as e:
+        logger.error(e)
+        raise HTTPException(status_code=400, detail="Unable to get top earners") from e
+    return await _employees_response(employees)
+
+
+@app.get("/bottom_earners/{n}", response_model=List[Employee])
+async def get_bottom_earners(n: int = Path(gt=0)):
+    """
+    Get the employees with the lowest salaries.
+
+    Args:
+        n (int): The number of employees to return.
+
+    Returns:
+        List[Employee]: Up to n employees, lowest salary first.
+
+    Raises:
+        HTTPException: If there is an error fetching the employee records.
+    """
+    try:
+        logger.info("Get bottom earners called")
+        employees = await _run_storage(f.get_bottom_earners, n)
+    except HTTPException as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=400, detail="Unable to get bottom earners"
+        ) from e
+    return await _employees_response(employees)
+
+
+@app.get("/salary_percentile/{percentile}")
+async def get_salary_percentile(percentile: float = Path(ge=0, le=100)):
+    """
+    Get the salary at a given percentile of all employees.
+
+    Args:
+        percentile (float): The percentile, between 0 and 100.
+
+    Returns:
+        dict: The requested percentile and the salary at that percentile.
+
+    Raises:
+        HTTPException: If there are no employees or there is an error computing the percentile.
+    """
     try:
-        employees = f.get_employees_by_salary_range(min_salary, max_salary)
-        logger.info("filter employees by salary range called")
-        return employees
+        logger.info("Get salary percentile called")
+        salary = await _run_storage(f.get_salary_percentile, percentile)
     except HTTPException as e:
         logger.error(e)
         raise HTTPException(
-            status_code=400, detail="Unable to filter employees by salary range"
+            status_code=400, detail="Unable to get salary percentile"
         ) from e
+    if salary is None:
+        raise HTTPException(status_code=404, detail="No employees found")
+    return {"percentile": percentile, "salary": salary}
@@ -0,0 +1,120 @@
+"""
+Benchmark for the columnar roster against the list of employee dicts: memory and latency
+
+Usage:
+    python -m benchmarks.bench_columnar [records]
+
+"""
+
+import sys
+import time
+import tracemalloc
+
+from helpers.aggregates import GroupSalaryStats, SalaryBuckets
+from helpers.columnar import ColumnarRoster
+
+DEFAULT_RECORDS = 100_000
+ROUNDS = 5
+
+DEPARTMENTS = ["ESBU", "HR", "Finance", "Sales", "Marketing", "Operations"]
+DESIGNATIONS = ["software engineer", "manager", "analyst", "intern", "director"]
+STATUSES = ["active", "inactive", "terminated"]
+GENDERS = ["male", "female", "other"]
+
+
+def make_record(index):
+    """this function will build a stored employee record"""
+    return {
+        "emp_id": f"{index:08x}-0000-4000-8000-{index:012x}",
+        "emp_name": f"employee {index}",
+        "emp_gender": GENDERS[index % len(GENDERS)],
+        "emp_status": STATUSES[index % len(STATUSES)],
+        "emp_email": f"employee{index}@example.com",
+        "emp_address": "123 Main Street",
+        "emp_phone": "9876543210",
+        "emp_designation": DESIGNATIONS[index % len(DESIGNATIONS)],
+        "emp_department": DEPARTMENTS[index % len(DEPARTMENTS)],
+        "emp_salary": float((index * 7919) % 200_000),
+        "emp_skills": ["communication", "coding"],
+        "created_date": "2024-01-30",
+        "created_time": "15:47:20.417023",
+    }
+
+
+def traced_size(function):
+    """this function will return the result of function and the bytes it allocated"""
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def best_time(function, *args):
+    """this function will return the best wall time of ROUNDS calls in seconds"""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def dict_salary_range(records, low, high):
+    return [
+        record["emp_id"]
+        for record in records
+        if low <= record.get("emp_salary", -1) <= high
+    ]
+
+
+def dict_department_stats(records):
+    stats = GroupSalaryStats("emp_department")
+    for record in records:
+        stats.add(record)
+    return stats.stats()
+
+
+def dict_salary_histogram(records):
+    buckets = SalaryBuckets()
+    for record in records:
+        buckets.add(record)
+    return buckets.counts()
+
+
+def main(count):
+    records, dict_bytes = traced_size(
+        lambda: [make_record(index) for index in range(count)]
+    )
+    roster, columnar_bytes = traced_size(lambda: ColumnarRoster(records))
+    assert roster.group_salary_stats() == dict_department_stats(records)
+    assert roster.salary_histogram() == dict_salary_histogram(records)
+
+    print(f"{count} records")
+    print(f"{'memory, list of dicts':<40} {dict_bytes / 2**20:>9.1f} MiB")
+    print(f"{'memory, columnar roster':<40} {columnar_bytes / 2**20:>9.1f} MiB")
+
+    results = {
+        "salary range": (
+            best_time(dict_salary_range, records, 40_000, 60_000),
+            best_time(roster.salary_range, 40_000, 60_000),
+        ),
+        "department group-by": (
+            best_time(dict_department_stats, records),
+            best_time(roster.group_salary_stats),
+        ),
+        "salary histogram": (
+            best_time(dict_salary_histogram, records),
+            best_time(roster.salary_histogram),
+        ),
+    }
+    print(f"{'operation':<24} {'dicts':>12} {'columnar':>12} {'speedup':>9}")
+    for name, (dict_seconds, columnar_seconds) in results.items():
+        print(
+            f"{name:<24} {dict_seconds * 1000:>9.2f} ms {columnar_seconds * 1000:>9.2f} ms"
+            f" {dict_seconds / columnar_seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS)
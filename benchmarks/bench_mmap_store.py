@@ -0,0 +1,158 @@
+"""
+Benchmark for the memory-mapped store against the JSON store: resident memory and reads
+
+Usage:
+    python -m benchmarks.bench_mmap_store [records]
+
+    Every store is loaded in a fresh interpreter, which reports its resident
+    set size after loading and the latency of point reads and filters. The
+    mmap store is measured with its default resident structures and with
+    every structure resident.
+
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generate_roster import load_or_generate, parse_count
+from helpers.journal import write_snapshot
+from helpers.mmap_store import MmapStore, write_record_file
+from helpers.store import EmployeeStore
+
+DEFAULT_RECORDS = 100_000
+# Every secondary structure of the store, for the mmap-all measurement
+ALL_STRUCTURES = (
+    "emp_department",
+    "emp_designation",
+    "emp_status",
+    "emp_gender",
+    "emp_skills",
+    "emp_salary",
+    "emp_id",
+    "created_date",
+    "department_salary",
+    "salary_buckets",
+)
+ROUNDS = 1000
+# Filters decode thousands of records per call on the mmap store, and scan
+# the whole file when their index is not resident
+FILTER_ROUNDS = 20
+
+
+def resident_bytes():
+    """
+    Returns the private (anonymous) and the file-backed resident bytes of this process.
+
+    File-backed pages of the mapped record file live in the OS page cache
+    and are shared by every process that maps the file.
+    """
+    resident = {"RssAnon": 0, "RssFile": 0}
+    with open("/proc/self/status", "r", encoding="utf-8") as file:
+        for line in file:
+            name, _, value = line.partition(":")
+            if name in resident:
+                resident[name] = int(value.split()[0]) * 1024
+    return resident["RssAnon"], resident["RssFile"]
+
+
+def median_time(function, *args, rounds=ROUNDS):
+    """this function will return the median wall time of rounds calls in seconds"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def measure_child(backend, path):
+    """this function will load one store in this process and measure it"""
+    anonymous, mapped = resident_bytes()
+    if backend == "mmap":
+        store = MmapStore(path)
+    elif backend == "mmap-all":
+        store = MmapStore(path, resident=ALL_STRUCTURES)
+    else:
+        store = EmployeeStore(path)
+    start = time.perf_counter()
+    store.load()
+    load = time.perf_counter() - start
+    resident = [
+        after - before for after, before in zip(resident_bytes(), (anonymous, mapped))
+    ]
+
+    ordering = store.orderings["emp_id"]
+    ids = ordering.after(None, len(ordering))
+    rng = random.Random(7)
+    reads = iter([rng.choice(ids) for _ in range(ROUNDS)])
+    get = median_time(lambda: store.get(next(reads)))
+    department = min(
+        store.value_counts("emp_department").items(), key=lambda item: item[1]
+    )[0]
+    find = median_time(
+        store.find_by, "emp_department", department, rounds=FILTER_ROUNDS
+    )
+    top = median_time(store.top, "emp_salary", 10, rounds=FILTER_ROUNDS)
+    print(
+        json.dumps(
+            {
+                "load": load,
+                "resident": resident,
+                "get": get,
+                "find": find,
+                "find_rows": len(store.find_by("emp_department", department)),
+                "top": top,
+            }
+        )
+    )
+
+
+def run_child(backend, path):
+    """this function will measure one store in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_mmap_store", "--child", backend, path],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(count):
+    roster = load_or_generate(count)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            "json": os.path.join(directory, "emp.json"),
+            "mmap": os.path.join(directory, "emp.records"),
+        }
+        write_snapshot(paths["json"], roster)
+        write_record_file(paths["mmap"], roster)
+        del roster
+
+        print(f"{count} employees")
+        print(
+            f"{'':<8} {'load':>8} {'private':>10} {'shared':>10} {'get':>9} "
+            f"{'find_by (rows)':>17} {'top 10':>9}"
+        )
+        for backend, path in (*paths.items(), ("mmap-all", paths["mmap"])):
+            result = run_child(backend, path)
+            anonymous, mapped = result["resident"]
+            print(
+                f"{backend:<8} {result['load']:>7.2f}s "
+                f"{anonymous / 2**20:>6.0f} MiB {mapped / 2**20:>6.0f} MiB "
+                f"{result['get'] * 1e6:>6.1f} us "
+                f"{result['find'] * 1e3:>7.2f} ms ({result['find_rows']:>5}) "
+                f"{result['top'] * 1e6:>6.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2], sys.argv[3])
+    else:
+        main(parse_count(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS)
@@ -0,0 +1,59 @@
+"""
+Benchmark for name searches on the trigram index
+
+Usage:
+    python -m benchmarks.bench_name_search [records]
+
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.generate_roster import make_name
+from helpers.indexes import TrigramIndex
+
+DEFAULT_RECORDS = 1_000_000
+ROUNDS = 20
+
+
+def best_time(function, *args):
+    """this function will return the best wall time of ROUNDS calls in seconds"""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(count):
+    rng = random.Random(42)
+    records = [
+        {"emp_id": f"{number:08d}", "emp_name": make_name(rng)}
+        for number in range(count)
+    ]
+    index = TrigramIndex("emp_name")
+    start = time.perf_counter()
+    index.build(records)
+    print(
+        f"{count} names ({len(index._ids)} distinct) indexed in "
+        f"{time.perf_counter() - start:.1f} s"
+    )
+    sample = records[count // 2]["emp_name"].lower()
+    typo = sample[:2] + sample[3:]
+
+    searches = {
+        f"prefix {sample[:6]!r}": (index.prefix, sample[:6], 20),
+        "prefix 'k'": (index.prefix, "k", 20),
+        f"substring {sample[-6:]!r}": (index.substring, sample[-6:], 20),
+        "substring 'ari'": (index.substring, "ari", 20),
+        f"fuzzy {typo!r}": (index.fuzzy, typo, 20),
+    }
+    for name, (function, *args) in searches.items():
+        seconds = best_time(function, *args)
+        print(f"{name:<36} {seconds * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS)
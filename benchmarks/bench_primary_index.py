@@ -0,0 +1,80 @@
+"""
+Benchmark for emp_id lookups, updates and deletes on the employee store
+
+Usage:
+    python -m benchmarks.bench_primary_index [sizes]
+
+    sizes is a comma separated list of roster sizes, default 1000,10000,100000,1000000
+
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from helpers.store import EmployeeStore
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+OPERATIONS = 1_000
+
+
+def make_record(index):
+    """this function will build a minimal employee record"""
+    return {
+        "emp_id": f"emp-{index:08d}",
+        "emp_name": f"employee {index}",
+        "emp_department": "ESBU",
+        "emp_salary": 30000.0 + index % 50000,
+        "emp_skills": ["coding"],
+    }
+
+
+def build_store(directory, size):
+    """this function will write a roster of the given size and load it"""
+    json_path = os.path.join(directory, f"emp_{size}.json")
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump([make_record(index) for index in range(size)], file)
+    store = EmployeeStore(
+        json_path,
+        journal_path=os.path.join(directory, f"emp_{size}.journal"),
+        compact_max_bytes=float("inf"),
+        compact_max_entries=float("inf"),
+    )
+    store.journal.fsync = False
+    store.load()
+    return store
+
+
+def time_per_call(function, ids):
+    """this function will return the mean latency of function over ids in microseconds"""
+    start = time.perf_counter()
+    for emp_id in ids:
+        function(emp_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main(sizes):
+    print(f"{'records':>10} {'get us':>10} {'update us':>10} {'delete us':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            store = build_store(directory, size)
+            ids = [
+                f"emp-{index:08d}" for index in random.sample(range(size), OPERATIONS)
+            ]
+            get_us = time_per_call(store.get, ids)
+            update_us = time_per_call(
+                lambda emp_id: store.update(emp_id, {"emp_salary": 1.0}), ids
+            )
+            delete_us = time_per_call(store.delete, ids)
+            store.close()
+            print(f"{size:>10} {get_us:>10.2f} {update_us:>10.2f} {delete_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main([int(size) for size in sys.argv[1].split(",")])
+    else:
+        main(DEFAULT_SIZES)
@@ -0,0 +1,78 @@
+"""
+Benchmark for serializing employee lists: response_model validation vs cached JSON bytes
+
+Usage:
+    python -m benchmarks.bench_serialization [records]
+
+"""
+
+import json
+import sys
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from helpers.serialization import RecordEncoder, orjson
+from models.employee import Employee
+
+DEFAULT_RECORDS = 10_000
+ROUNDS = 5
+
+
+def make_record(index):
+    """this function will build a valid employee record"""
+    return {
+        "emp_id": f"emp-{index:08d}",
+        "emp_name": f"employee {index}",
+        "emp_gender": "female",
+        "emp_status": "active",
+        "emp_email": f"employee{index}@example.com",
+        "emp_address": "123 Main Street",
+        "emp_phone": "9876543210",
+        "emp_designation": "software engineer",
+        "emp_department": "ESBU",
+        "emp_salary": 30000.0 + index % 50000,
+        "emp_skills": ["communication", "coding"],
+        "created_date": "2024-01-30",
+        "created_time": "15:47:20.417023",
+    }
+
+
+def response_model_path(adapter, records):
+    """this function will validate and encode records the way response_model does"""
+    employees = adapter.validate_python(records)
+    return json.dumps(adapter.dump_python(employees, mode="json")).encode("utf-8")
+
+
+def best_time(function, *args):
+    """this function will return the best wall time of ROUNDS calls in seconds"""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(count):
+    records = [make_record(index) for index in range(count)]
+    adapter = TypeAdapter(List[Employee])
+    encoder = RecordEncoder()
+
+    results = {
+        "response_model (validate + json.dumps)": best_time(
+            response_model_path, adapter, records
+        ),
+        "RecordEncoder, cold cache": best_time(
+            lambda: RecordEncoder().encode_list(records)
+        ),
+        "RecordEncoder, warm cache": best_time(encoder.encode_list, records),
+    }
+    print(f"{count} records, orjson {'on' if orjson else 'off'}")
+    for name, seconds in results.items():
+        print(f"{name:<40} {seconds * 1000:>9.2f} ms {count / seconds:>12.0f} rec/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS)
@@ -0,0 +1,103 @@
+"""
+Startup benchmark for the JSON and the binary snapshot formats
+
+Usage:
+    python -m benchmarks.bench_snapshot [records]
+
+    Every measurement runs in a fresh interpreter, as a restarted server
+    would, and reports the time to parse the snapshot and the time for the
+    store to load it, which also builds the indexes.
+
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generate_roster import load_or_generate, parse_count
+from helpers.journal import write_snapshot
+from helpers.snapshot import read_records
+from helpers.store import EmployeeStore
+
+DEFAULT_RECORDS = 1_000_000
+ROUNDS = 3
+
+# (label, snapshot format, how the child process reads it)
+MODES = [
+    ("json.load (before)", "json", "json.load"),
+    ("JSON snapshot", "json", "read_records"),
+    ("binary snapshot", "binary", "read_records"),
+]
+
+
+def measure_child(path, reader):
+    """this function will time reading a snapshot and loading a store in this process"""
+    start = time.perf_counter()
+    if reader == "json.load":
+        with open(path, "r", encoding="utf-8") as file:
+            json.load(file)
+    else:
+        read_records(path)
+    parse = time.perf_counter() - start
+
+    if path.endswith(".snapshot"):
+        # No JSON file sits next to it, so nothing is imported
+        store = EmployeeStore(f"{path}.json", binary_path=path)
+    else:
+        store = EmployeeStore(path)
+    start = time.perf_counter()
+    if reader == "json.load":
+        # The store as it was: json.load with the collector running
+        with open(path, "r", encoding="utf-8") as file:
+            store._records = {record["emp_id"]: record for record in json.load(file)}
+        store._rebuild_indexes()
+    else:
+        store.load()
+    load = time.perf_counter() - start
+    print(json.dumps({"parse": parse, "load": load}))
+
+
+def run_child(path, reader):
+    """this function will measure one cold start in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_snapshot", "--child", path, reader],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(count):
+    roster = load_or_generate(count)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            "json": os.path.join(directory, "emp.json"),
+            "binary": os.path.join(directory, "emp.snapshot"),
+        }
+        for snapshot_format, path in paths.items():
+            start = time.perf_counter()
+            write_snapshot(path, roster, binary=snapshot_format == "binary")
+            print(
+                f"{snapshot_format:<7} snapshot: {os.path.getsize(path) / 2**20:8.1f} MiB"
+                f", written in {time.perf_counter() - start:.1f} s"
+            )
+        del roster
+
+        print(f"\n{count} employees, best of {ROUNDS} cold starts")
+        print(f"{'':<20} {'parse':>9} {'store load':>11}")
+        for label, snapshot_format, reader in MODES:
+            runs = [run_child(paths[snapshot_format], reader) for _ in range(ROUNDS)]
+            parse = min(run["parse"] for run in runs)
+            load = min(run["load"] for run in runs)
+            print(f"{label:<20} {parse:>8.2f}s {load:>10.2f}s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2], sys.argv[3])
+    else:
+        main(parse_count(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS)
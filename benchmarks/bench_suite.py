@@ -0,0 +1,493 @@
+"""
+Benchmark suite timing every feature function and API route on a synthetic roster
+
+Usage:
+    python -m benchmarks.bench_suite [--records 1k] [--seed 42] [--backend json]
+        [--rounds 20] [--only features|routes] [--output PATH] [--compare PATH]
+
+The roster comes from benchmarks.generate_roster and is loaded into a
+temporary store, so data/ and reports/ are left untouched. Results are
+written as JSON to benchmarks/results/<records>_<backend>_<commit>.json;
+--compare prints the change of every median against an earlier results file.
+
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+import apis
+import helpers.features as f
+import helpers.report_functions as rep
+from benchmarks.generate_roster import (
+    DEFAULT_SEED,
+    RosterGenerator,
+    load_or_generate,
+    parse_count,
+    write_roster,
+)
+from helpers.serialization import RecordEncoder
+from helpers.sqlite_store import SqliteStore, migrate_from_json
+from helpers.store import EmployeeStore
+
+DEFAULT_ROUNDS = 20
+BATCH_SIZE = 100
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def summarize(timings):
+    """this function will return the statistics of a list of timings in milliseconds"""
+    timings = sorted(seconds * 1000 for seconds in timings)
+    return {
+        "rounds": len(timings),
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(round(0.95 * (len(timings) - 1)), len(timings) - 1)],
+        "mean_ms": statistics.fmean(timings),
+    }
+
+
+def measure(function, rounds, setup=None):
+    """
+    Times a function over several rounds.
+
+    Args:
+        function (callable): The function to time.
+        rounds (int): The number of calls.
+        setup (callable): Called untimed before each round; its result is
+            passed to function as positional arguments.
+
+    Returns:
+        dict: The statistics of the timings.
+    """
+    timings = []
+    for _ in range(rounds):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+async def measure_async(function, rounds, setup=None):
+    """this function will time an async function like measure does"""
+    timings = []
+    for _ in range(rounds):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        await function(*args)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+class Workload:
+    """
+    Sample arguments taken from the loaded roster and fresh records to write.
+
+    The values come from a record in the middle of the roster and from its
+    largest department, so lookups hit realistic index sizes.
+    """
+
+    def __init__(self, roster, seed):
+        sample = roster[len(roster) // 2]
+        self.id = sample["emp_id"]
+        self.department = Counter(
+            record["emp_department"] for record in roster
+        ).most_common(1)[0][0]
+        self.designation = sample["emp_designation"]
+        self.status = sample["emp_status"]
+        self.gender = sample["emp_gender"]
+        self.skill = sample["emp_skills"][0]
+        self.skills = sample["emp_skills"][:2]
+        self.name = sample["emp_name"]
+        self.salary = sample["emp_salary"]
+        self._generator = RosterGenerator(seed + 1)
+        self._created = 0
+
+    def new_records(self, count=1):
+        """this function will return count records that are not in the store yet"""
+        records = [
+            self._generator.record(self._created + index, 10**6)
+            for index in range(count)
+        ]
+        self._created += count
+        return records
+
+    def created_ids(self, count=1):
+        """this function will store count new records and return their ids"""
+        records = self.new_records(count)
+        f.save_employees(records)
+        return [record["emp_id"] for record in records]
+
+
+def reset_reports():
+    """this function will make the next report call rebuild its file"""
+    rep._built_versions.clear()
+    return ()
+
+
+def feature_benchmarks(work):
+    """this function will return (name, function, setup) for every features.py function"""
+    salary_low, salary_high = work.salary * 0.9, work.salary * 1.1
+    benchmarks = [
+        ("get_data_version", f.get_data_version, None),
+        ("get_departments", f.get_departments, None),
+        ("get_existing_data", f.get_existing_data, None),
+        (
+            "encode_employees (cold)",
+            lambda records: RecordEncoder().encode_list(records),
+            lambda: (f.get_existing_data(),),
+        ),
+        (
+            "encode_employees (warm)",
+            f.encode_employees,
+            lambda: (f.get_existing_data(),),
+        ),
+        ("get_employees_page", lambda: f.get_employees_page("emp_id", None, 100), None),
+        (
+            "get_employees_page created_date",
+            lambda: f.get_employees_page("created_date", None, 100),
+            None,
+        ),
+        (
+            "paginate_employees",
+            lambda employees: f.paginate_employees(employees, "emp_id", None, 100),
+            lambda: (f.get_employees_by_department(work.department),),
+        ),
+        ("iter_employees", lambda: sum(1 for _ in f.iter_employees()), None),
+        ("get_employee_by_id", lambda: f.get_employee_by_id(work.id), None),
+        (
+            "get_employees_by_department",
+            lambda: f.get_employees_by_department(work.department),
+            None,
+        ),
+        (
+            "get_employees_by_designation",
+            lambda: f.get_employees_by_designation(work.designation),
+            None,
+        ),
+        (
+            "get_employees_by_gender",
+            lambda: f.get_employees_by_gender(work.gender),
+            None,
+        ),
+        (
+            "get_employees_by_status",
+            lambda: f.get_employees_by_status(work.status),
+            None,
+        ),
+        ("get_employees_by_skill", lambda: f.get_employees_by_skill(work.skill), None),
+        (
+            "get_employees_by_skills",
+            lambda: f.get_employees_by_skills(all_skills=work.skills),
+            None,
+        ),
+        (
+            "get_employees_by_salary_range",
+            lambda: f.get_employees_by_salary_range(salary_low, salary_high),
+            None,
+        ),
+        (
+            "search_employees",
+            lambda: f.search_employees(
+                department=work.department,
+                status=work.status,
+                skills=work.skills,
+                min_salary=salary_low,
+                max_salary=salary_high,
+            ),
+            None,
+        ),
+        (
+            "search_employees_by_name prefix",
+            lambda: f.search_employees_by_name(work.name[:4], "prefix"),
+            None,
+        ),
+        (
+            "search_employees_by_name substring",
+            lambda: f.search_employees_by_name(work.name[-5:], "substring"),
+            None,
+        ),
+        (
+            "search_employees_by_name fuzzy",
+            lambda: f.search_employees_by_name(work.name[:2] + work.name[3:], "fuzzy"),
+            None,
+        ),
+        ("get_top_earners", lambda: f.get_top_earners(10), None),
+        ("get_bottom_earners", lambda: f.get_bottom_earners(10), None),
+        ("get_salary_percentile", lambda: f.get_salary_percentile(90), None),
+        ("generate_report_skill_wise", f.generate_report_skill_wise, None),
+        ("generate_report_department_wise", f.generate_report_department_wise, None),
+        (
+            "generate_report_department_salary",
+            f.generate_report_department_salary,
+            None,
+        ),
+        ("generate_report_salary_wise", f.generate_report_salary_wise, None),
+        (
+            "department_wise_employee_report",
+            rep.department_wise_employee_report,
+            reset_reports,
+        ),
+        (
+            "department_wise_salary_report",
+            rep.department_wise_salary_report,
+            reset_reports,
+        ),
+        ("save_employee", f.save_employee, lambda: work.new_records(1)),
+        (
+            "update_employee_by_id",
+            lambda: f.update_employee_by_id(work.id, {"emp_salary": work.salary + 1}),
+            None,
+        ),
+        ("delete_employee_by_id", f.delete_employee_by_id, work.created_ids),
+        (
+            f"save_employees x{BATCH_SIZE}",
+            f.save_employees,
+            lambda: (work.new_records(BATCH_SIZE),),
+        ),
+        (
+            f"update_employees_by_id x{BATCH_SIZE}",
+            f.update_employees_by_id,
+            lambda: (
+                [(id, {"emp_salary": 1000.0}) for id in work.created_ids(BATCH_SIZE)],
+            ),
+        ),
+        (
+            f"delete_employees_by_id x{BATCH_SIZE}",
+            f.delete_employees_by_id,
+            lambda: (work.created_ids(BATCH_SIZE),),
+        ),
+    ]
+    return benchmarks
+
+
+def route_benchmarks(work):
+    """this function will return (name, method, path, body, setup) for every route"""
+    low, high = int(work.salary * 0.9), int(work.salary * 1.1)
+    employee = work.new_records(1)[0]
+    body = {key: value for key, value in employee.items() if key != "emp_id"}
+
+    def new_body():
+        record = work.new_records(1)[0]
+        return {key: value for key, value in record.items() if key != "emp_id"}
+
+    return [
+        ("GET /", "GET", "/", None, None),
+        ("GET /employees", "GET", "/employees", None, None),
+        ("GET /employees?limit=100", "GET", "/employees?limit=100", None, None),
+        (
+            "GET /employees/search",
+            "GET",
+            f"/employees/search?department={work.department}&status={work.status}"
+            f"&skills={','.join(work.skills)}&min_salary={low}&max_salary={high}",
+            None,
+            None,
+        ),
+        (
+            "GET /employees/by-name",
+            "GET",
+            f"/employees/by-name?q={work.name[:4]}",
+            None,
+            None,
+        ),
+        ("GET /employees/{id}", "GET", f"/employees/{work.id}", None, None),
+        ("GET /department/{name}", "GET", f"/department/{work.department}", None, None),
+        (
+            "GET /designation/{name}",
+            "GET",
+            f"/designation/{work.designation}",
+            None,
+            None,
+        ),
+        ("GET /skill/{skill_name}", "GET", f"/skill/{work.skill}", None, None),
+        ("GET /skills", "GET", f"/skills?all={','.join(work.skills)}", None, None),
+        ("GET /status/{status}", "GET", f"/status/{work.status}", None, None),
+        ("GET /salary/{min}/{max}", "GET", f"/salary/{low}/{high}", None, None),
+        ("GET /department_report", "GET", "/department_report", None, reset_reports),
+        ("GET /salary_report", "GET", "/salary_report", None, reset_reports),
+        ("GET /top_earners/{n}", "GET", "/top_earners/10", None, None),
+        ("GET /bottom_earners/{n}", "GET", "/bottom_earners/10", None, None),
+        (
+            "GET /salary_percentile/{percentile}",
+            "GET",
+            "/salary_percentile/90",
+            None,
+            None,
+        ),
+        ("POST /create_employee", "POST", "/create_employee", new_body, None),
+        ("PUT /update_employee/{id}", "PUT", f"/update_employee/{work.id}", body, None),
+        (
+            "DELETE /delete_employee/{id}",
+            "DELETE",
+            lambda id: f"/delete_employee/{id}",
+            None,
+            lambda: (work.created_ids(1)[0],),
+        ),
+        (
+            f"POST /employees:batchCreate x{BATCH_SIZE}",
+            "POST",
+            "/employees:batchCreate",
+            lambda: [new_body() for _ in range(BATCH_SIZE)],
+            None,
+        ),
+        (
+            f"POST /employees:batchDelete x{BATCH_SIZE}",
+            "POST",
+            "/employees:batchDelete",
+            lambda ids: ids,
+            lambda: (work.created_ids(BATCH_SIZE),),
+        ),
+    ]
+
+
+async def run_routes(work, rounds):
+    """this function will time every route through the ASGI transport"""
+    results = {}
+    transport = httpx.ASGITransport(app=apis.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for name, method, path, body, setup in route_benchmarks(work):
+
+            def prepare(setup=setup):
+                # Measure the handler, not the conditional GET cache
+                apis.response_cache.clear()
+                return setup() if setup is not None else ()
+
+            async def send(*args, method=method, path=path, body=body):
+                url = path(*args) if callable(path) else path
+                payload = body(*args) if callable(body) else body
+                response = await client.request(method, url, json=payload)
+                response.raise_for_status()
+
+            results[name] = await measure_async(send, rounds, prepare)
+
+        etag = (await client.get("/employees")).headers["etag"]
+        results["GET /employees (cached)"] = await measure_async(
+            lambda: client.get("/employees"), rounds
+        )
+        results["GET /employees (304)"] = await measure_async(
+            lambda: client.get("/employees", headers={"If-None-Match": etag}), rounds
+        )
+    return results
+
+
+def git_commit():
+    """this function will return the current git commit, or None outside a checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=f.project_root,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def open_store(directory, roster, backend):
+    """this function will write the roster and load it into a temporary store"""
+    json_path = os.path.join(directory, "emp.json")
+    write_roster(json_path, roster)
+    if backend == "sqlite":
+        sqlite_path = os.path.join(directory, "emp.sqlite3")
+        migrate_from_json(json_path, sqlite_path)
+        return SqliteStore(sqlite_path)
+    return EmployeeStore(json_path, journal_path=os.path.join(directory, "emp.journal"))
+
+
+def compare(results, baseline_path):
+    """this function will print the change of every median against a baseline file"""
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    print(f"\ncompared with {baseline_path} ({baseline.get('commit')})")
+    for group, timings in results["results"].items():
+        for name, stats in timings.items():
+            before = baseline["results"].get(group, {}).get(name)
+            if before is None:
+                continue
+            change = (
+                stats["median_ms"] / before["median_ms"] if before["median_ms"] else 0
+            )
+            print(
+                f"{name:<44} {before['median_ms']:>10.3f} -> "
+                f"{stats['median_ms']:>10.3f} ms {change:>7.2f}x"
+            )
+
+
+def main(args):
+    roster = load_or_generate(args.records, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        rep.DEPARTMENT_EMPLOYEES_REPORT = os.path.join(directory, "employees.csv")
+        rep.DEPARTMENT_SALARY_REPORT = os.path.join(directory, "salary.csv")
+        f.store = open_store(directory, roster, args.backend)
+        f.encoder = RecordEncoder()
+        start = time.perf_counter()
+        f.store.load()
+        load_seconds = time.perf_counter() - start
+        work = Workload(roster, args.seed)
+        del roster
+
+        results = {}
+        if args.only in (None, "features"):
+            results["features"] = {
+                name: measure(function, args.rounds, setup)
+                for name, function, setup in feature_benchmarks(work)
+            }
+        if args.only in (None, "routes"):
+            results["routes"] = asyncio.run(run_routes(work, args.rounds))
+        f.store.close()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "records": args.records,
+        "seed": args.seed,
+        "rounds": args.rounds,
+        "load_seconds": load_seconds,
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_PATH, f"{args.records}_{args.backend}_{(commit or 'nogit')[:12]}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    print(
+        f"{args.records} records, {args.backend} backend, loaded in {load_seconds:.2f}s"
+    )
+    for group, timings in results.items():
+        print(f"\n{group:<44} {'median':>10} {'p95':>13}")
+        for name, stats in timings.items():
+            print(f"{name:<44} {stats['median_ms']:>10.3f} {stats['p95_ms']:>10.3f} ms")
+    print(f"\nResults written to {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark features.py and apis.py")
+    parser.add_argument("--records", default="1k", type=parse_count)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--only", choices=("features", "routes"))
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,209 @@
+"""
+Seeded generator of realistic, Employee-valid synthetic rosters
+
+Usage:
+    python -m benchmarks.generate_roster [records] [--seed SEED] [--output PATH] [--validate]
+
+    records defaults to 1000; 1k, 100k and 1m are accepted as shorthands.
+    The roster is written as a JSON list, like data/emp.json, to
+    benchmarks/rosters/roster_<records>_<seed>.json unless --output is given.
+
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import uuid
+from datetime import date, time, timedelta
+
+from models.employee import Employee
+
+# Roster sizes the benchmark suite is run at
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 42
+ROSTERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rosters")
+
+# Departments from largest to smallest; sizes follow a Zipf-like law
+DEPARTMENTS = [
+    "ESBU", "Engineering", "Sales", "Operations", "Customer Support", "Finance",
+    "Marketing", "HR", "Legal", "Research", "Security", "Procurement",
+]  # fmt: skip
+
+# (designation, relative frequency, median salary)
+DESIGNATIONS = [
+    ("intern", 8, 15_000),
+    ("associate", 25, 28_000),
+    ("software engineer", 30, 50_000),
+    ("senior software engineer", 15, 75_000),
+    ("analyst", 12, 42_000),
+    ("manager", 7, 95_000),
+    ("director", 2, 150_000),
+    ("vice president", 1, 240_000),
+]
+
+# Skills from most to least common; popularity follows a Zipf-like law
+SKILLS = [
+    "Communication", "Python", "SQL", "Excel", "Leadership", "Java", "Negotiation",
+    "JavaScript", "Project Management", "Docker", "AWS", "Kubernetes", "Go", "Rust",
+    "Machine Learning", "Data Analysis", "Public Speaking", "Accounting", "Sales",
+    "Marketing", "Recruiting", "Design", "Testing", "Linux", "Networking", "C++",
+    "Scala", "Spark", "Tableau", "Salesforce", "SAP", "Figma", "GraphQL", "React",
+]  # fmt: skip
+
+STATUSES = [("active", 85), ("inactive", 10), ("retired", 5)]
+GENDERS = [("male", 49), ("female", 48), ("other", 3)]
+
+SYLLABLES = [
+    "a", "an", "ar", "ka", "ri", "sh", "vi", "ja", "mo", "ha", "ne", "la", "ro",
+    "de", "mi", "sa", "ta", "in", "el", "to", "na", "ya", "po", "ku", "je", "di",
+]  # fmt: skip
+STREETS = ["Main Street", "Park Avenue", "Lake Road", "Hill Lane", "MG Road"]
+
+# Creation dates are spread evenly over HIRING_DAYS days from FIRST_DAY
+FIRST_DAY = date(2015, 1, 1)
+HIRING_DAYS = 3650
+
+
+def zipf_weights(count, exponent=1.1):
+    """this function will return Zipf-like weights for count ranked items"""
+    return [1 / rank**exponent for rank in range(1, count + 1)]
+
+
+def make_word(rng):
+    """this function will build a pronounceable word of two to four syllables"""
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_name(rng):
+    """this function will build a random first and last name"""
+    return f"{make_word(rng).title()} {make_word(rng).title()}"
+
+
+class RosterGenerator:
+    """
+    Generates employee records that validate against the Employee model.
+
+    Department sizes and skill popularity are skewed, salaries are
+    log-normal around a median that depends on the designation, and
+    records are created in chronological order. The same seed always
+    produces the same roster.
+    """
+
+    def __init__(self, seed=DEFAULT_SEED):
+        self.rng = random.Random(seed)
+        self.department_weights = zipf_weights(len(DEPARTMENTS))
+        self.skill_weights = zipf_weights(len(SKILLS), exponent=0.9)
+
+    def _choice(self, weighted):
+        """this function will pick a value from (value, weight, ...) tuples"""
+        return self.rng.choices(weighted, weights=[item[1] for item in weighted])[0]
+
+    def _skills(self):
+        """this function will pick one to six distinct skills, common ones more often"""
+        count = min(1 + int(self.rng.expovariate(0.6)), 6)
+        skills = set()
+        while len(skills) < count:
+            skills.add(self.rng.choices(SKILLS, weights=self.skill_weights)[0])
+        return sorted(skills)
+
+    def record(self, index, count):
+        """this function will build the index-th of count employee records"""
+        rng = self.rng
+        name = make_name(rng)
+        designation, _, median_salary = self._choice(DESIGNATIONS)
+        department = rng.choices(DEPARTMENTS, weights=self.department_weights)[0]
+        day = FIRST_DAY + timedelta(days=index * HIRING_DAYS // max(count, 1))
+        moment = time(
+            rng.randrange(9, 18),
+            rng.randrange(60),
+            rng.randrange(60),
+            rng.randrange(10**6),
+        )
+        return {
+            "emp_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "emp_name": name,
+            "emp_gender": self._choice(GENDERS)[0],
+            "emp_status": self._choice(STATUSES)[0],
+            "emp_email": f"{name.lower().replace(' ', '.')}{index}@example.com",
+            "emp_address": f"{rng.randrange(1, 999)} {rng.choice(STREETS)}",
+            "emp_phone": f"{rng.randrange(6, 10)}{rng.randrange(10**9):09d}",
+            "emp_designation": designation,
+            "emp_department": department,
+            "emp_salary": round(median_salary * math.exp(rng.gauss(0, 0.25)), -2),
+            "emp_skills": self._skills(),
+            "created_date": day.isoformat(),
+            "created_time": moment.isoformat(),
+        }
+
+    def records(self, count):
+        """this function will yield count employee records"""
+        for index in range(count):
+            yield self.record(index, count)
+
+
+def generate_roster(count, seed=DEFAULT_SEED):
+    """
+    Generates a synthetic roster.
+
+    Args:
+        count (int): The number of employees.
+        seed (int): The random seed; the same seed gives the same roster.
+
+    Returns:
+        list: The employee records.
+    """
+    return list(RosterGenerator(seed).records(count))
+
+
+def roster_path(count, seed=DEFAULT_SEED):
+    """this function will return the default path of a generated roster"""
+    return os.path.join(ROSTERS_PATH, f"roster_{count}_{seed}.json")
+
+
+def write_roster(path, records):
+    """this function will write a roster as a JSON list, like data/emp.json"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(records, file)
+
+
+def load_or_generate(count, seed=DEFAULT_SEED):
+    """this function will return a roster, generating and saving it on first use"""
+    path = roster_path(count, seed)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    records = generate_roster(count, seed)
+    write_roster(path, records)
+    return records
+
+
+def parse_count(value):
+    """this function will parse a roster size such as 1000, 100k or 1m"""
+    return SIZES.get(value.lower()) or int(value)
+
+
+def validate(records):
+    """this function will validate every record against the Employee model"""
+    for record in records:
+        Employee.model_validate(record)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic roster")
+    parser.add_argument("records", nargs="?", default="1k", type=parse_count)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", help="where to write the roster")
+    parser.add_argument(
+        "--validate", action="store_true", help="check every record with Employee"
+    )
+    args = parser.parse_args()
+    roster = generate_roster(args.records, args.seed)
+    if args.validate:
+        validate(roster)
+    output = args.output or roster_path(args.records, args.seed)
+    write_roster(output, roster)
+    print(f"Wrote {len(roster)} employees to {output}", file=sys.stderr)
@@ -0,0 +1,164 @@
+"""
+Report aggregates maintained incrementally by the employee store
+
+"""
+
+from bisect import bisect_right
+
+from helpers.indexes import SortedList
+
+# Salary ranges used by the salary-wise report, as (lower, upper) bounds
+SALARY_RANGES = [
+    (0, 20000),
+    (20000, 40000),
+    (40000, 60000),
+    (60000, 80000),
+    (80000, 100000),
+    (100000, float("inf")),
+]
+
+
+def _salary(record):
+    """this function will return the salary of a record, or None if it has none"""
+    salary = record.get("emp_salary")
+    return salary if isinstance(salary, (int, float)) else None
+
+
+class GroupSalaryStats:
+    """
+    Per-group employee count, salary total, minimum and maximum.
+
+    Each group keeps its salaries in a SortedList, so the minimum and
+    maximum stay correct when employees are removed, not just added, and
+    changes cost O(log N) even in the largest group.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._groups = {}
+
+    def clear(self):
+        """this function will drop every group"""
+        self._groups = {}
+
+    def build(self, records):
+        """this function will group many records at once, sorting each group only once"""
+        self.clear()
+        for record in records:
+            salary = _salary(record)
+            if salary is None:
+                continue
+            group = self._groups.setdefault(
+                record.get(self.field), {"total": 0.0, "salaries": []}
+            )
+            group["total"] += salary
+            group["salaries"].append(salary)
+        for group in self._groups.values():
+            group["salaries"] = SortedList(group["salaries"])
+
+    def add(self, record):
+        """this function will add a record to its group"""
+        salary = _salary(record)
+        if salary is None:
+            return
+        group = self._groups.setdefault(
+            record.get(self.field), {"total": 0.0, "salaries": SortedList()}
+        )
+        group["total"] += salary
+        group["salaries"].add(salary)
+
+    def remove(self, record):
+        """this function will remove a record from its group"""
+        salary = _salary(record)
+        group = self._groups.get(record.get(self.field))
+        if salary is None or group is None:
+            return
+        salaries = group["salaries"]
+        count = len(salaries)
+        salaries.discard(salary)
+        if len(salaries) < count:
+            group["total"] -= salary
+        if not len(salaries):
+            del self._groups[record.get(self.field)]
+
+    def update(self, old_record, new_record):
+        """this function will move a record if its group or salary changed"""
+        if old_record.get(self.field) != new_record.get(self.field) or _salary(
+            old_record
+        ) != _salary(new_record):
+            self.remove(old_record)
+            self.add(new_record)
+
+    def stats(self):
+        """
+        Returns the statistics of every group.
+
+        Returns:
+            dict: For each group value, a dict with count, total, average, min and max salary.
+        """
+        return {
+            value: {
+                "count": len(group["salaries"]),
+                "total": group["total"],
+                "average": group["total"] / len(group["salaries"]),
+                "min": group["salaries"][0],
+                "max": group["salaries"][-1],
+            }
+            for value, group in self._groups.items()
+        }
+
+
+class SalaryBuckets:
+    """
+    Number of employees in each of the SALARY_RANGES.
+
+    The bucket of a salary is found by binary search over the range bounds.
+    """
+
+    def __init__(self, ranges=SALARY_RANGES):
+        self.ranges = ranges
+        self._bounds = [low for low, _ in ranges]
+        self._counts = [0] * len(ranges)
+
+    def _bucket(self, record):
+        """this function will return the bucket index of a record, or None"""
+        salary = _salary(record)
+        if salary is None or salary < self._bounds[0]:
+            return None
+        return bisect_right(self._bounds, salary) - 1
+
+    def clear(self):
+        """this function will reset every bucket"""
+        self._counts = [0] * len(self.ranges)
+
+    def build(self, records):
+        """this function will count many records at once"""
+        self.clear()
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """this function will count a record in its bucket"""
+        bucket = self._bucket(record)
+        if bucket is not None:
+            self._counts[bucket] += 1
+
+    def remove(self, record):
+        """this function will uncount a record from its bucket"""
+        bucket = self._bucket(record)
+        if bucket is not None:
+            self._counts[bucket] -= 1
+
+    def update(self, old_record, new_record):
+        """this function will move a record if its bucket changed"""
+        if self._bucket(old_record) != self._bucket(new_record):
+            self.remove(old_record)
+            self.add(new_record)
+
+    def counts(self):
+        """this function will return the count of every non-empty salary range"""
+        return {
+            f"{low}-{high}": count
+            for (low, high), count in zip(self.ranges, self._counts)
+            if count
+        }
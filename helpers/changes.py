@@ -0,0 +1,112 @@
+"""
+Sequenced change log of employee creates, updates and deletes
+
+"""
+
+import asyncio
+import time
+from collections import deque
+from itertools import islice
+
+from helpers.storage import ChangesExpiredError
+
+# Number of most recent changes kept for clients catching up
+CHANGE_LOG_SIZE = 10_000
+
+
+def change_event(seq, op, emp_id, employee):
+    """
+    Builds one entry of the change feed.
+
+    Args:
+        seq (int): The sequence number of the change.
+        op (str): "create", "update" or "delete".
+        emp_id (str): The id of the affected employee.
+        employee (dict): The record after the change, or None for a delete.
+
+    Returns:
+        dict: The change event.
+    """
+    return {"seq": seq, "op": op, "emp_id": emp_id, "employee": employee}
+
+
+class ChangeLog:
+    """
+    The most recent changes of an in-memory store, numbered consecutively.
+
+    The log lives in memory only and restarts whenever the store loads its
+    data. It starts after a sequence number taken from the clock, so numbers
+    keep increasing across restarts while every number handed out before a
+    reload falls outside the log and is answered with ChangesExpiredError.
+    """
+
+    def __init__(self, max_changes=CHANGE_LOG_SIZE):
+        self.head = 0
+        self._changes = deque(maxlen=max_changes)
+        self.reset()
+
+    def reset(self):
+        """this function will drop every change and start a new sequence"""
+        self._changes.clear()
+        self.head = max(time.time_ns() // 1000, self.head + 1)
+
+    def append(self, op, emp_id, employee):
+        """this function will record one change under the next sequence number"""
+        self.head += 1
+        self._changes.append(change_event(self.head, op, emp_id, employee))
+
+    def since(self, since, limit):
+        """
+        Returns the changes made after a sequence number.
+
+        Args:
+            since (int): The last sequence number the caller has seen, or
+                None to only learn the current head.
+            limit (int): The maximum number of changes to return.
+
+        Returns:
+            tuple: Up to limit changes in sequence order, and the head.
+
+        Raises:
+            ChangesExpiredError: If changes after since are no longer kept.
+        """
+        if since is None:
+            return [], self.head
+        floor = self._changes[0]["seq"] - 1 if self._changes else self.head
+        if not floor <= since <= self.head:
+            raise ChangesExpiredError(since)
+        start = since - floor
+        return list(islice(self._changes, start, start + limit)), self.head
+
+
+class ChangeNotifier:
+    """
+    Wakes the long-poll and stream requests of one process when a write lands.
+
+    Writes made by other worker processes are not signalled, so waiters
+    also time out regularly and check the store again.
+    """
+
+    def __init__(self):
+        self._event = None
+
+    def notify(self):
+        """this function will wake every waiter"""
+        if self._event is not None:
+            self._event.set()
+            self._event = None
+
+    async def wait(self, timeout):
+        """
+        Waits until the next notify or until timeout seconds have passed.
+
+        Returns:
+            bool: True if woken by notify, False on timeout.
+        """
+        if self._event is None:
+            self._event = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
@@ -0,0 +1,182 @@
+"""
+Pooled HTTP clients for the Employee Management System API
+
+"""
+
+import asyncio
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is only needed for AsyncEmployeeClient
+    httpx = None
+
+BASE_URL = os.environ.get("EMP_API_URL", "http://localhost:8000")
+
+# (connect, read) timeouts in seconds
+TIMEOUT = (3.05, 30)
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+POOL_SIZE = 10
+
+# Only idempotent requests are retried, on these status codes
+RETRY_STATUSES = (502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+class EmployeeClient:
+    """
+    Client holding one pooled, keep-alive requests.Session for the API.
+
+    Idempotent requests are retried with exponential backoff on connection
+    errors and on 502/503/504 responses.
+    """
+
+    def __init__(
+        self,
+        base_url=BASE_URL,
+        timeout=TIMEOUT,
+        retries=RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        pool_size=POOL_SIZE,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def request(self, method, path, **kwargs):
+        """
+        Sends a request to the API over the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path of the endpoint, starting with "/".
+            **kwargs: Passed on to requests.Session.request.
+
+        Returns:
+            requests.Response: The response of the API.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def get(self, path, **kwargs):
+        """this function will send a GET request"""
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        """this function will send a POST request"""
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        """this function will send a PUT request"""
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        """this function will send a DELETE request"""
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        """this function will close the pooled connections"""
+        self.session.close()
+
+
+class AsyncEmployeeClient:
+    """
+    Asynchronous counterpart of EmployeeClient built on a pooled httpx.AsyncClient.
+
+    Requires the optional httpx package.
+    """
+
+    def __init__(
+        self,
+        base_url=BASE_URL,
+        timeout=TIMEOUT,
+        retries=RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        pool_size=POOL_SIZE,
+    ):
+        if httpx is None:
+            raise ImportError("AsyncEmployeeClient requires the httpx package")
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def request(self, method, path, **kwargs):
+        """
+        Sends a request to the API, retrying idempotent requests with backoff.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path of the endpoint, starting with "/".
+            **kwargs: Passed on to httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response: The response of the API.
+        """
+        attempts = self.retries + 1 if method.upper() in RETRY_METHODS else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+            await asyncio.sleep(self.backoff_factor * 2**attempt)
+
+    async def get(self, path, **kwargs):
+        """this function will send a GET request"""
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        """this function will send a POST request"""
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        """this function will send a PUT request"""
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        """this function will send a DELETE request"""
+        return await self.request("DELETE", path, **kwargs)
+
+    async def close(self):
+        """this function will close the pooled connections"""
+        await self.client.aclose()
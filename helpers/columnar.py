@@ -0,0 +1,121 @@
+"""
+Columnar, array-backed copy of the employee roster for vectorized analytics
+
+"""
+
+from helpers.aggregates import SALARY_RANGES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Categorical Employee fields stored as dictionary-encoded integer codes
+CATEGORICAL_FIELDS = ("emp_department", "emp_designation", "emp_status", "emp_gender")
+
+
+class ColumnarRoster:
+    """
+    The roster stored as one NumPy array per field instead of one dict per employee.
+
+    Salaries are a float64 array (NaN when missing), ids a fixed-width string
+    array and every categorical field an int32 array of codes into a list of
+    its distinct values. Filters, group-bys and histograms run as vectorized
+    operations over these arrays. Requires the optional numpy package.
+    """
+
+    def __init__(self, records):
+        if np is None:
+            raise ImportError("ColumnarRoster requires the numpy package")
+        self.ids = np.array([record["emp_id"] for record in records], dtype=str)
+        self.salaries = np.fromiter(
+            (
+                salary if isinstance(salary, (int, float)) else np.nan
+                for salary in (record.get("emp_salary") for record in records)
+            ),
+            dtype=np.float64,
+            count=len(records),
+        )
+        self.categories = {}
+        self.codes = {}
+        for field in CATEGORICAL_FIELDS:
+            dictionary = {}
+            self.codes[field] = np.fromiter(
+                (
+                    dictionary.setdefault(record.get(field), len(dictionary))
+                    for record in records
+                ),
+                dtype=np.int32,
+                count=len(records),
+            )
+            self.categories[field] = list(dictionary)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """the memory held by the arrays, in bytes"""
+        return (
+            self.ids.nbytes
+            + self.salaries.nbytes
+            + sum(codes.nbytes for codes in self.codes.values())
+        )
+
+    def salary_range(self, min_salary, max_salary):
+        """this function will return the ids with min_salary <= salary <= max_salary, by salary then id"""
+        mask = (self.salaries >= min_salary) & (self.salaries <= max_salary)
+        ids, salaries = self.ids[mask], self.salaries[mask]
+        return ids[np.lexsort((ids, salaries))].tolist()
+
+    def filter_ids(self, field, value):
+        """this function will return the ids whose categorical field equals value"""
+        try:
+            code = self.categories[field].index(value)
+        except ValueError:
+            return []
+        return self.ids[self.codes[field] == code].tolist()
+
+    def group_salary_stats(self, field="emp_department"):
+        """
+        Groups the salaries by a categorical field.
+
+        Args:
+            field (str): One of CATEGORICAL_FIELDS.
+
+        Returns:
+            dict: For each value, a dict with count, total, average, min and max salary.
+        """
+        valid = ~np.isnan(self.salaries)
+        codes = self.codes[field][valid]
+        salaries = self.salaries[valid]
+        groups = len(self.categories[field])
+        counts = np.bincount(codes, minlength=groups)
+        totals = np.bincount(codes, weights=salaries, minlength=groups)
+        minimums = np.full(groups, np.inf)
+        maximums = np.full(groups, -np.inf)
+        np.minimum.at(minimums, codes, salaries)
+        np.maximum.at(maximums, codes, salaries)
+        return {
+            value: {
+                "count": int(counts[code]),
+                "total": float(totals[code]),
+                "average": float(totals[code] / counts[code]),
+                "min": float(minimums[code]),
+                "max": float(maximums[code]),
+            }
+            for code, value in enumerate(self.categories[field])
+            if counts[code]
+        }
+
+    def salary_histogram(self, ranges=SALARY_RANGES):
+        """this function will return the count of every non-empty salary range"""
+        lower_bounds = np.array([low for low, _ in ranges], dtype=np.float64)
+        salaries = self.salaries[self.salaries >= lower_bounds[0]]
+        buckets = np.searchsorted(lower_bounds, salaries, side="right") - 1
+        counts = np.bincount(buckets, minlength=len(ranges))
+        return {
+            f"{low}-{high}": int(count)
+            for (low, high), count in zip(ranges, counts)
+            if count
+        }
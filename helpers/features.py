@@ -1,181 +1,331 @@
-import json
 import os
 
+from helpers.columnar import ColumnarRoster
+from helpers.indexes import DEFAULT_SIMILARITY
+from helpers.mmap_store import RESIDENT, MmapStore
+from helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    ORDER_KEYS,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from helpers.query import search_predicates
+from helpers.serialization import RecordEncoder
+from helpers.sqlite_store import SqliteStore
+from helpers.store import EmployeeStore
+
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 JSON_PATH = os.path.join(project_root, "data", "emp.json")
+JOURNAL_PATH = os.path.join(project_root, "data", "emp.journal")
+SQLITE_PATH = os.path.join(project_root, "data", "emp.sqlite3")
+BINARY_PATH = os.path.join(project_root, "data", "emp.snapshot")
+RECORDS_PATH = os.path.join(project_root, "data", "emp.records")
+
+# Set EMP_JOURNAL=0 to rewrite JSON_PATH on every change instead of journaling
+JOURNAL_ENABLED = os.environ.get("EMP_JOURNAL", "1") != "0"
+
+# Set EMP_SNAPSHOT_FORMAT=binary to keep the snapshot in BINARY_PATH instead of
+# JSON_PATH; JSON_PATH is imported once and can be exported again with
+# python -m helpers.snapshot to-json
+SNAPSHOT_FORMAT = os.environ.get("EMP_SNAPSHOT_FORMAT", "json")
+
+# "json" keeps the roster in memory and is safe for a single worker only,
+# "sqlite" can be shared by several worker processes, and "mmap" serves
+# reads for several workers from RECORDS_PATH, which is published with
+# python -m helpers.mmap_store
+STORAGE_BACKEND = os.environ.get("EMP_STORAGE_BACKEND", "json")
+
+# Comma separated secondary structures the mmap backend keeps in memory, e.g.
+# EMP_MMAP_INDEXES=emp_id,emp_department,emp_skills,department_salary; any
+# other index, ordering or aggregate is built per query from a scan of
+# RECORDS_PATH, so resident memory only grows with the structures listed
+MMAP_INDEXES = [
+    name.strip()
+    for name in os.environ.get("EMP_MMAP_INDEXES", ",".join(RESIDENT)).split(",")
+    if name.strip()
+]
+
+# Set EMP_ANALYTICS=columnar to answer salary range filters, department
+# salary statistics and salary buckets with NumPy over a columnar copy of the
+# roster, rebuilt after every change, instead of from the store's indexes and
+# aggregates. It suits rosters that are read far more than they are written
+# and requires the numpy package.
+ANALYTICS = os.environ.get("EMP_ANALYTICS", "store")
+
+# Set EMP_NAME_INDEX=eager to build the name trigram index on load instead of
+# on the first name search
+EAGER_NAME_INDEX = os.environ.get("EMP_NAME_INDEX", "lazy") == "eager"
+
+
+def create_store(backend=STORAGE_BACKEND):
+    """this function will create the storage backend with the given name"""
+    if backend == "json":
+        return EmployeeStore(
+            JSON_PATH,
+            journal_path=JOURNAL_PATH if JOURNAL_ENABLED else None,
+            binary_path=BINARY_PATH if SNAPSHOT_FORMAT == "binary" else None,
+            eager_name_index=EAGER_NAME_INDEX,
+        )
+    if backend == "sqlite":
+        return SqliteStore(SQLITE_PATH)
+    if backend == "mmap":
+        return MmapStore(
+            RECORDS_PATH, eager_name_index=EAGER_NAME_INDEX, resident=MMAP_INDEXES
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+# Process-wide store, loaded once at startup
+store = create_store()
+
+# Columnar copy of the roster and the data version it was built from
+_columnar = (None, None)
+
+# Cache of the JSON bytes of stored records, used to answer reads. Backends
+# building a new dict on every read, like sqlite and mmap, would never hit it.
+encoder = RecordEncoder() if store.stable_records else RecordEncoder(max_records=0)
+
+
+def load_store():
+    """this function will load the employee data into the store"""
+    store.load()
+
+
+def close_store():
+    """this function will flush pending compaction and close the store"""
+    store.close()
+
+
+def get_data_version():
+    """this function will get the version of the employee data"""
+    return store.version()
+
+
+def get_changes(since, limit):
+    """this function will get the changes after a sequence number and the head"""
+    return store.changes(since, limit)
+
+
+def get_departments():
+    """this function will get the names of all departments"""
+    return list(store.value_counts("emp_department"))
+
+
+def encode_employee(employee):
+    """this function will encode one stored employee as JSON bytes"""
+    return encoder.encode(employee)
+
+
+def encode_employees(employees):
+    """this function will encode a list of stored employees as JSON bytes"""
+    return encoder.encode_list(employees)
 
 
 def get_existing_data():
-    """this function will read the data from the file"""
-    if os.path.exists(JSON_PATH) and os.path.getsize(JSON_PATH) > 0:
-        with open(JSON_PATH, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            return data
-    else:
-        return []
+    """this function will read the data from the store"""
+    return store.all()
+
+
+def get_employees_page(
+    order_by="emp_id", cursor=None, limit=DEFAULT_PAGE_SIZE, **criteria
+):
+    """
+    Gets one page of employees in keyset order from the store.
+
+    Criteria, the keyword arguments of helpers.query.search_predicates,
+    restrict the page to the matching employees; the store reads the page
+    off its ordering instead of building and sorting the whole result.
+
+    Returns:
+        tuple: The page of employee records and the cursor of the next page,
+        or None if this is the last page.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    after = decode_cursor(cursor, order_by) if cursor else None
+    page = store.page(order_by, after, limit + 1, search_predicates(**criteria))
+    if len(page) > limit:
+        page = page[:limit]
+        return page, encode_cursor(ORDER_KEYS[order_by](page[-1]))
+    return page, None
+
+
+def paginate_employees(employees, order_by="emp_id", cursor=None, limit=None):
+    """this function will return one page of the given employees and the next cursor"""
+    return paginate(employees, order_by, cursor, limit)
+
+
+def iter_employees(order_by="emp_id", batch_size=500):
+    """this function will yield every employee, fetching batch_size records at a time"""
+    after = None
+    while True:
+        page = store.page(order_by, after, batch_size)
+        yield from page
+        if len(page) < batch_size:
+            return
+        after = ORDER_KEYS[order_by](page[-1])
 
 
 def save_employee(new_employee):
-    """this function will save the employee data in the file"""
-    existing_data = get_existing_data()
-    existing_data.append(new_employee)
-    with open(JSON_PATH, "w", encoding="utf-8") as file:
-        json.dump(existing_data, file, indent=2)
+    """this function will save the employee data in the store"""
+    store.add(new_employee)
 
 
 def get_employee_by_id(id: str):
     """this function will get the employee data by id"""
-    existing_data = get_existing_data()
-    for employee in existing_data:
-        if employee["emp_id"] == id:
-            return employee
+    return store.get(id)
 
 
 def update_employee_by_id(id: str, updated_employee):
     """this function will update the employee data by id"""
-    existing_data = get_existing_data()
-    for index, employee in enumerate(existing_data):
-        if employee["emp_id"] == id:
-            # Exclude updating emp_id field
-            updated_data = {
-                key: value for key, value in updated_employee.items() if key != "emp_id"
-            }
-            existing_data[index].update(updated_data)
-            break
-
-    with open(JSON_PATH, "w", encoding="utf-8") as file:
-        json.dump(existing_data, file, indent=2)
+    return store.update(id, updated_employee)
 
 
 def delete_employee_by_id(id: str):
     """this function will delete the employee data by id"""
-    existing_data = get_existing_data()
-    for index, employee in enumerate(existing_data):
-        if employee["emp_id"] == id:
-            employee_data = existing_data[index]
-            existing_data.remove(existing_data[index])
-            break
-    with open(JSON_PATH, "w", encoding="utf-8") as file:
-        json.dump(existing_data, file, indent=2)
+    encoder.discard(id)
+    return store.delete(id)
+
 
-    return employee_data
+def save_employees(new_employees):
+    """this function will save several employees with one write"""
+    return store.add_many(new_employees)
+
+
+def update_employees_by_id(updates):
+    """this function will update several employees, given as (id, data) pairs, with one write"""
+    return store.update_many(updates)
+
+
+def delete_employees_by_id(ids):
+    """this function will delete several employees by id with one write"""
+    for id in ids:
+        encoder.discard(id)
+    return store.delete_many(ids)
 
 
 def get_employees_by_department(department: str):
     """this function will get the employee data by department"""
-    existing_data = get_existing_data()
-    department_employee = []
-    for employee in existing_data:
-        if employee.get("emp_department") == department:
-            department_employee.append(employee)
-
-    return department_employee
+    return store.find_by("emp_department", department)
 
 
 def get_employees_by_designation(designation: str):
     """this function will get the employee data by designation"""
-    existing_data = get_existing_data()
-    designation_employee = []
-    for employee in existing_data:
-        if employee.get("emp_designation") == designation:
-            designation_employee.append(employee)
+    return store.find_by("emp_designation", designation)
+
 
-    return designation_employee
+def search_employees_by_name(
+    name: str, mode="prefix", limit=20, threshold=DEFAULT_SIMILARITY
+):
+    """this function will get the employee data whose name matches by prefix, substring or fuzzy mode"""
+    return store.find_by_name(name, mode, limit, threshold)
 
 
 def get_employees_by_skill(skill: str):
     """this function will get the employee data by skill"""
-    existing_data = get_existing_data()
-    skill_employee = []
-    for employee in existing_data:
-        if skill in employee.get("emp_skills"):
-            skill_employee.append(employee)
+    return store.find_by("emp_skills", skill)
+
 
-    return skill_employee
+def get_employees_by_skills(all_skills=(), any_skills=()):
+    """this function will get the employee data having all and/or any of the skills"""
+    return store.find_by_skills(all_skills, any_skills)
+
+
+def search_employees(**criteria):
+    """
+    Searches the employees matching every given criterion at once.
+
+    Args:
+        **criteria: The keyword arguments of helpers.query.search_predicates.
+
+    Returns:
+        tuple: The matching employee records and the query plan used to find them.
+    """
+    return store.search(search_predicates(**criteria))
+
+
+def get_employees_matching(**criteria):
+    """this function will get the employee data matching every given criterion"""
+    return store.search(search_predicates(**criteria))[0]
 
 
 def get_employees_by_gender(gender: str):
     """this function will get the employee data by gender"""
-    existing_data = get_existing_data()
-    gender_employee = []
-    for employee in existing_data:
-        if employee.get("emp_gender") == gender:
-            gender_employee.append(employee)
-
-    return gender_employee
+    return store.find_by("emp_gender", gender)
 
 
 def get_employees_by_status(status: str):
     """this function will get the employee data by status"""
-    existing_data = get_existing_data()
-    status_employee = []
-    for employee in existing_data:
-        if employee.get("emp_status") == status:
-            status_employee.append(employee)
-
-    return status_employee
+    return store.find_by("emp_status", status)
 
 
 def get_employees_by_salary_range(min_salary: float, max_salary: float):
     """this function will get the employee data by salary range"""
-    existing_data = get_existing_data()
-    salary_employee = []
-    for employee in existing_data:
-        if min_salary <= employee.get("emp_salary") <= max_salary:
-            salary_employee.append(employee)
+    if ANALYTICS == "columnar":
+        ids = get_columnar_roster().salary_range(min_salary, max_salary)
+        # Employees deleted since the columnar copy was built are skipped
+        return [employee for employee in map(store.get, ids) if employee is not None]
+    return store.find_in_range("emp_salary", min_salary, max_salary)
 
-    return salary_employee
+
+def get_top_earners(n: int):
+    """this function will get the n employees with the highest salary"""
+    return store.top("emp_salary", n)
+
+
+def get_bottom_earners(n: int):
+    """this function will get the n employees with the lowest salary"""
+    return store.bottom("emp_salary", n)
+
+
+def get_salary_percentile(percentile: float):
+    """this function will get the salary at the given percentile"""
+    return store.percentile("emp_salary", percentile)
 
 
 def generate_report_skill_wise():
     """this function will generate a report of the number of employees having each skill"""
-    existing_data = get_existing_data()
-    skill_count = {}
-    for employee in existing_data:
-        for skill in employee.get("emp_skills"):
-            if skill in skill_count:
-                skill_count[skill] += 1
-            else:
-                skill_count[skill] = 1
-
-    return skill_count
+    return store.value_counts("emp_skills")
 
 
 def generate_report_department_wise():
     """this function will generate a report of the number of employees in each department"""
-    existing_data = get_existing_data()
-    department_count = {}
-    for employee in existing_data:
-        department = employee.get("emp_department")
-        if department in department_count:
-            department_count[department] += 1
-        else:
-            department_count[department] = 1
+    return {
+        department: stats["count"]
+        for department, stats in generate_report_department_salary().items()
+    }
+
 
-    return department_count
+def generate_report_department_salary():
+    """this function will generate a report of the salary statistics of each department"""
+    if ANALYTICS == "columnar":
+        return get_columnar_roster().group_salary_stats("emp_department")
+    return store.department_salary_stats()
 
 
 def generate_report_salary_wise():
     """this function will generate a report of the number of employees in each salary range"""
-    existing_data = get_existing_data()
-    salary_ranges = [
-        (0, 20000),
-        (20000, 40000),
-        (40000, 60000),
-        (60000, 80000),
-        (80000, 100000),
-        (100000, float("inf")),
-    ]
-    salary_count = {}
-    for employee in existing_data:
-        salary = employee.get("emp_salary")
-        for min_salary, max_salary in salary_ranges:
-            if min_salary <= salary < max_salary:
-                range_str = f"{min_salary}-{max_salary}"
-                if range_str in salary_count:
-                    salary_count[range_str] += 1
-                else:
-                    salary_count[range_str] = 1
-                break
-
-    return salary_count
+    if ANALYTICS == "columnar":
+        return get_columnar_roster().salary_histogram()
+    return store.salary_bucket_counts()
+
+
+def get_columnar_roster():
+    """
+    Gets a columnar, NumPy-backed copy of the roster for vectorized analytics.
+
+    The copy is rebuilt only when the data version has changed since it was
+    last built. Requires the optional numpy package.
+
+    Returns:
+        ColumnarRoster: The columnar roster.
+    """
+    global _columnar
+    version = store.version()
+    built_version, roster = _columnar
+    if roster is None or built_version != version:
+        roster = ColumnarRoster(store.all())
+        _columnar = (version, roster)
+    return roster
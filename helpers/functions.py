@@ -1,10 +1,47 @@
 # functions.py
 
 import json
-import requests
-from models.employee import Employee
+import os
+from helpers.client import BASE_URL, EmployeeClient
+from helpers.replica import REPLICA_ENABLED, EmployeeReplica
+from models.employee import Employee, EmployeeUpdate
 
-base_url = "http://localhost:8000"
+base_url = BASE_URL
+
+# One pooled, keep-alive client shared by every menu action
+client = EmployeeClient(base_url)
+
+# Optional local replica of the roster answering lookups and filters
+replica = EmployeeReplica(client) if REPLICA_ENABLED else None
+
+# Set EMP_CLIENT_FUZZY=1 to retry a name search that found nothing as a fuzzy
+# search, which tolerates typos but costs the server far more than a
+# substring search
+FUZZY_FALLBACK = os.environ.get("EMP_CLIENT_FUZZY", "0") == "1"
+
+
+def replica_ready():
+    """
+    Returns True if the local replica is enabled and current enough to answer reads.
+    """
+    return replica is not None and replica.refresh()
+
+
+def invalidate_replica():
+    """
+    Makes the local replica, if enabled, sync before the next read after a write.
+    """
+    if replica is not None:
+        replica.invalidate()
+
+
+def close():
+    """
+    Saves the local replica, if enabled, and closes the pooled connections.
+    """
+    if replica is not None:
+        replica.save()
+    client.close()
 
 
 def take_employee_id():
@@ -15,6 +52,36 @@ def take_employee_id():
     return id
 
 
+def take_employee_name():
+    """
+    Takes user input for the employee name and returns it.
+    """
+    name = input("Enter the employee name: ")
+    return name
+
+
+def take_file_path():
+    """
+    Takes user input for the path of a JSON file and returns it.
+    """
+    file_path = input("Enter the path of the JSON file: ")
+    return file_path
+
+
+def read_json_file(file_path):
+    """
+    Reads a JSON list from a file.
+
+    Parameters:
+        file_path (str): The path of the JSON file.
+
+    Returns:
+        list: The items stored in the file.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
 def add_employee():
     """
     Adds a new employee to the system.
@@ -41,7 +108,8 @@ def add_employee():
     employee_data = emp.dict()
 
     # Make a POST request to the API endpoint
-    response = requests.post(f"{base_url}/create_employee", json=employee_data)
+    response = client.post("/create_employee", json=employee_data)
+    invalidate_replica()
 
     # Check the status code and return the result
     if check_response(response):
@@ -74,8 +142,12 @@ def get_employees():
         If the request is successful, returns a list of employees in JSON format.
         If the request is unsuccessful, returns a string indicating that no employees were found.
     """
+    # Answer from the local replica when it is current
+    if replica_ready():
+        return replica.all()
+
     # Make a GET request to the API endpoint
-    response = requests.get(f"{base_url}/employees")
+    response = client.get("/employees")
 
     # Check the status code and return the result
     if check_response(response):
@@ -95,8 +167,12 @@ def get_employee_by_id(id):
         If the request is successful and the employee is found, returns the employee details in JSON format.
         If the request is unsuccessful or the employee is not found, returns a string indicating the error.
     """
+    # Answer from the local replica when it is current
+    if replica_ready():
+        return replica.get(id) or "Employee not found"
+
     # Make a GET request to the API endpoint with the id as a query parameter
-    response = requests.get(f"{base_url}/employees/{id}")
+    response = client.get(f"/employees/{id}")
 
     # Check the status code and return the result
     if check_response(response):
@@ -105,10 +181,38 @@ def get_employee_by_id(id):
             return response.json()
         else:
             return "Employee not found"
+    elif response.status_code == 404:
+        return "Employee not found"
     else:
         return "Something went wrong"
 
 
+def search_employee_by_name(name):
+    """
+    Search employees by name on the server.
+
+    Names containing the given text are returned. If there are none and
+    FUZZY_FALLBACK is set, the closest names are returned so that typos are
+    tolerated.
+
+    Parameters:
+        name (str): The employee name, or part of it, to search for.
+
+    Returns:
+        If matching employees are found, returns a list of employees in JSON format.
+        Otherwise returns a string indicating that no employee was found.
+    """
+    modes = ("substring", "fuzzy") if FUZZY_FALLBACK else ("substring",)
+    for mode in modes:
+        # Make a GET request to the API endpoint with the name as a query parameter
+        response = client.get("/employees/by-name", params={"q": name, "mode": mode})
+
+        # Check the status code and return the result
+        if check_response(response) and response.json():
+            return response.json()
+    return "Employee not found"
+
+
 def update_employee():
     """
     Updates an existing employee in the system.
@@ -172,7 +276,8 @@ def update_employee():
         employee_data = new_employee.dict()
 
         # Make a PUT request to the API endpoint with the id as a query parameter and the employee data as the body
-        response = requests.put(f"{base_url}/update_employee/{id}", json=employee_data)
+        response = client.put(f"/update_employee/{id}", json=employee_data)
+        invalidate_replica()
 
         # Check the status code and return the result
         if check_response(response):
@@ -193,7 +298,8 @@ def delete_employee():
     id = take_employee_id()
 
     # Make a DELETE request to the API endpoint with the id as a query parameter
-    response = requests.delete(f"{base_url}/delete_employee/{id}")
+    response = client.delete(f"/delete_employee/{id}")
+    invalidate_replica()
 
     # Check the status code and return the result
     if check_response(response):
@@ -213,8 +319,12 @@ def filter_employees_by_department():
     # Take the name from the user
     name = input("Enter the department name to filter by: ")
 
+    # Answer from the local replica when it is current
+    if replica_ready():
+        return replica.find_by("emp_department", name)
+
     # Make a GET request to the API endpoint with the gender as a query parameter
-    response = requests.get(f"{base_url}/department/{name}")
+    response = client.get(f"/department/{name}")
 
     # Check the status code and return the result
     if check_response(response):
@@ -234,8 +344,12 @@ def filter_employees_by_status():
     # Take the status from the user
     status = input("Enter the status to filter by: ")
 
+    # Answer from the local replica when it is current
+    if replica_ready():
+        return replica.find_by("emp_status", status)
+
     # Make a GET request to the API endpoint with the status as a query parameter
-    response = requests.get(f"{base_url}/status/{status}")
+    response = client.get(f"/status/{status}")
 
     # Check the status code and return the result
     if check_response(response):
@@ -255,8 +369,12 @@ def filter_employees_by_designation():
     # Take the status from the user
     designation = input("Enter the designation to filter by: ")
 
+    # Answer from the local replica when it is current
+    if replica_ready():
+        return replica.find_by("emp_designation", designation)
+
     # Make a GET request to the API endpoint with the status as a query parameter
-    response = requests.get(f"{base_url}/designation/{designation}")
+    response = client.get(f"/designation/{designation}")
 
     # Check the status code and return the result
     if check_response(response):
@@ -277,8 +395,12 @@ def filter_employees_by_salary_range():
     min_salary = float(input("Enter the minimum salary: "))
     max_salary = float(input("Enter the maximum salary: "))
 
+    # Answer from the local replica when it is current
+    if replica_ready():
+        return replica.find_in_range("emp_salary", min_salary, max_salary)
+
     # Make a GET request to the API endpoint with the min_salary and max_salary as query parameters
-    response = requests.get(f"{base_url}/salary/{min_salary}/{max_salary}")
+    response = client.get(f"/salary/{min_salary}/{max_salary}")
 
     # Check the status code and return the result
     if check_response(response):
@@ -289,32 +411,103 @@ def filter_employees_by_salary_range():
 
 def generate_report_salary_wise():
     """
-    Generates a report of the number of employees in each salary range.
+    Generates a report of the salary statistics of each department.
 
     Returns:
-        - If successful, the function returns a dictionary of salary ranges and counts in JSON format.
+        - If successful, the function returns the report as CSV text.
         - If unsuccessful, the function returns the string "Something went wrong".
     """
     # Make a GET request to the API endpoint
-    response = requests.get(f"{base_url}/salary_report")
+    response = client.get("/salary_report")
 
     # Check the status code and return the result
     if check_response(response):
-        return response.json()
+        return response.text
     else:
         return "Something went wrong"
 
 
 def generate_report_department_wise():
     """
-    Generates a report of the number of employees in each department.
+    Generates a report of the employees in each department.
 
     Returns:
-        - If successful, the function returns a dictionary of departments and counts in JSON format.
+        - If successful, the function returns the report as CSV text.
         - If unsuccessful, the function returns the string "Something went wrong".
     """
     # Make a GET request to the API endpoint
-    response = requests.get(f"{base_url}/department_report")
+    response = client.get("/department_report")
+
+    # Check the status code and return the result
+    if check_response(response):
+        return response.text
+    else:
+        return "Something went wrong"
+
+
+def bulk_add_employees():
+    """
+    Adds every employee listed in a JSON file with a single batch request.
+
+    Returns:
+        - If successful, the function returns the per-employee results in JSON format.
+        - If unsuccessful, the function returns the string "Something went wrong".
+    """
+    # Validate every employee locally before sending the batch
+    employees = [
+        Employee(**employee).dict() for employee in read_json_file(take_file_path())
+    ]
+
+    # Make a POST request to the batch create endpoint
+    response = client.post("/employees:batchCreate", json=employees)
+    invalidate_replica()
+
+    # Check the status code and return the result
+    if check_response(response):
+        return response.json()
+    else:
+        return "Something went wrong"
+
+
+def bulk_update_employees():
+    """
+    Updates every employee listed, with its emp_id, in a JSON file with a single batch request.
+
+    Returns:
+        - If successful, the function returns the per-employee results in JSON format.
+        - If unsuccessful, the function returns the string "Something went wrong".
+    """
+    # Validate every employee locally before sending the batch; an employee
+    # without an emp_id is rejected instead of being given a new one
+    employees = [
+        EmployeeUpdate(**employee).dict()
+        for employee in read_json_file(take_file_path())
+    ]
+
+    # Make a POST request to the batch update endpoint
+    response = client.post("/employees:batchUpdate", json=employees)
+    invalidate_replica()
+
+    # Check the status code and return the result
+    if check_response(response):
+        return response.json()
+    else:
+        return "Something went wrong"
+
+
+def bulk_delete_employees():
+    """
+    Deletes every employee whose id is listed in a JSON file with a single batch request.
+
+    Returns:
+        - If successful, the function returns the per-employee results in JSON format.
+        - If unsuccessful, the function returns the string "Something went wrong".
+    """
+    ids = read_json_file(take_file_path())
+
+    # Make a POST request to the batch delete endpoint
+    response = client.post("/employees:batchDelete", json=ids)
+    invalidate_replica()
 
     # Check the status code and return the result
     if check_response(response):
@@ -0,0 +1,104 @@
+"""
+Conditional GET support: data-version ETags and a response byte cache
+
+"""
+
+import hashlib
+import threading
+
+# Number of (route, query) responses kept before the oldest is dropped
+MAX_CACHED_RESPONSES = 512
+
+# Total size of the cached bodies; larger bodies are never cached
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+# Only complete JSON bodies are cached; streamed NDJSON and CSV are not
+CACHEABLE_MEDIA_TYPES = ("application/json",)
+
+
+def make_etag(version, key):
+    """
+    Builds the strong ETag of a response from the data version and the request.
+
+    Args:
+        version (int): The data version the response was built from.
+        key (tuple): What else selects the response, e.g. path, query and Accept.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Returns True if an If-None-Match header value matches an ETag.
+
+    The comparison is weak, as RFC 9110 requires for If-None-Match, so a
+    W/ prefix on either side is ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """
+    Keeps the encoded body and headers of GET responses per route and query.
+
+    The cache only holds responses built from one data version. Caching a
+    response of another version drops every entry of the previous one, so
+    a change to the data invalidates (and frees) every entry without
+    tracking which routes it affects. The oldest entries are dropped when
+    the cache holds more than max_responses entries or max_bytes of bodies.
+    """
+
+    def __init__(self, max_responses=MAX_CACHED_RESPONSES, max_bytes=MAX_CACHED_BYTES):
+        self.max_responses = max_responses
+        self.max_bytes = max_bytes
+        self._version = None
+        self._entries = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """this function will return the cached (body, headers) of key at version, or None"""
+        with self._lock:
+            if version != self._version:
+                return None
+            return self._entries.get(key)
+
+    def put(self, key, version, body, headers):
+        """this function will cache the body and headers of key at version"""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries = {}
+                self._bytes = 0
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            while self._entries and (
+                len(self._entries) >= self.max_responses
+                or self._bytes + len(body) > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._bytes -= len(self._entries.pop(oldest)[0])
+            self._entries[key] = (body, headers)
+            self._bytes += len(body)
+
+    def clear(self):
+        """this function will drop every cached response"""
+        with self._lock:
+            self._version = None
+            self._entries = {}
+            self._bytes = 0
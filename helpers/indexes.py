@@ -0,0 +1,682 @@
+"""
+Secondary indexes maintained by the employee store
+
+"""
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+
+# Highest code point, used as the upper bound of a prefix range of names
+MAX_CHAR = "\U0010ffff"
+
+# Lowest trigram similarity a fuzzy name match must reach by default
+DEFAULT_SIMILARITY = 0.3
+
+# Bounds on the work of one fuzzy name search: the name set entries counted
+# and the candidate names scored. Matches sharing only common trigrams with
+# the query may be missed once a search reaches them.
+FUZZY_MAX_READS = 30000
+FUZZY_MAX_CANDIDATES = 1000
+
+# Target length of the chunks of a SortedList; a chunk twice as long is split
+SORTED_CHUNK_SIZE = 1000
+
+
+class SortedList:
+    """
+    Keeps comparable keys in ascending order as a list of sorted chunks.
+
+    An insert or delete bisects the last keys of the chunks and then the one
+    chunk holding the key, so it shifts at most a chunk instead of the whole
+    list and costs O(log N + SORTED_CHUNK_SIZE) at any size. The chunk
+    lengths are also kept in a Fenwick tree, so turning a chunk into a
+    position and a position into a chunk costs O(log N) as well. The tree is
+    rebuilt only after a chunk is split or emptied.
+    """
+
+    def __init__(self, keys=(), chunk_size=SORTED_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        keys = sorted(keys)
+        self._chunks = [
+            keys[start : start + chunk_size]
+            for start in range(0, len(keys), chunk_size)
+        ]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
+        self._tree = None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._chunks)
+
+    def __getitem__(self, position):
+        """this function will return the key at a position, counting from the end if negative"""
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("SortedList index out of range")
+        index, offset = self._locate(position)
+        return self._chunks[index][offset]
+
+    def _fenwick(self):
+        """this function will return the Fenwick tree of the chunk lengths, building it if needed"""
+        if self._tree is None:
+            tree = [0, *map(len, self._chunks)]
+            for node in range(1, len(tree)):
+                parent = node + (node & -node)
+                if parent < len(tree):
+                    tree[parent] += tree[node]
+            self._tree = tree
+        return self._tree
+
+    def _resize(self, index, delta):
+        """this function will record that a chunk grew or shrank by delta keys"""
+        tree = self._tree
+        if tree is None:
+            return
+        node = index + 1
+        while node < len(tree):
+            tree[node] += delta
+            node += node & -node
+
+    def _start(self, index):
+        """this function will return the position of the first key of a chunk"""
+        tree = self._fenwick()
+        position = 0
+        while index > 0:
+            position += tree[index]
+            index -= index & -index
+        return position
+
+    def _locate(self, position):
+        """this function will return the chunk holding a position and the offset in that chunk"""
+        tree = self._fenwick()
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = index + step
+            if node < len(tree) and tree[node] <= position:
+                index = node
+                position -= tree[node]
+            step >>= 1
+        return index, position
+
+    def add(self, key):
+        """this function will insert a key at its sorted position"""
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self._tree = None
+            return
+        index = min(bisect_left(self._maxes, key), len(self._chunks) - 1)
+        chunk = self._chunks[index]
+        insort(chunk, key)
+        self._maxes[index] = chunk[-1]
+        if len(chunk) < 2 * self.chunk_size:
+            self._resize(index, 1)
+            return
+        half = len(chunk) // 2
+        self._chunks[index : index + 1] = [chunk[:half], chunk[half:]]
+        self._maxes[index : index + 1] = [chunk[half - 1], chunk[-1]]
+        self._tree = None
+
+    def discard(self, key):
+        """this function will remove one occurrence of a key, if present"""
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return
+        chunk = self._chunks[index]
+        position = bisect_left(chunk, key)
+        if chunk[position] != key:
+            return
+        del chunk[position]
+        self._len -= 1
+        if chunk:
+            self._maxes[index] = chunk[-1]
+            self._resize(index, -1)
+        else:
+            del self._chunks[index]
+            del self._maxes[index]
+            self._tree = None
+
+    def bisect_left(self, value, key=None):
+        """this function will return the position of the first key not below value, like bisect.bisect_left"""
+        index = bisect_left(self._maxes, value, key=key)
+        if index == len(self._maxes):
+            return self._len
+        return self._start(index) + bisect_left(self._chunks[index], value, key=key)
+
+    def bisect_right(self, value, key=None):
+        """this function will return the position after the last key not above value, like bisect.bisect_right"""
+        index = bisect_right(self._maxes, value, key=key)
+        if index == len(self._maxes):
+            return self._len
+        return self._start(index) + bisect_right(self._chunks[index], value, key=key)
+
+    def slice(self, start, stop):
+        """this function will return the keys at positions start to stop, like list slicing"""
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return []
+        index, offset = self._locate(start)
+        keys = self._chunks[index][offset : offset + stop - start]
+        while len(keys) < stop - start:
+            index += 1
+            keys.extend(self._chunks[index][: stop - start - len(keys)])
+        return keys
+
+
+class HashIndex:
+    """
+    Maps each value of one categorical employee field to the ids holding it.
+
+    Every bucket is a dictionary used as an insertion-ordered set of emp_ids,
+    so a lookup costs time proportional to the number of matching employees.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._buckets = {}
+
+    def clear(self):
+        """this function will drop every entry from the index"""
+        self._buckets = {}
+
+    def build(self, records):
+        """this function will index many records at once"""
+        self.clear()
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """this function will index a record under its field value"""
+        value = record.get(self.field)
+        self._buckets.setdefault(value, {})[record["emp_id"]] = None
+
+    def remove(self, record):
+        """this function will remove a record from the index"""
+        value = record.get(self.field)
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket.pop(record["emp_id"], None)
+        if not bucket:
+            del self._buckets[value]
+
+    def update(self, old_record, new_record):
+        """this function will move a record if its field value changed"""
+        if old_record.get(self.field) != new_record.get(self.field):
+            self.remove(old_record)
+            self.add(new_record)
+
+    def lookup(self, value):
+        """this function will return the ids of the records with the given value"""
+        return list(self._buckets.get(value, ()))
+
+    def count(self, value):
+        """this function will return the number of records with the given value"""
+        return len(self._buckets.get(value, ()))
+
+    def values(self):
+        """this function will return every distinct value in the index"""
+        return list(self._buckets)
+
+    def counts(self):
+        """this function will return the number of records for every value"""
+        return {value: len(bucket) for value, bucket in self._buckets.items()}
+
+
+def normalize_skill(skill):
+    """this function will return the case-insensitive form of a skill name"""
+    return skill.strip().lower()
+
+
+class InvertedIndex:
+    """
+    Maps every skill to the posting list of ids of the employees having it.
+
+    Skills are normalized for case, so "Coding" and "coding" share a posting
+    list. Postings are insertion-ordered sets of emp_ids and their sizes give
+    an always-current skill histogram.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._postings = {}
+
+    def _skills(self, record):
+        """this function will return the distinct normalized skills of a record"""
+        return {normalize_skill(skill) for skill in record.get(self.field) or ()}
+
+    def clear(self):
+        """this function will drop every entry from the index"""
+        self._postings = {}
+
+    def build(self, records):
+        """this function will index many records at once"""
+        self.clear()
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """this function will add a record to the posting list of each of its skills"""
+        for skill in self._skills(record):
+            self._postings.setdefault(skill, {})[record["emp_id"]] = None
+
+    def remove(self, record, skills=None):
+        """this function will remove a record from the posting lists of its skills"""
+        for skill in self._skills(record) if skills is None else skills:
+            posting = self._postings.get(skill)
+            if posting is None:
+                continue
+            posting.pop(record["emp_id"], None)
+            if not posting:
+                del self._postings[skill]
+
+    def update(self, old_record, new_record):
+        """this function will only touch the posting lists of changed skills"""
+        old_skills = self._skills(old_record)
+        new_skills = self._skills(new_record)
+        self.remove(old_record, old_skills - new_skills)
+        for skill in new_skills - old_skills:
+            self._postings.setdefault(skill, {})[new_record["emp_id"]] = None
+
+    def lookup(self, skill):
+        """this function will return the ids of the employees having the skill"""
+        return list(self._postings.get(normalize_skill(skill), ()))
+
+    def count(self, skill):
+        """this function will return the number of employees having the skill"""
+        return len(self._postings.get(normalize_skill(skill), ()))
+
+    def all_of(self, skills):
+        """
+        Returns the ids of the employees having every one of the skills.
+
+        The posting lists are intersected starting from the shortest one, so
+        the cost is bounded by the rarest skill.
+        """
+        postings = sorted(
+            (self._postings.get(normalize_skill(skill), {}) for skill in skills),
+            key=len,
+        )
+        if not postings:
+            return []
+        shortest, rest = postings[0], postings[1:]
+        return [id for id in shortest if all(id in posting for posting in rest)]
+
+    def any_of(self, skills):
+        """this function will return the ids of the employees having any of the skills"""
+        ids = {}
+        for skill in skills:
+            ids.update(self._postings.get(normalize_skill(skill), {}))
+        return list(ids)
+
+    def values(self):
+        """this function will return every distinct skill in the index"""
+        return list(self._postings)
+
+    def counts(self):
+        """this function will return the number of employees having each skill"""
+        return {skill: len(posting) for skill, posting in self._postings.items()}
+
+
+class SortedIndex:
+    """
+    Keeps (value, emp_id) pairs of one numeric employee field in sorted order.
+
+    The keys live in a SortedList, so inserts and deletes cost O(log N) plus
+    one chunk, range queries cost O(log N + k) and the ends of the order give
+    top-N / bottom-N and percentiles without scanning the roster. A custom key function may be
+    given instead; its keys must be unique and end with the emp_id.
+    """
+
+    def __init__(self, field, key=None):
+        self.field = field
+        self.key = key
+        self._keys = SortedList()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _key(self, record):
+        """this function will return the sort key of a record, or None if unsortable"""
+        if self.key is not None:
+            return self.key(record)
+        value = record.get(self.field)
+        if not isinstance(value, (int, float)):
+            return None
+        return (value, record["emp_id"])
+
+    def clear(self):
+        """this function will drop every entry from the index"""
+        self._keys = SortedList()
+
+    def build(self, records):
+        """this function will index many records at once, sorting the keys only once"""
+        self._keys = SortedList(
+            key for key in map(self._key, records) if key is not None
+        )
+
+    def add(self, record):
+        """this function will insert a record at its sorted position"""
+        key = self._key(record)
+        if key is not None:
+            self._keys.add(key)
+
+    def remove(self, record):
+        """this function will remove a record from the index"""
+        key = self._key(record)
+        if key is not None:
+            self._keys.discard(key)
+
+    def update(self, old_record, new_record):
+        """this function will move a record if its sort key changed"""
+        if self._key(old_record) != self._key(new_record):
+            self.remove(old_record)
+            self.add(new_record)
+
+    def after(self, key, limit):
+        """
+        Returns the ids that follow a key in sorted order.
+
+        Args:
+            key (tuple): The key to start after, or None to start at the beginning.
+            limit (int): The maximum number of ids to return.
+
+        Returns:
+            list: Up to limit emp_ids in ascending key order.
+        """
+        start = 0 if key is None else self._keys.bisect_right(key)
+        return [key[-1] for key in self._keys.slice(start, start + limit)]
+
+    def after_matching(self, key, limit, wanted):
+        """
+        Returns the ids in wanted that follow a key in sorted order.
+
+        The keys are walked in slices from the position after key, each twice
+        as long as the previous one, until limit ids are found, so a page of a
+        large match set costs about limit / (fraction matching) steps.
+
+        Args:
+            key (tuple): The key to start after, or None to start at the beginning.
+            limit (int): The maximum number of ids to return.
+            wanted (set): The ids that may be returned.
+
+        Returns:
+            list: Up to limit emp_ids in ascending key order.
+        """
+        position = 0 if key is None else self._keys.bisect_right(key)
+        step = max(limit, 1)
+        ids = []
+        while len(ids) < limit and position < len(self._keys):
+            for key in self._keys.slice(position, position + step):
+                if key[-1] in wanted:
+                    ids.append(key[-1])
+                    if len(ids) == limit:
+                        break
+            position += step
+            step *= 2
+        return ids
+
+    def _bounds(self, low, high):
+        """this function will return the slice of keys with low <= value <= high"""
+        start = 0 if low is None else self._keys.bisect_left(low, key=itemgetter(0))
+        stop = (
+            len(self._keys)
+            if high is None
+            else self._keys.bisect_right(high, key=itemgetter(0))
+        )
+        return start, max(stop, start)
+
+    def range(self, low, high):
+        """this function will return the ids with low <= value <= high, in ascending order"""
+        start, stop = self._bounds(low, high)
+        return [key[-1] for key in self._keys.slice(start, stop)]
+
+    def count_range(self, low, high):
+        """this function will return the number of values in [low, high] without copying them"""
+        start, stop = self._bounds(low, high)
+        return stop - start
+
+    def top(self, n):
+        """this function will return the ids of the n highest values, highest first"""
+        keys = self._keys.slice(len(self._keys) - n, len(self._keys))
+        return [key[-1] for key in reversed(keys)]
+
+    def bottom(self, n):
+        """this function will return the ids of the n lowest values, lowest first"""
+        return [key[-1] for key in self._keys.slice(0, n)]
+
+    def percentile(self, percent):
+        """
+        Returns the value at the given percentile using the nearest-rank method.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The value at that percentile, or None if the index is empty.
+        """
+        if not len(self._keys):
+            return None
+        rank = max(math.ceil(percent / 100 * len(self._keys)), 1)
+        return self._keys[rank - 1][0]
+
+
+def normalize_name(name):
+    """this function will return the case- and whitespace-insensitive form of a name"""
+    return " ".join(str(name or "").lower().split())
+
+
+def trigrams(text, padded=True):
+    """
+    Returns the distinct character trigrams of a normalized text.
+
+    Padded trigrams also mark the start and end of the text ("  a", " al",
+    "ce "), so short names and shared beginnings weigh in the similarity.
+    Unpadded trigrams are the ones any name containing the text must have.
+    """
+    if padded:
+        text = f"  {text} "
+    return {text[start : start + 3] for start in range(len(text) - 2)}
+
+
+def similarity(left, right):
+    """this function will return the Jaccard similarity of two trigram sets"""
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def rank_by_similarity(text, candidates, limit, threshold=DEFAULT_SIMILARITY):
+    """
+    Ranks candidate names by their trigram similarity to a text.
+
+    Args:
+        text (str): The name searched for.
+        candidates (iterable): (normalized name, emp_id) pairs to score.
+        limit (int): The maximum number of ids to return.
+        threshold (float): The lowest similarity to keep, between 0 and 1.
+
+    Returns:
+        list: Up to limit emp_ids, most similar first.
+    """
+    query = trigrams(normalize_name(text))
+    scored = []
+    for name, id in candidates:
+        score = similarity(query, trigrams(name))
+        if score >= threshold:
+            scored.append((-score, name, id))
+    return [id for _, _, id in heapq.nsmallest(limit, scored)]
+
+
+class TrigramIndex:
+    """
+    Indexes the character trigrams of one text field for name searches.
+
+    Names are normalized and indexed once however many employees share
+    them. Every trigram maps to the set of names having it and the names are
+    also kept in a SortedList, so prefix searches bisect the sorted names, substring
+    searches intersect the sets of the query's trigrams and fuzzy searches
+    score only the names sharing enough trigrams with the query to reach the
+    similarity threshold.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.clear()
+
+    def clear(self):
+        """this function will drop every entry from the index"""
+        self._names = {}
+        self._ids = {}
+        self._postings = {}
+        self._sorted = SortedList()
+
+    def _add_name(self, name):
+        """this function will index the trigrams of a name not indexed yet"""
+        for trigram in trigrams(name):
+            self._postings.setdefault(trigram, set()).add(name)
+
+    def build(self, records):
+        """this function will index many records at once, sorting the names only once"""
+        self.clear()
+        for record in records:
+            name = normalize_name(record.get(self.field))
+            self._names[record["emp_id"]] = name
+            self._ids.setdefault(name, {})[record["emp_id"]] = None
+        for name in self._ids:
+            self._add_name(name)
+        self._sorted = SortedList(self._ids)
+
+    def add(self, record):
+        """this function will index the name of a record"""
+        name = normalize_name(record.get(self.field))
+        self._names[record["emp_id"]] = name
+        ids = self._ids.get(name)
+        if ids is None:
+            ids = self._ids[name] = {}
+            self._add_name(name)
+            self._sorted.add(name)
+        ids[record["emp_id"]] = None
+
+    def remove(self, record):
+        """this function will remove the name of a record from the index"""
+        name = self._names.pop(record["emp_id"], None)
+        if name is None:
+            return
+        ids = self._ids[name]
+        ids.pop(record["emp_id"], None)
+        if ids:
+            return
+        del self._ids[name]
+        for trigram in trigrams(name):
+            posting = self._postings[trigram]
+            posting.discard(name)
+            if not posting:
+                del self._postings[trigram]
+        self._sorted.discard(name)
+
+    def update(self, old_record, new_record):
+        """this function will reindex a record if its name changed"""
+        if normalize_name(old_record.get(self.field)) != normalize_name(
+            new_record.get(self.field)
+        ):
+            self.remove(old_record)
+            self.add(new_record)
+
+    def _expand(self, names, limit):
+        """this function will return up to limit ids of the employees having the names"""
+        ids = []
+        for name in names:
+            ids.extend(self._ids[name])
+            if len(ids) >= limit:
+                break
+        return ids[:limit]
+
+    def prefix(self, text, limit):
+        """this function will return the ids of the names starting with text, in name order"""
+        text = normalize_name(text)
+        start = self._sorted.bisect_left(text)
+        stop = self._sorted.bisect_left(text + MAX_CHAR)
+        return self._expand(self._sorted.slice(start, min(stop, start + limit)), limit)
+
+    def substring(self, text, limit):
+        """
+        Returns the ids of the names containing text, in name order.
+
+        Texts of three characters or more are answered by intersecting the
+        name sets of their trigrams, starting from the smallest one; shorter
+        texts have no trigram and are matched against every name.
+        """
+        text = normalize_name(text)
+        postings = sorted(
+            (
+                self._postings.get(trigram, set())
+                for trigram in trigrams(text, padded=False)
+            ),
+            key=len,
+        )
+        names = postings[0].intersection(*postings[1:]) if postings else self._ids
+        return self._expand(
+            heapq.nsmallest(limit, (name for name in names if text in name)), limit
+        )
+
+    def fuzzy(self, text, limit, threshold=DEFAULT_SIMILARITY):
+        """
+        Returns the ids of the names most similar to text, most similar first.
+
+        A name with similarity at least threshold shares at least
+        needed = ceil(threshold * |query trigrams|) trigrams with the query.
+        The name sets of the query's trigrams are counted from the smallest
+        one until FUZZY_MAX_READS entries are read, and up to
+        FUZZY_MAX_CANDIDATES of the names counted most often, among those
+        that can still reach needed, are counted against the remaining sets
+        and scored. The search thus stays bounded however common the
+        trigrams are, at the cost of missing some matches that share only
+        common trigrams with the query.
+        """
+        query = trigrams(normalize_name(text))
+        needed = max(math.ceil(threshold * len(query)), 1)
+        postings = sorted(
+            (posting for posting in map(self._postings.get, query) if posting),
+            key=len,
+        )
+        counts = Counter()
+        read = used = 0
+        for posting in postings:
+            if used and read + len(posting) > FUZZY_MAX_READS:
+                break
+            counts.update(posting)
+            read += len(posting)
+            used += 1
+        # A match misses at most the trigrams of the sets not counted
+        least = max(needed - (len(query) - used), 1)
+        if used > 1 and len(counts) > FUZZY_MAX_CANDIDATES:
+            least = max(least, 2)
+        candidates = [name for name, count in counts.items() if count >= least]
+        if len(candidates) > FUZZY_MAX_CANDIDATES:
+            candidates = heapq.nlargest(
+                FUZZY_MAX_CANDIDATES, candidates, key=counts.__getitem__
+            )
+        shortlist = set(candidates)
+        for posting in postings[used:]:
+            counts.update(shortlist & posting)
+        scored = []
+        for name in candidates:
+            count = counts[name]
+            if count < needed:
+                continue
+            score = count / (len(query) + len(trigrams(name)) - count)
+            if score >= threshold:
+                scored.append((-score, name))
+        return self._expand((name for _, name in heapq.nsmallest(limit, scored)), limit)
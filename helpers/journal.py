@@ -0,0 +1,219 @@
+"""
+Append-only write-ahead journal for employee mutations
+
+"""
+
+import json
+import os
+import shutil
+
+from helpers.snapshot import dumps_binary
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+def dump_snapshot(path, records, binary=False):
+    """
+    Writes the employee records to a snapshot file and flushes it to disk.
+
+    Args:
+        path (str): The file to write.
+        records (list): The employee records to write.
+        binary (bool): Write the binary snapshot format instead of indented JSON.
+    """
+    if binary:
+        with open(path, "wb") as file:
+            file.write(dumps_binary(records))
+            file.flush()
+            os.fsync(file.fileno())
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(records, file, indent=2)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def write_snapshot(path, records, binary=False):
+    """
+    Atomically writes the employee records to a snapshot file.
+
+    The data is written to a temporary file next to the target and then
+    renamed over the target, so a crash never leaves a truncated snapshot
+    behind.
+
+    Args:
+        path (str): The snapshot file to write.
+        records (list): The employee records to write.
+        binary (bool): Write the binary snapshot format instead of indented JSON.
+    """
+    tmp_path = f"{path}.tmp"
+    dump_snapshot(tmp_path, records, binary)
+    os.replace(tmp_path, path)
+
+
+def apply_entry(records, entry):
+    """
+    Applies one journal entry to a dictionary of records keyed by emp_id.
+
+    Entries are idempotent, so replaying an entry that is already part of
+    the snapshot leaves the records unchanged.
+
+    Args:
+        records (dict): The employee records keyed by emp_id.
+        entry (dict): The journal entry to apply.
+    """
+    op = entry["op"]
+    if op == CREATE:
+        records[entry["emp_id"]] = entry["data"]
+    elif op == UPDATE:
+        if entry["emp_id"] in records:
+            records[entry["emp_id"]] = {**records[entry["emp_id"]], **entry["data"]}
+    elif op == DELETE:
+        records.pop(entry["emp_id"], None)
+
+
+class Journal:
+    """
+    An append-only log of create/update/delete entries, one JSON object per line.
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.entry_count = 0
+        self._file = None
+
+    @property
+    def old_path(self):
+        """the journal segment that is being folded into the snapshot"""
+        return f"{self.path}.old"
+
+    @property
+    def size(self):
+        """the size of the active journal segment in bytes"""
+        return self._file.tell() if self._file else 0
+
+    def _truncate_torn_tail(self):
+        """this function will cut off a partially written last entry"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as file:
+            data = file.read()
+            if data and not data.endswith(b"\n"):
+                file.truncate(data.rfind(b"\n") + 1)
+
+    def open(self):
+        """this function will open the journal for appending"""
+        if self._file is None:
+            self._truncate_torn_tail()
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        """this function will close the journal file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def append(self, op, emp_id, data=None):
+        """
+        Appends one entry to the journal and flushes it to disk.
+
+        Args:
+            op (str): One of CREATE, UPDATE or DELETE.
+            emp_id (str): The id of the affected employee.
+            data (dict): The new record (create) or changed fields (update).
+        """
+        self.append_many([(op, emp_id, data)])
+
+    def append_many(self, entries):
+        """
+        Appends several entries to the journal with a single flush to disk.
+
+        Args:
+            entries (list): (op, emp_id, data) tuples, as taken by append.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        self.open()
+        lines = []
+        for op, emp_id, data in entries:
+            entry = {"op": op, "emp_id": emp_id}
+            if data is not None:
+                entry["data"] = data
+            lines.append(json.dumps(entry) + "\n")
+        data = "".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.entry_count += len(lines)
+        # json.dumps escapes non-ASCII characters, so characters are bytes
+        return len(data)
+
+    def _read_entries(self, path):
+        """this function will yield the entries stored in a journal segment"""
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    break
+                yield entry
+
+    def replay(self, records):
+        """
+        Replays the journal on top of a snapshot.
+
+        Args:
+            records (list): The employee records read from the snapshot.
+
+        Returns:
+            dict: The employee records keyed by emp_id, in insertion order,
+            with every journal entry applied.
+        """
+        # Records are validated after the replay, so one without an emp_id
+        # is reported there instead of failing here
+        by_id = {record.get("emp_id"): record for record in records}
+        self.entry_count = 0
+        for path in (self.old_path, self.path):
+            for entry in self._read_entries(path):
+                apply_entry(by_id, entry)
+                if path == self.path:
+                    self.entry_count += 1
+        return by_id
+
+    def rotate(self):
+        """
+        Moves the active segment aside so a compactor can fold it into the
+        snapshot while new entries go to a fresh segment.
+
+        If the segment of an earlier compaction is still there, because that
+        compaction failed, the active segment is appended to it instead of
+        replacing it, so none of its entries are lost. A crash before the
+        active segment is removed leaves its entries in both segments, and
+        replaying them twice gives the same records.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            if os.path.exists(self.old_path):
+                with open(self.old_path, "ab") as old, open(self.path, "rb") as active:
+                    shutil.copyfileobj(active, old)
+                    old.flush()
+                    if self.fsync:
+                        os.fsync(old.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.old_path)
+        self.entry_count = 0
+        self.open()
+
+    def discard_old(self):
+        """this function will delete the segment that has been compacted"""
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
@@ -0,0 +1,53 @@
+"""
+Reader/writer lock used by the employee store
+
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class RWLock:
+    """
+    A lock that lets any number of readers in at once but writers only alone.
+
+    Waiting writers block new readers, so a steady stream of reads cannot
+    starve a write. The lock is not reentrant.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        """this function will hold the lock shared for the duration of the block"""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        """this function will hold the lock exclusively for the duration of the block"""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
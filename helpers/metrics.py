@@ -0,0 +1,210 @@
+"""
+Request and storage metrics exposed in the Prometheus text format
+
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)  # fmt: skip
+
+# Upper bounds, in bytes, of the payload size histogram buckets
+SIZE_BUCKETS = tuple(4**power * 256 for power in range(10))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    """this function will format a sample value the way Prometheus expects"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names, values):
+    """this function will format label pairs as {name="value",...}"""
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """
+    A monotonically increasing count, one series per combination of label values.
+
+    The name of a counter ends in _total, which its HELP, TYPE and sample
+    lines all use.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """this function will add amount to the series of the given labels"""
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        """this function will yield (suffix, label names, label values, value) samples"""
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            yield "", self.labels, key, value
+
+
+class Histogram:
+    """
+    Counts observations in cumulative buckets, one series per combination of labels.
+
+    Quantiles such as the p99 latency are computed from the buckets by
+    Prometheus with histogram_quantile().
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """this function will count one observation in the series of the given labels"""
+        key = tuple(labels[name] for name in self.labels)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """this function will observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        """this function will yield (suffix, label names, label values, value) samples"""
+        with self._lock:
+            series = {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            }
+        for key, (counts, total, count) in series.items():
+            cumulative = 0
+            bucket_labels = self.labels + ("le",)
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_key = key + (_format_value(bound),)
+                yield "_bucket", bucket_labels, bucket_key, cumulative
+            yield "_sum", self.labels, key, total
+            yield "_count", self.labels, key, count
+
+
+class Registry:
+    """Holds every metric of the process and renders them for scraping."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        """this function will add a metric and return it"""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        """this function will create and register a counter"""
+        return self.register(Counter(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        """this function will create and register a histogram"""
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, one HELP and TYPE header per metric followed
+            by its samples.
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, names, values, value in metric.samples():
+                lines.append(
+                    f"{metric.name}{suffix}{_format_labels(names, values)} "
+                    f"{_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+# The process-wide registry and the metrics recorded by the API and the stores
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "emp_http_requests_total",
+    "HTTP requests handled, by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_ERRORS = registry.counter(
+    "emp_http_request_errors_total",
+    "HTTP requests answered with a 4xx or 5xx status or an unhandled exception.",
+    ("method", "route"),
+)
+HTTP_LATENCY = registry.histogram(
+    "emp_http_request_duration_seconds",
+    "Time to answer an HTTP request, by method and route template.",
+    ("method", "route"),
+)
+HTTP_RESPONSE_SIZE = registry.histogram(
+    "emp_http_response_size_bytes",
+    "Size of HTTP response bodies with a known length, by route template.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+STORAGE_LATENCY = registry.histogram(
+    "emp_storage_operation_duration_seconds",
+    "Time spent in storage operations such as load, parse, write and index, by"
+    " backend (json, binary, sqlite or mmap) and operation.",
+    ("backend", "operation"),
+)
+STORAGE_PAYLOAD = registry.histogram(
+    "emp_storage_payload_bytes",
+    "Bytes read or written by storage operations.",
+    ("backend", "operation"),
+    SIZE_BUCKETS,
+)
@@ -0,0 +1,307 @@
+"""
+Read-only storage backend over a memory-mapped record file
+
+Usage:
+    python -m helpers.mmap_store [json_path] [records_path]
+
+"""
+
+import argparse
+import copy
+import heapq
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+from helpers.metrics import STORAGE_LATENCY, STORAGE_PAYLOAD
+from helpers.pagination import ORDER_KEYS
+from helpers.serialization import dumps, orjson
+from helpers.storage import ReadOnlyStoreError, validate_record
+from helpers.store import EmployeeStore
+
+MAGIC = b"EMPRECS1"
+
+# Length prefix of every record
+RECORD_HEADER = struct.Struct("<I")
+
+# Record fields read by the structures not named after the field they index
+STRUCTURE_FIELDS = {
+    "created_date": ("created_date", "created_time"),
+    "department_salary": ("emp_department", "emp_salary"),
+    "salary_buckets": ("emp_salary",),
+}
+
+# Secondary structures kept in memory unless the store is told otherwise; the
+# emp_id ordering keeps pages and exports from scanning the file every page
+RESIDENT = ("emp_id",)
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def write_record_file(path, records):
+    """
+    Atomically writes employee records to a record file.
+
+    The file starts with MAGIC and holds one compact JSON document per
+    record, each preceded by its length, so any record can be decoded on its
+    own from its offset.
+
+    Args:
+        path (str): The record file to write.
+        records (list): The employee records, in roster order.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC)
+        for record in records:
+            encoded = dumps(record)
+            file.write(RECORD_HEADER.pack(len(encoded)))
+            file.write(encoded)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def decode_record(buffer, offset):
+    """this function will decode the record stored at offset of a record file"""
+    (length,) = RECORD_HEADER.unpack_from(buffer, offset)
+    start = offset + RECORD_HEADER.size
+    return loads(buffer[start : start + length])
+
+
+def _projections(columns):
+    """this function will yield one record per row of the columns, holding only their fields"""
+    fields = list(columns)
+    for values in zip(*columns.values()):
+        yield dict(zip(fields, values))
+
+
+class MappedRecords(Mapping):
+    """
+    The records of a mapped record file keyed by emp_id, decoded on access.
+
+    Only the emp_id to offset index is resident. Every lookup decodes the
+    record from the mapped buffer and returns a new dict.
+    """
+
+    def __init__(self, buffer=b"", offsets=None):
+        self._buffer = buffer
+        self._offsets = offsets or {}
+
+    def __getitem__(self, id):
+        return decode_record(self._buffer, self._offsets[id])
+
+    def __contains__(self, id):
+        return id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+
+class MmapStore(EmployeeStore):
+    """
+    Read-only store that serves employee records from a memory-mapped file.
+
+    The record file is mapped rather than read, and only the emp_id to
+    offset index and the secondary structures named in `resident` stay in
+    memory: field indexes by field name, orderings by ORDER_KEYS name and
+    the aggregates "department_salary" and "salary_buckets". Queries that
+    need any other structure build it for the call from a scan of the
+    file, trading time for memory. Lookups, filters and pages decode just
+    the records they return, straight from the mapped buffer. Worker
+    processes mapping the same file share it through the OS page cache.
+
+    The file is published by helpers.mmap_store from the JSON store; when it
+    is replaced, the store maps the new file on next access, like the JSON
+    store reloads a changed data file. Writes raise ReadOnlyStoreError.
+    """
+
+    # Every read decodes a new dict from the mapped file
+    stable_records = False
+
+    def __init__(self, records_path, eager_name_index=False, resident=RESIDENT):
+        super().__init__(records_path, eager_name_index=eager_name_index)
+        self._file = None
+        self._map = None
+        # Unbuilt copies of every structure, for the ones built per call
+        self._templates = {**self.indexes, **self.orderings, **self.aggregates}
+        unknown = set(resident) - set(self._templates)
+        if unknown:
+            raise ValueError(f"Unknown mmap store structures: {sorted(unknown)}")
+        self.indexes = {n: i for n, i in self.indexes.items() if n in resident}
+        self.orderings = {n: i for n, i in self.orderings.items() if n in resident}
+        self.aggregates = {n: i for n, i in self.aggregates.items() if n in resident}
+
+    @property
+    def _backend(self):
+        """the backend label of the storage metrics"""
+        return "mmap"
+
+    def _unmap(self):
+        """this function will release the current mapping, if any"""
+        self._records = MappedRecords()
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def _load(self):
+        """this function will map the record file and index it"""
+        with STORAGE_LATENCY.time(backend=self._backend, operation="load"):
+            self._read_data()
+
+    def _read_data(self):
+        """this function will map the record file and build the offset and secondary indexes"""
+        signature = self._file_signature()
+        self._unmap()
+        columns = {field: [] for field in self._indexed_fields()}
+        offsets = {}
+        if signature is not None and signature[1] > len(MAGIC):
+            self._file = open(self.data_path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[: len(MAGIC)] != MAGIC:
+                self._unmap()
+                raise ValueError(f"{self.data_path} is not an employee record file")
+            with STORAGE_LATENCY.time(backend=self._backend, operation="parse"):
+                # Each record is dropped as soon as its indexed fields are
+                # taken, so the values the indexes keep are packed together
+                # instead of pinning the memory of whole decoded records
+                offset = len(MAGIC)
+                while offset < len(self._map):
+                    try:
+                        record = validate_record(decode_record(self._map, offset))
+                    except ValueError:
+                        self._unmap()
+                        raise
+                    offsets[record["emp_id"]] = offset
+                    for field, column in columns.items():
+                        column.append(record.get(field))
+                    (length,) = RECORD_HEADER.unpack_from(self._map, offset)
+                    offset += RECORD_HEADER.size + length
+            STORAGE_PAYLOAD.observe(
+                signature[1], backend=self._backend, operation="parse"
+            )
+        with STORAGE_LATENCY.time(backend=self._backend, operation="index_rebuild"):
+            for index in self._structures():
+                index.build(_projections(columns))
+        self._records = MappedRecords(self._map, offsets)
+        # A republished file may differ in any record, so clients must reload
+        self.change_log.reset()
+        self._signature = signature
+        self._loaded = True
+        self._version = self._new_version(signature)
+
+    def _indexed_fields(self):
+        """this function will return the record fields read by the resident structures"""
+        fields = {"emp_id"}
+        for name in (*self.indexes, *self.orderings, *self.aggregates):
+            fields.update(STRUCTURE_FIELDS.get(name, (name,)))
+        if self._name_index_built:
+            fields.add("emp_name")
+        return fields
+
+    def _scanned(self, name):
+        """this function will build a structure that is not kept resident from a scan of the file"""
+        structure = copy.deepcopy(self._templates[name])
+        structure.build(self._records.values())
+        return structure
+
+    def _index(self, field):
+        """this function will return the index of a field, built for the call if not resident"""
+        if field in self.indexes:
+            return self.indexes[field]
+        return self._scanned(field)
+
+    def _ordering(self, order_by):
+        """this function will return the index of an ordering, built for the call if not resident"""
+        if order_by in self.orderings:
+            return self.orderings[order_by]
+        return self._scanned(order_by)
+
+    def _aggregate(self, name):
+        """this function will return a report aggregate, built for the call if not resident"""
+        if name in self.aggregates:
+            return self.aggregates[name]
+        return self._scanned(name)
+
+    def page(self, order_by, after, limit, predicates=()):
+        """
+        Returns records in keyset order starting after a sort key.
+
+        Without a resident ordering, the page is the limit smallest keys of
+        the matching records from one scan of the file, instead of an
+        ordering built for the call.
+        """
+        if order_by in self.orderings:
+            return super().page(order_by, after, limit, predicates)
+        key = ORDER_KEYS[order_by]
+        with self._reading():
+            records = (
+                record
+                for record in self._records.values()
+                if all(predicate.matches(record) for predicate in predicates)
+                and (after is None or key(record) > after)
+            )
+            return heapq.nsmallest(limit, records, key=key)
+
+    def _new_version(self, signature):
+        """
+        Returns the data version of a freshly mapped record file.
+
+        The version is the mtime of the file in microseconds, so every worker
+        mapping the same file serves the same version and ETags.
+        """
+        if signature is None:
+            return super()._new_version(signature)
+        return signature[0] // 1000
+
+    def _apply_batch(self, apply, items):
+        """this function will refuse every write"""
+        raise ReadOnlyStoreError("The memory-mapped store is read-only")
+
+    def close(self):
+        """this function will release the mapping"""
+        with self._lock.write():
+            self._unmap()
+            self._loaded = False
+
+
+def export_records(json_path, records_path, journal_path=None):
+    """
+    Publishes the JSON store as a record file for the memory-mapped store.
+
+    Args:
+        json_path (str): The JSON (or binary snapshot) data file to read.
+        records_path (str): The record file to write.
+        journal_path (str): The journal to replay on top of the data file, if any.
+
+    Returns:
+        int: The number of employees exported.
+    """
+    source = EmployeeStore(json_path, journal_path=journal_path)
+    source.load()
+    employees = source.all()
+    source.close()
+    write_record_file(records_path, employees)
+    return len(employees)
+
+
+if __name__ == "__main__":
+    import helpers.features as f
+
+    parser = argparse.ArgumentParser(description="Export emp.json as a record file")
+    parser.add_argument("json_path", nargs="?", default=f.JSON_PATH)
+    parser.add_argument("records_path", nargs="?", default=f.RECORDS_PATH)
+    parser.add_argument(
+        "--journal",
+        default=f.JOURNAL_PATH if os.path.exists(f.JOURNAL_PATH) else None,
+        help="journal to replay on top of the JSON file",
+    )
+    args = parser.parse_args()
+    count = export_records(args.json_path, args.records_path, args.journal)
+    print(f"Exported {count} employees to {args.records_path}")
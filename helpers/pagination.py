@@ -0,0 +1,87 @@
+"""
+Keyset pagination over employee records
+
+"""
+
+import base64
+import heapq
+import json
+
+# Page size used when a page is asked for by cursor without a limit
+DEFAULT_PAGE_SIZE = 100
+
+# Sort keys for every supported ordering; each ends with emp_id so keys are unique
+ORDER_KEYS = {
+    "emp_id": lambda record: (record["emp_id"],),
+    "created_date": lambda record: (
+        record.get("created_date") or "",
+        record.get("created_time") or "",
+        record["emp_id"],
+    ),
+}
+
+
+def encode_cursor(key):
+    """this function will encode a sort key as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, order_by):
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor from a previous page.
+        order_by (str): The ordering the cursor must belong to.
+
+    Returns:
+        tuple: The sort key of the last record of the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another ordering.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    sample = ORDER_KEYS[order_by]({"emp_id": ""})
+    if (
+        not isinstance(key, list)
+        or len(key) != len(sample)
+        or not all(isinstance(part, str) for part in key)
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+
+def paginate(records, order_by="emp_id", cursor=None, limit=None):
+    """
+    Returns one page of records in keyset order.
+
+    Without a limit or cursor the records are returned unchanged, so callers
+    that do not paginate keep today's behaviour. A cursor without a limit
+    returns a page of DEFAULT_PAGE_SIZE records.
+
+    Args:
+        records (list): The records to paginate.
+        order_by (str): One of the keys of ORDER_KEYS.
+        cursor (str): The cursor returned with the previous page, if any.
+        limit (int): The maximum number of records in the page.
+
+    Returns:
+        tuple: The page of records and the cursor of the next page, or None
+        if this is the last page.
+    """
+    if limit is None and cursor is None:
+        return records, None
+    key = ORDER_KEYS[order_by]
+    if cursor is not None:
+        after = decode_cursor(cursor, order_by)
+        records = [record for record in records if key(record) > after]
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    page = heapq.nsmallest(limit + 1, records, key=key)
+    if len(page) > limit:
+        page = page[:limit]
+        return page, encode_cursor(key(page[-1]))
+    return page, None
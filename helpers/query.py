@@ -0,0 +1,277 @@
+"""
+Multi-predicate employee search with a selectivity-based query planner
+
+"""
+
+from helpers.indexes import normalize_skill
+
+
+class Equals:
+    """Predicate matching the employees whose categorical field equals a value."""
+
+    def __init__(self, field, value):
+        self.field = field
+        self.value = value
+
+    def __str__(self):
+        return f"{self.field} = {self.value!r}"
+
+    def matches(self, record):
+        """this function will return True if the record satisfies the predicate"""
+        return record.get(self.field) == self.value
+
+    def estimate(self, index):
+        """this function will return the number of rows the index holds for the value"""
+        return index.count(self.value)
+
+    def lookup(self, index):
+        """this function will return the ids the index holds for the value"""
+        return index.lookup(self.value)
+
+
+class HasSkills:
+    """Predicate matching the employees having every one of the skills."""
+
+    field = "emp_skills"
+
+    def __init__(self, skills):
+        self.skills = sorted({normalize_skill(skill) for skill in skills})
+
+    def __str__(self):
+        return f"{self.field} contains all of {self.skills!r}"
+
+    def matches(self, record):
+        """this function will return True if the record satisfies the predicate"""
+        skills = {normalize_skill(skill) for skill in record.get(self.field) or ()}
+        return skills.issuperset(self.skills)
+
+    def estimate(self, index):
+        """this function will return the posting list size of the rarest skill"""
+        return min(index.count(skill) for skill in self.skills)
+
+    def lookup(self, index):
+        """this function will return the ids from intersecting the posting lists"""
+        return index.all_of(self.skills)
+
+
+class HasAnySkill:
+    """Predicate matching the employees having at least one of the skills."""
+
+    field = "emp_skills"
+
+    def __init__(self, skills):
+        self.skills = sorted({normalize_skill(skill) for skill in skills})
+
+    def __str__(self):
+        return f"{self.field} contains any of {self.skills!r}"
+
+    def matches(self, record):
+        """this function will return True if the record satisfies the predicate"""
+        skills = {normalize_skill(skill) for skill in record.get(self.field) or ()}
+        return not skills.isdisjoint(self.skills)
+
+    def estimate(self, index):
+        """this function will return the total size of the skills' posting lists"""
+        return sum(index.count(skill) for skill in self.skills)
+
+    def lookup(self, index):
+        """this function will return the ids from merging the posting lists"""
+        return index.any_of(self.skills)
+
+
+class Between:
+    """Predicate matching the employees with low <= field <= high; None leaves a side open."""
+
+    def __init__(self, field, low=None, high=None):
+        self.field = field
+        self.low = low
+        self.high = high
+
+    def __str__(self):
+        low = "-inf" if self.low is None else repr(self.low)
+        high = "+inf" if self.high is None else repr(self.high)
+        return f"{self.field} between {low} and {high}"
+
+    def matches(self, record):
+        """this function will return True if the record satisfies the predicate"""
+        value = record.get(self.field)
+        if value is None or isinstance(value, bool):
+            return False
+        try:
+            return (self.low is None or value >= self.low) and (
+                self.high is None or value <= self.high
+            )
+        except TypeError:
+            return False
+
+    def estimate(self, index):
+        """this function will return the number of index entries in the range"""
+        return index.count_range(self.low, self.high)
+
+    def lookup(self, index):
+        """this function will return the ids of the index entries in the range"""
+        return index.range(self.low, self.high)
+
+
+def search_predicates(
+    department=None,
+    designation=None,
+    status=None,
+    gender=None,
+    skills=(),
+    any_skills=(),
+    min_salary=None,
+    max_salary=None,
+    created_from=None,
+    created_to=None,
+):
+    """
+    Builds the predicates of a search from its criteria.
+
+    Args:
+        department (str): The department to match.
+        designation (str): The designation to match.
+        status (str): The status to match.
+        gender (str): The gender to match.
+        skills (list): Skills every employee must have.
+        any_skills (list): Skills of which every employee must have one.
+        min_salary (float): The lowest salary to include.
+        max_salary (float): The highest salary to include.
+        created_from (str): The earliest creation date (YYYY-MM-DD) to include.
+        created_to (str): The latest creation date (YYYY-MM-DD) to include.
+
+    Returns:
+        list: The predicates of the criteria that were given.
+    """
+    predicates = [
+        Equals(field, value)
+        for field, value in (
+            ("emp_department", department),
+            ("emp_designation", designation),
+            ("emp_status", status),
+            ("emp_gender", gender),
+        )
+        if value is not None
+    ]
+    if skills:
+        predicates.append(HasSkills(skills))
+    if any_skills:
+        predicates.append(HasAnySkill(any_skills))
+    if min_salary is not None or max_salary is not None:
+        predicates.append(Between("emp_salary", min_salary, max_salary))
+    if created_from is not None or created_to is not None:
+        predicates.append(Between("created_date", created_from, created_to))
+    return predicates
+
+
+def execute(records, indexes, predicates):
+    """
+    Plans and runs a search over an in-memory roster.
+
+    Every predicate's selectivity is estimated from its index. The most
+    selective one drives the search through an index lookup. Each following
+    predicate is intersected through its own index when its estimate is
+    smaller than the current candidate set, and otherwise checked against
+    the candidate records one by one.
+
+    Args:
+        records (dict): The employee records keyed by emp_id.
+        indexes (dict): The index of every predicate field, keyed by field.
+        predicates (list): The predicates all returned records must satisfy.
+
+    Returns:
+        tuple: The matching records in driving-index order, and the plan as a
+        dict of steps with their estimated and examined rows.
+    """
+    steps = []
+    if not predicates:
+        rows = list(records.values())
+        steps.append(
+            {"operation": "scan", "predicate": None, "rows_examined": len(rows)}
+        )
+        return rows, _plan(steps, rows)
+
+    ordered = sorted(
+        (
+            (predicate.estimate(indexes[predicate.field]), predicate)
+            for predicate in predicates
+        ),
+        key=lambda item: item[0],
+    )
+    estimate, driver = ordered[0]
+    ids = driver.lookup(indexes[driver.field])
+    steps.append(
+        {
+            "operation": "index lookup",
+            "predicate": str(driver),
+            "estimated_rows": estimate,
+            "rows_examined": len(ids),
+        }
+    )
+
+    filters = []
+    for estimate, predicate in ordered[1:]:
+        if not ids:
+            break
+        if estimate < len(ids):
+            wanted = set(predicate.lookup(indexes[predicate.field]))
+            steps.append(
+                {
+                    "operation": "index intersect",
+                    "predicate": str(predicate),
+                    "estimated_rows": estimate,
+                    "rows_examined": len(wanted),
+                }
+            )
+            ids = [id for id in ids if id in wanted]
+        else:
+            filters.append((estimate, predicate))
+
+    rows = [records[id] for id in ids]
+    for estimate, predicate in filters:
+        if not rows:
+            break
+        steps.append(
+            {
+                "operation": "filter",
+                "predicate": str(predicate),
+                "estimated_rows": estimate,
+                "rows_examined": len(rows),
+            }
+        )
+        rows = [record for record in rows if predicate.matches(record)]
+    return rows, _plan(steps, rows)
+
+
+def matching_ids(indexes, predicates):
+    """
+    Returns the ids of the employees satisfying every predicate, without reading records.
+
+    The index lookups are intersected starting from the most selective
+    predicate, so the set never grows past its smallest estimate.
+
+    Args:
+        indexes (dict): The index of every predicate field, keyed by field.
+        predicates (list): At least one predicate.
+
+    Returns:
+        set: The matching emp_ids.
+    """
+    ordered = sorted(
+        predicates, key=lambda predicate: predicate.estimate(indexes[predicate.field])
+    )
+    ids = set(ordered[0].lookup(indexes[ordered[0].field]))
+    for predicate in ordered[1:]:
+        if not ids:
+            break
+        ids.intersection_update(predicate.lookup(indexes[predicate.field]))
+    return ids
+
+
+def _plan(steps, rows):
+    """this function will summarize the steps of a plan"""
+    return {
+        "steps": steps,
+        "rows_examined": sum(step["rows_examined"] for step in steps),
+        "rows_returned": len(rows),
+    }
@@ -0,0 +1,192 @@
+"""
+Local replica of the employee roster for the terminal client, kept in sync through the change feed
+
+"""
+
+import json
+import os
+import time
+
+import requests
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The replica is opt-in; lookups and filters go to the server without it
+REPLICA_ENABLED = os.environ.get("EMP_CLIENT_CACHE", "0") == "1"
+REPLICA_PATH = os.environ.get(
+    "EMP_CLIENT_CACHE_PATH", os.path.join(project_root, "data", "client_cache.json")
+)
+
+# Seconds after a sync during which reads are answered without asking the server
+REPLICA_MAX_AGE = float(os.environ.get("EMP_CLIENT_CACHE_MAX_AGE", "5"))
+
+# Changes requested per /changes call while catching up
+CHANGES_LIMIT = 1000
+
+
+class EmployeeReplica:
+    """
+    In-memory copy of the roster answering lookups and filters locally.
+
+    The roster is loaded once with GET /employees and then kept current by
+    applying the changes after the last sequence number seen, from GET
+    /changes?since=, so a sync that finds nothing new costs one small
+    request. When the server no longer has those changes (410, e.g. after a
+    restart) the roster is loaded again. Reads within max_age seconds of a
+    sync are answered without asking the server, and the writes of this
+    client force a sync before the next read.
+
+    The replica is saved to a local file on close, so the next session
+    starts from it and only fetches what changed in between.
+    """
+
+    def __init__(self, client, path=REPLICA_PATH, max_age=REPLICA_MAX_AGE):
+        self.client = client
+        self.path = path
+        self.max_age = max_age
+        self._records = {}
+        self._seq = None
+        self._synced_at = None
+        self._dirty = False
+        self._read_file()
+
+    def _read_file(self):
+        """this function will load the replica saved by an earlier session, if any"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                saved = json.load(file)
+        except (OSError, ValueError):
+            return
+        # A replica saved against another server is of no use
+        if saved.get("base_url") != self.client.base_url:
+            return
+        self._records = {record["emp_id"]: record for record in saved["employees"]}
+        self._seq = saved["seq"]
+
+    def save(self):
+        """this function will atomically write the replica to its file if it changed"""
+        if not self._dirty or self._seq is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "base_url": self.client.base_url,
+                    "seq": self._seq,
+                    "employees": list(self._records.values()),
+                },
+                file,
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _apply(self, change):
+        """this function will apply one change of the feed to the replica"""
+        if change["op"] == "delete":
+            self._records.pop(change["emp_id"], None)
+        else:
+            self._records[change["emp_id"]] = change["employee"]
+
+    def _reload(self):
+        """this function will replace the replica with the whole roster"""
+        # The head is read first, so changes made while the roster is being
+        # sent are applied again by the next catch-up, which is harmless
+        response = self.client.get("/changes")
+        response.raise_for_status()
+        seq = response.json()["head"]
+        response = self.client.get("/employees")
+        response.raise_for_status()
+        self._records = {record["emp_id"]: record for record in response.json()}
+        self._seq = seq
+        self._dirty = True
+
+    def _catch_up(self):
+        """
+        Applies the changes made since the last sync.
+
+        Returns:
+            bool: False if the server no longer has those changes, True otherwise.
+
+        Raises:
+            requests.RequestException: If the server could not be asked.
+        """
+        while True:
+            response = self.client.get(
+                "/changes", params={"since": self._seq, "limit": CHANGES_LIMIT}
+            )
+            if response.status_code == 410:
+                return False
+            response.raise_for_status()
+            body = response.json()
+            for change in body["changes"]:
+                self._apply(change)
+            if body["changes"]:
+                self._dirty = True
+            self._seq = body["last_seq"]
+            if self._seq >= body["head"]:
+                return True
+
+    def sync(self):
+        """
+        Brings the replica up to date with the server.
+
+        Returns:
+            bool: True if the replica is current, False if the server could
+            not be reached, in which case the caller should ask the server.
+        """
+        try:
+            if self._seq is None or not self._catch_up():
+                self._reload()
+                if not self._catch_up():
+                    self._seq = None
+                    return False
+        except (requests.RequestException, ValueError, KeyError):
+            self._synced_at = None
+            return False
+        self._synced_at = time.monotonic()
+        return True
+
+    def refresh(self):
+        """
+        Syncs the replica unless it was synced less than max_age seconds ago.
+
+        Returns:
+            bool: True if reads can be answered from the replica.
+        """
+        if (
+            self._synced_at is not None
+            and time.monotonic() - self._synced_at < self.max_age
+        ):
+            return True
+        return self.sync()
+
+    def invalidate(self):
+        """this function will force a sync before the next read, after a write of this client"""
+        self._synced_at = None
+
+    def all(self):
+        """this function will return all the employee records"""
+        return list(self._records.values())
+
+    def get(self, id):
+        """this function will return the employee record with the given id, or None"""
+        return self._records.get(id)
+
+    def find_by(self, field, value):
+        """this function will return the employee records whose field equals the given value"""
+        return [
+            record for record in self._records.values() if record.get(field) == value
+        ]
+
+    def find_in_range(self, field, low, high):
+        """this function will return the employee records whose field lies in [low, high], in (value, emp_id) order"""
+        matches = [
+            record
+            for record in self._records.values()
+            if isinstance(record.get(field), (int, float))
+            and low <= record[field] <= high
+        ]
+        return sorted(matches, key=lambda record: (record[field], record["emp_id"]))
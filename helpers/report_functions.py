@@ -0,0 +1,167 @@
+"""
+CSV reports built from the employee store
+
+"""
+
+import csv
+import os
+import tempfile
+import threading
+
+import helpers.features as f
+
+REPORTS_PATH = os.path.join(f.project_root, "reports")
+DEPARTMENT_EMPLOYEES_REPORT = os.path.join(
+    REPORTS_PATH, "department_wise_employees.csv"
+)
+DEPARTMENT_SALARY_REPORT = os.path.join(REPORTS_PATH, "department_wise_salary.csv")
+
+# Number of attempts to build a report from one consistent data version
+MAX_BUILD_ATTEMPTS = 3
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Reports are published readable by everyone, within the umask, although
+# mkstemp creates the temporary file readable by its owner only; the umask
+# can only be read by setting it, so it is read once, at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+REPORT_MODE = 0o644 & ~_UMASK
+
+# Data version each report file was last built from, keyed by path, and the
+# locks that let one thread at a time build (and record the version of) a report
+_built_versions = {}
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+
+def _build_lock(path):
+    """this function will return the lock serializing the builds of one report"""
+    with _build_locks_lock:
+        return _build_locks.setdefault(path, threading.Lock())
+
+
+def _write_rows(path, header, rows):
+    """this function will write the CSV rows to a new temporary file next to path and return its path"""
+    descriptor, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(header)
+            writer.writerows(rows())
+        os.chmod(tmp_path, REPORT_MODE)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _build_report(path, header, rows):
+    """
+    Writes a CSV report atomically unless it is already up to date.
+
+    The rows are written one at a time to a temporary file of its own, which
+    is renamed over the report once the data did not change while it was
+    written, or after MAX_BUILD_ATTEMPTS. Threads asking for the same report
+    wait for the build in progress and then find the report up to date;
+    worker processes building it at once each write their own file.
+
+    Args:
+        path (str): The report file to write.
+        header (list): The CSV header row.
+        rows (callable): Returns an iterator over the CSV data rows.
+
+    Returns:
+        str: The path of the up to date report.
+    """
+    with _build_lock(path):
+        version = f.get_data_version()
+        if _built_versions.get(path) == version and os.path.exists(path):
+            return path
+        for attempt in range(1, MAX_BUILD_ATTEMPTS + 1):
+            tmp_path = _write_rows(path, header, rows)
+            latest = f.get_data_version()
+            if latest == version or attempt == MAX_BUILD_ATTEMPTS:
+                break
+            os.remove(tmp_path)
+            version = latest
+        os.replace(tmp_path, path)
+        _built_versions[path] = version
+    return path
+
+
+def _department_employee_rows():
+    """this function will yield one row per department, loading one department at a time"""
+    for department in f.get_departments():
+        employees = f.get_employees_by_department(department)
+        designations = dict.fromkeys(
+            employee.get("emp_designation") for employee in employees
+        )
+        yield [
+            department,
+            len(employees),
+            ", ".join(employee.get("emp_name") for employee in employees),
+            ", ".join(designations),
+        ]
+
+
+def _department_salary_rows():
+    """this function will yield one row per department from the salary aggregates"""
+    for department, stats in f.generate_report_department_salary().items():
+        yield [
+            department,
+            stats["total"],
+            stats["average"],
+            stats["min"],
+            stats["max"],
+        ]
+
+
+def department_wise_employee_report():
+    """
+    Builds the report of the employees in each department.
+
+    Returns:
+        str: The path of the CSV report.
+    """
+    return _build_report(
+        DEPARTMENT_EMPLOYEES_REPORT,
+        ["Department", "No. of employees", "Names", "Designations"],
+        _department_employee_rows,
+    )
+
+
+def department_wise_salary_report():
+    """
+    Builds the report of the salary statistics of each department.
+
+    Returns:
+        str: The path of the CSV report.
+    """
+    return _build_report(
+        DEPARTMENT_SALARY_REPORT,
+        [
+            "Department",
+            "Total salary",
+            "Average salary",
+            "Minimum salary",
+            "Maximum salary",
+        ],
+        _department_salary_rows,
+    )
+
+
+def stream_report(path):
+    """
+    Yields the content of a report file in chunks.
+
+    The file is opened once, so a report replaced while it is being streamed
+    is still sent as one consistent version.
+
+    Args:
+        path (str): The report file to stream.
+    """
+    with open(path, "rb") as file:
+        while chunk := file.read(STREAM_CHUNK_SIZE):
+            yield chunk
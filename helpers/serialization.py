@@ -0,0 +1,67 @@
+"""
+Fast JSON encoding of stored employee records
+
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Number of encoded records kept before the cache is emptied
+MAX_CACHED_RECORDS = 200_000
+
+
+def dumps(value):
+    """
+    Encodes a value as compact JSON bytes, with orjson when it is installed.
+
+    Args:
+        value: Any JSON-compatible value.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class RecordEncoder:
+    """
+    Encodes stored employee records to JSON bytes and caches the result.
+
+    Records are validated against the Employee model when they are written,
+    so they can be sent back without being rebuilt as models. The store
+    replaces a record dict on update instead of mutating it, so a cache entry
+    is only reused while it belongs to the very same dict object; an updated
+    record is a different object and is re-encoded. A max_records of 0
+    disables the cache.
+    """
+
+    def __init__(self, max_records=MAX_CACHED_RECORDS):
+        self.max_records = max_records
+        self._cache = {}
+
+    def encode(self, record):
+        """this function will return the JSON bytes of one record"""
+        cached = self._cache.get(record.get("emp_id"))
+        if cached is not None and cached[0] is record:
+            return cached[1]
+        encoded = dumps(record)
+        if not self.max_records:
+            return encoded
+        if len(self._cache) >= self.max_records:
+            self._cache.clear()
+        self._cache[record.get("emp_id")] = (record, encoded)
+        return encoded
+
+    def encode_list(self, records):
+        """this function will return the JSON bytes of a list of records"""
+        return b"[" + b",".join(self.encode(record) for record in records) + b"]"
+
+    def discard(self, emp_id):
+        """this function will drop the cached bytes of a record"""
+        self._cache.pop(emp_id, None)
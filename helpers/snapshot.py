@@ -0,0 +1,289 @@
+"""
+Compact binary snapshot format for the employee roster
+
+Usage:
+    python -m helpers.snapshot to-binary [json_path] [binary_path]
+    python -m helpers.snapshot to-json [binary_path] [json_path]
+
+"""
+
+import argparse
+import gc
+import json
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+
+MAGIC = b"EMPSNAP1"
+
+# Length prefixes of the schema and of every column section
+SCHEMA_HEADER = struct.Struct("<I")
+SECTION_HEADER = struct.Struct("<Q")
+
+# A string column is dictionary-encoded when at most this share of it is distinct
+MAX_CATEGORY_RATIO = 0.5
+
+# Separates the values of a text column; columns whose values contain it are stored as JSON
+TEXT_SEPARATOR = "\x00"
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector for the duration of the block.
+
+    Decoding a roster allocates millions of dicts, lists and strings and
+    none of them can be garbage, but each allocation burst still triggers a
+    collection that walks the whole growing heap.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _typecode(size):
+    """this function will pick the smallest array typecode that holds size codes"""
+    for typecode in ("B", "H", "I"):
+        if size <= 1 << (8 * array(typecode).itemsize):
+            return typecode
+    return "Q"
+
+
+def _to_bytes(values, typecode):
+    """this function will pack numbers into little-endian bytes"""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _from_bytes(payload, typecode):
+    """this function will unpack little-endian bytes into a list of numbers"""
+    packed = array(typecode)
+    packed.frombytes(payload)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _category_key(value):
+    """this function will return a dictionary key that keeps 1, 1.0 and True apart"""
+    if isinstance(value, list):
+        return (list, tuple(value))
+    return (type(value), value)
+
+
+def _encode_column(values, count):
+    """
+    Encodes the values of one field in the most compact kind that fits them.
+
+    Returns:
+        tuple: The schema entry of the column and its payload bytes.
+    """
+    types = {type(value) for value in values}
+    if types == {float}:
+        return {"kind": "float"}, _to_bytes(values, "d")
+
+    if types == {str} and not any(TEXT_SEPARATOR in value for value in values):
+        distinct = set(values)
+        if len(distinct) > count * MAX_CATEGORY_RATIO:
+            text = TEXT_SEPARATOR.join(values)
+            return {"kind": "text"}, text.encode("utf-8")
+
+    if types <= {str, int, float, bool, type(None), list} and not (
+        list in types
+        and (
+            types != {list}
+            or not all(isinstance(item, str) for value in values for item in value)
+        )
+    ):
+        codes = {}
+        dictionary = []
+        encoded = []
+        for value in values:
+            key = _category_key(value)
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(dictionary)
+                dictionary.append(value)
+            encoded.append(code)
+        typecode = _typecode(len(dictionary))
+        schema = {
+            "kind": "category",
+            "dictionary": dictionary,
+            "typecode": typecode,
+            "lists": types == {list},
+        }
+        return schema, _to_bytes(encoded, typecode)
+
+    return {"kind": "json"}, json.dumps(values, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_column(schema, payload, count):
+    """this function will decode the values of one field"""
+    kind = schema["kind"]
+    if kind == "float":
+        return _from_bytes(payload, "d")
+    if kind == "text":
+        return payload.decode("utf-8").split(TEXT_SEPARATOR)
+    if kind == "category":
+        values = map(
+            schema["dictionary"].__getitem__,
+            _from_bytes(payload, schema["typecode"]),
+        )
+        # Every record gets its own list, as records read from JSON do
+        return list(map(list, values)) if schema["lists"] else list(values)
+    return json.loads(payload)
+
+
+def dumps_binary(records):
+    """
+    Encodes employee records in the binary snapshot format.
+
+    The file starts with MAGIC and a length-prefixed JSON schema, followed by
+    one length-prefixed section per field holding that field for every
+    record. Salaries are packed as doubles. Categorical fields such as
+    department, designation, status, gender, skills and created_date are
+    dictionary-encoded as integer codes into a list of their distinct values.
+    Mostly unique strings such as ids and names are stored as one UTF-8 blob.
+
+    Args:
+        records (list): The employee records, in roster order.
+
+    Returns:
+        bytes: The encoded snapshot.
+    """
+    fields = {}
+    for record in records:
+        for name in record:
+            fields.setdefault(name, None)
+
+    count = len(records)
+    columns = []
+    sections = []
+    for name in fields:
+        absent = [
+            position for position, record in enumerate(records) if name not in record
+        ]
+        values = [record.get(name) for record in records]
+        schema, payload = _encode_column(values, count)
+        schema["name"] = name
+        schema["absent"] = absent
+        columns.append(schema)
+        sections.append(payload)
+
+    schema = json.dumps({"count": count, "fields": columns}).encode("utf-8")
+    parts = [MAGIC, SCHEMA_HEADER.pack(len(schema)), schema]
+    for payload in sections:
+        parts.append(SECTION_HEADER.pack(len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def loads_binary(data):
+    """
+    Decodes employee records from the binary snapshot format.
+
+    Args:
+        data (bytes): The encoded snapshot.
+
+    Returns:
+        list: The employee records, in roster order.
+
+    Raises:
+        ValueError: If the data is not a binary snapshot.
+    """
+    view = memoryview(data)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not an employee binary snapshot")
+    offset = len(MAGIC)
+    (length,) = SCHEMA_HEADER.unpack_from(view, offset)
+    offset += SCHEMA_HEADER.size
+    schema = json.loads(bytes(view[offset : offset + length]))
+    offset += length
+
+    count = schema["count"]
+    if not schema["fields"]:
+        return [{} for _ in range(count)]
+    names = []
+    columns = []
+    for field in schema["fields"]:
+        (length,) = SECTION_HEADER.unpack_from(view, offset)
+        offset += SECTION_HEADER.size
+        payload = bytes(view[offset : offset + length])
+        offset += length
+        names.append(field["name"])
+        columns.append(_decode_column(field, payload, count))
+
+    records = [dict(zip(names, row)) for row in zip(*columns)]
+    for field in schema["fields"]:
+        for position in field["absent"]:
+            del records[position][field["name"]]
+    return records
+
+
+def is_binary_snapshot(path):
+    """this function will check whether a file starts with the binary snapshot magic"""
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+def read_records(path):
+    """
+    Reads employee records from a snapshot in either the JSON or the binary format.
+
+    Args:
+        path (str): The snapshot file, detected as binary from its first bytes.
+
+    Returns:
+        list: The employee records.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    with _gc_paused():
+        if data.startswith(MAGIC):
+            return loads_binary(data)
+        return json.loads(data)
+
+
+def convert(source_path, target_path, binary):
+    """
+    Converts a snapshot between the JSON and the binary format.
+
+    Args:
+        source_path (str): The snapshot to read, in either format.
+        target_path (str): The snapshot to write.
+        binary (bool): Write the binary format if True, indented JSON otherwise.
+
+    Returns:
+        int: The number of employees converted.
+    """
+    from helpers.journal import write_snapshot
+
+    records = read_records(source_path)
+    write_snapshot(target_path, records, binary=binary)
+    return len(records)
+
+
+if __name__ == "__main__":
+    import helpers.features as f
+
+    parser = argparse.ArgumentParser(description="Convert employee snapshots")
+    parser.add_argument("direction", choices=("to-binary", "to-json"))
+    parser.add_argument("source", nargs="?")
+    parser.add_argument("target", nargs="?")
+    args = parser.parse_args()
+    to_binary = args.direction == "to-binary"
+    source = args.source or (f.JSON_PATH if to_binary else f.BINARY_PATH)
+    target = args.target or (f.BINARY_PATH if to_binary else f.JSON_PATH)
+    count = convert(source, target, to_binary)
+    print(f"Converted {count} employees to {target}")
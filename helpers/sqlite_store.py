@@ -0,0 +1,743 @@
+"""
+SQLite storage backend for running several API workers against one database
+
+Usage (migration):
+    python -m helpers.sqlite_store [json_path] [sqlite_path]
+
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from helpers.aggregates import SALARY_RANGES
+from helpers.changes import CHANGE_LOG_SIZE, change_event
+from helpers.indexes import (
+    FUZZY_MAX_CANDIDATES,
+    MAX_CHAR,
+    normalize_name,
+    normalize_skill,
+    rank_by_similarity,
+    trigrams,
+)
+from helpers.metrics import STORAGE_LATENCY, STORAGE_PAYLOAD
+from helpers.query import Between, Equals, HasAnySkill, HasSkills
+from helpers.journal import CREATE, DELETE, UPDATE
+from helpers.storage import ChangesExpiredError, StorageBackend, normalize_record
+from helpers.store import EmployeeStore
+
+# Employee fields stored in their own indexed column, next to the full JSON record
+HASH_COLUMNS = ("emp_department", "emp_designation", "emp_status", "emp_gender")
+SORTED_COLUMNS = ("emp_salary",)
+RANGE_COLUMNS = ("emp_salary", "created_date")
+
+# Columns used to page through the employees in each ORDER_KEYS ordering
+ORDER_COLUMNS = {
+    "emp_id": ("emp_id",),
+    "created_date": ("created_date", "created_time", "emp_id"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    emp_id TEXT NOT NULL UNIQUE,
+    emp_department TEXT,
+    emp_designation TEXT,
+    emp_status TEXT,
+    emp_gender TEXT,
+    emp_salary REAL,
+    created_date TEXT NOT NULL DEFAULT '',
+    created_time TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    name_key TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_employees_department ON employees (emp_department);
+CREATE INDEX IF NOT EXISTS idx_employees_designation ON employees (emp_designation);
+CREATE INDEX IF NOT EXISTS idx_employees_status ON employees (emp_status);
+CREATE INDEX IF NOT EXISTS idx_employees_gender ON employees (emp_gender);
+CREATE INDEX IF NOT EXISTS idx_employees_salary ON employees (emp_salary, emp_id);
+CREATE INDEX IF NOT EXISTS idx_employees_created
+    ON employees (created_date, created_time, emp_id);
+CREATE TABLE IF NOT EXISTS employee_skills (
+    skill TEXT NOT NULL,
+    emp_id TEXT NOT NULL,
+    PRIMARY KEY (skill, emp_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_employee_skills_emp_id ON employee_skills (emp_id);
+CREATE TABLE IF NOT EXISTS employee_name_trigrams (
+    trigram TEXT NOT NULL,
+    emp_id TEXT NOT NULL,
+    PRIMARY KEY (trigram, emp_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_employee_name_trigrams_emp_id
+    ON employee_name_trigrams (emp_id);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    emp_id TEXT NOT NULL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Created once name_key is known to exist, since older databases lack the column
+NAME_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_employees_name_key ON employees (name_key, emp_id);
+"""
+
+
+def _columns(record):
+    """this function will return the indexed column values of a record"""
+    salary = record.get("emp_salary")
+    return (
+        record["emp_id"],
+        *(record.get(column) for column in HASH_COLUMNS),
+        salary if isinstance(salary, (int, float)) else None,
+        record.get("created_date") or "",
+        record.get("created_time") or "",
+        json.dumps(record),
+        normalize_name(record.get("emp_name")),
+    )
+
+
+def _condition(predicate):
+    """this function will translate a search predicate into an SQL condition"""
+    if isinstance(predicate, Equals) and predicate.field in HASH_COLUMNS:
+        return f"{predicate.field} = ?", [predicate.value]
+    if isinstance(predicate, HasSkills):
+        return (
+            "emp_id IN (SELECT emp_id FROM employee_skills WHERE skill IN "
+            f"({', '.join('?' * len(predicate.skills))}) "
+            "GROUP BY emp_id HAVING COUNT(*) = ?)",
+            [*predicate.skills, len(predicate.skills)],
+        )
+    if isinstance(predicate, HasAnySkill):
+        return (
+            "emp_id IN (SELECT emp_id FROM employee_skills WHERE skill IN "
+            f"({', '.join('?' * len(predicate.skills))}))",
+            list(predicate.skills),
+        )
+    if isinstance(predicate, Between) and predicate.field in RANGE_COLUMNS:
+        conditions, parameters = [f"{predicate.field} IS NOT NULL"], []
+        if predicate.low is not None:
+            conditions.append(f"{predicate.field} >= ?")
+            parameters.append(predicate.low)
+        if predicate.high is not None:
+            conditions.append(f"{predicate.field} <= ?")
+            parameters.append(predicate.high)
+        return " AND ".join(conditions), parameters
+    raise KeyError(predicate.field)
+
+
+class SqliteStore(StorageBackend):
+    """
+    Employee store kept in an SQLite database in WAL mode.
+
+    Each record is stored as JSON next to indexed columns for department,
+    designation, status, gender, salary and creation time, and its skills
+    go to a join table, so every filter is answered by SQL on an index.
+    Every change is also written to the changes table in the same
+    transaction, which keeps the latest CHANGE_LOG_SIZE of them.
+    WAL mode lets several worker processes read while one writes. Each
+    thread uses its own connection.
+    """
+
+    def __init__(self, sqlite_path, max_changes=CHANGE_LOG_SIZE):
+        self.sqlite_path = sqlite_path
+        self.max_changes = max_changes
+        self._local = threading.local()
+
+    def _connection(self):
+        """this function will return the connection of the calling thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.sqlite_path, isolation_level=None, timeout=30
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _query(self, sql, parameters=()):
+        """this function will run a query and decode the JSON records it selects"""
+        rows = self._connection().execute(sql, parameters).fetchall()
+        with STORAGE_LATENCY.time(backend="sqlite", operation="parse"):
+            records = [json.loads(data) for (data,) in rows]
+        STORAGE_PAYLOAD.observe(
+            sum(len(data) for (data,) in rows), backend="sqlite", operation="parse"
+        )
+        return records
+
+    def _write(self, apply, items):
+        """this function will apply a mutation to every item in one transaction"""
+        connection = self._connection()
+        with STORAGE_LATENCY.time(backend="sqlite", operation="write"):
+            return self._transaction(connection, apply, items)
+
+    def _transaction(self, connection, apply, items):
+        """this function will run the mutations of _write inside BEGIN IMMEDIATE"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            results = [apply(connection, *item) for item in items]
+            if any(result is not None for result in results):
+                connection.execute(
+                    "UPDATE meta SET value = value + 1 WHERE key = 'version'"
+                )
+                connection.execute(
+                    "DELETE FROM changes WHERE seq <= "
+                    "(SELECT MAX(seq) FROM changes) - ?",
+                    (self.max_changes,),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return results
+
+    def _set_skills(self, connection, record):
+        """this function will replace the rows of a record in the skills join table"""
+        connection.execute(
+            "DELETE FROM employee_skills WHERE emp_id = ?", (record["emp_id"],)
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO employee_skills (skill, emp_id) VALUES (?, ?)",
+            [
+                (normalize_skill(skill), record["emp_id"])
+                for skill in record.get("emp_skills") or ()
+            ],
+        )
+
+    def _set_name_trigrams(self, connection, record):
+        """this function will replace the rows of a record in the name trigrams table"""
+        connection.execute(
+            "DELETE FROM employee_name_trigrams WHERE emp_id = ?", (record["emp_id"],)
+        )
+        connection.executemany(
+            "INSERT INTO employee_name_trigrams (trigram, emp_id) VALUES (?, ?)",
+            [
+                (trigram, record["emp_id"])
+                for trigram in trigrams(normalize_name(record.get("emp_name")))
+            ],
+        )
+
+    def _upsert(self, connection, record):
+        """this function will insert a record, or replace it keeping its position"""
+        connection.execute(
+            """
+            INSERT INTO employees (
+                emp_id, emp_department, emp_designation, emp_status, emp_gender,
+                emp_salary, created_date, created_time, data, name_key
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (emp_id) DO UPDATE SET
+                emp_department = excluded.emp_department,
+                emp_designation = excluded.emp_designation,
+                emp_status = excluded.emp_status,
+                emp_gender = excluded.emp_gender,
+                emp_salary = excluded.emp_salary,
+                created_date = excluded.created_date,
+                created_time = excluded.created_time,
+                data = excluded.data,
+                name_key = excluded.name_key
+            """,
+            _columns(record),
+        )
+        self._set_skills(connection, record)
+        self._set_name_trigrams(connection, record)
+
+    def _get(self, connection, id):
+        """this function will read one record inside the current transaction"""
+        row = connection.execute(
+            "SELECT data FROM employees WHERE emp_id = ?", (id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _log_change(self, connection, op, id, record):
+        """this function will append a change to the changes table"""
+        connection.execute(
+            "INSERT INTO changes (op, emp_id, data) VALUES (?, ?, ?)",
+            (op, id, json.dumps(record) if record is not None else None),
+        )
+
+    def _apply_create(self, connection, new_employee):
+        """this function will store a new record and return it"""
+        record = normalize_record(new_employee)
+        self._upsert(connection, record)
+        self._log_change(connection, CREATE, record["emp_id"], record)
+        return record
+
+    def _apply_update(self, connection, id, updated_employee):
+        """this function will update a stored record and return it, or None"""
+        employee = self._get(connection, id)
+        if employee is None:
+            return None
+        # Exclude updating emp_id field
+        updated_data = {
+            key: value
+            for key, value in normalize_record(updated_employee).items()
+            if key != "emp_id"
+        }
+        employee = {**employee, **updated_data}
+        self._upsert(connection, employee)
+        self._log_change(connection, UPDATE, id, employee)
+        return employee
+
+    def _apply_delete(self, connection, id):
+        """this function will delete a stored record and return it, or None"""
+        employee = self._get(connection, id)
+        if employee is None:
+            return None
+        connection.execute("DELETE FROM employees WHERE emp_id = ?", (id,))
+        connection.execute("DELETE FROM employee_skills WHERE emp_id = ?", (id,))
+        connection.execute("DELETE FROM employee_name_trigrams WHERE emp_id = ?", (id,))
+        self._log_change(connection, DELETE, id, None)
+        return employee
+
+    def _add_name_key(self, connection):
+        """this function will add and fill the name search columns of an older database"""
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(employees)")}
+        if "name_key" in columns:
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "ALTER TABLE employees ADD COLUMN name_key TEXT NOT NULL DEFAULT ''"
+            )
+            for (data,) in connection.execute("SELECT data FROM employees").fetchall():
+                record = json.loads(data)
+                connection.execute(
+                    "UPDATE employees SET name_key = ? WHERE emp_id = ?",
+                    (normalize_name(record.get("emp_name")), record["emp_id"]),
+                )
+                self._set_name_trigrams(connection, record)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def load(self):
+        """this function will create the schema if the database is new, or upgrade it"""
+        with STORAGE_LATENCY.time(backend="sqlite", operation="load"):
+            connection = self._connection()
+            connection.executescript(SCHEMA)
+            # Seeded from the clock, so a recreated database never hands out
+            # the versions, and with them the ETags, of an earlier one
+            connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('version', ?)",
+                (time.time_ns() // 1000,),
+            )
+            self._add_name_key(connection)
+            connection.executescript(NAME_SCHEMA)
+
+    def close(self):
+        """this function will close the connection of the calling thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def version(self):
+        """this function will return the data version shared by every worker"""
+        row = (
+            self._connection()
+            .execute("SELECT value FROM meta WHERE key = 'version'")
+            .fetchone()
+        )
+        return row[0]
+
+    def all(self):
+        """this function will return all the employee records"""
+        return self._query("SELECT data FROM employees ORDER BY seq")
+
+    def get(self, id: str):
+        """this function will return the employee record with the given id"""
+        return self._get(self._connection(), id)
+
+    def page(self, order_by, after, limit, predicates=()):
+        """this function will return up to limit records satisfying the predicates in keyset order after a sort key"""
+        columns = ", ".join(ORDER_COLUMNS[order_by])
+        conditions, parameters = ["1"], []
+        if after is not None:
+            conditions.append(f"({columns}) > ({', '.join('?' * len(after))})")
+            parameters += after
+        for predicate in predicates:
+            condition, condition_parameters = _condition(predicate)
+            conditions.append(condition)
+            parameters += condition_parameters
+        return self._query(
+            f"SELECT data FROM employees WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {columns} LIMIT ?",
+            (*parameters, limit),
+        )
+
+    def find_by(self, field, value):
+        """this function will return the records whose indexed field matches value"""
+        if field == "emp_skills":
+            return self.find_by_skills(any_skills=[value])
+        if field not in HASH_COLUMNS:
+            raise KeyError(field)
+        return self._query(
+            f"SELECT data FROM employees WHERE {field} = ? ORDER BY seq", (value,)
+        )
+
+    def find_by_skills(self, all_skills=(), any_skills=()):
+        """this function will return the records having all and/or any of the skills"""
+        conditions, parameters = [], []
+        all_skills = sorted({normalize_skill(skill) for skill in all_skills})
+        any_skills = sorted({normalize_skill(skill) for skill in any_skills})
+        if all_skills:
+            conditions.append(
+                "emp_id IN (SELECT emp_id FROM employee_skills WHERE skill IN "
+                f"({', '.join('?' * len(all_skills))}) "
+                "GROUP BY emp_id HAVING COUNT(*) = ?)"
+            )
+            parameters += [*all_skills, len(all_skills)]
+        if any_skills:
+            conditions.append(
+                "emp_id IN (SELECT emp_id FROM employee_skills WHERE skill IN "
+                f"({', '.join('?' * len(any_skills))}))"
+            )
+            parameters += any_skills
+        if not conditions:
+            return []
+        return self._query(
+            f"SELECT data FROM employees WHERE {' AND '.join(conditions)} ORDER BY seq",
+            parameters,
+        )
+
+    def find_by_name(self, text, mode, limit, threshold):
+        """
+        Returns the employee records whose name matches a text.
+
+        Prefix searches use the index on the normalized name, substring
+        searches the name trigrams table and fuzzy searches score up to
+        FUZZY_MAX_CANDIDATES of the names sharing the most trigrams with the
+        text, among those sharing enough to reach the threshold.
+
+        Args:
+            text (str): The name, or part of it, searched for; case is ignored.
+            mode (str): "prefix", "substring" or "fuzzy".
+            limit (int): The maximum number of records to return.
+            threshold (float): The lowest similarity of a fuzzy match.
+
+        Returns:
+            list: The matching records, in name order or most similar first.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        text = normalize_name(text)
+        if mode == "prefix":
+            return self._query(
+                "SELECT data FROM employees WHERE name_key >= ? AND name_key < ? "
+                "ORDER BY name_key, emp_id LIMIT ?",
+                (text, text + MAX_CHAR, limit),
+            )
+        if mode == "substring":
+            query = sorted(trigrams(text, padded=False))
+            condition, parameters = "instr(name_key, ?) > 0", [text]
+            if query:
+                condition += (
+                    " AND emp_id IN (SELECT emp_id FROM employee_name_trigrams "
+                    f"WHERE trigram IN ({', '.join('?' * len(query))}) "
+                    "GROUP BY emp_id HAVING COUNT(*) = ?)"
+                )
+                parameters += [*query, len(query)]
+            return self._query(
+                f"SELECT data FROM employees WHERE {condition} "
+                "ORDER BY name_key, emp_id LIMIT ?",
+                (*parameters, limit),
+            )
+        if mode == "fuzzy":
+            query = sorted(trigrams(text))
+            needed = max(math.ceil(threshold * len(query)), 1)
+            candidates = self._connection().execute(
+                "SELECT e.name_key, e.emp_id FROM employee_name_trigrams t "
+                "JOIN employees e ON e.emp_id = t.emp_id "
+                f"WHERE t.trigram IN ({', '.join('?' * len(query))}) "
+                "GROUP BY t.emp_id HAVING COUNT(*) >= ? "
+                "ORDER BY COUNT(*) DESC LIMIT ?",
+                (*query, needed, FUZZY_MAX_CANDIDATES),
+            )
+            ids = rank_by_similarity(text, candidates, limit, threshold)
+            connection = self._connection()
+            return [self._get(connection, id) for id in ids]
+        raise ValueError(f"Unknown name search mode: {mode}")
+
+    def find_in_range(self, field, low, high):
+        """this function will return the records with low <= field <= high, ascending"""
+        if field not in SORTED_COLUMNS:
+            raise KeyError(field)
+        return self._query(
+            f"SELECT data FROM employees WHERE {field} BETWEEN ? AND ? "
+            f"ORDER BY {field}, emp_id",
+            (low, high),
+        )
+
+    def search(self, predicates):
+        """
+        Returns the records satisfying every predicate, with the plan used to find them.
+
+        The predicates are pushed down as one SQL query, so SQLite's own
+        planner picks the index; the plan reports its EXPLAIN QUERY PLAN.
+        SQLite does not expose the rows it examined, so that count is None.
+
+        Args:
+            predicates (list): Predicates built by helpers.query.search_predicates.
+
+        Returns:
+            tuple: The matching records and a dict describing the query plan.
+        """
+        conditions, parameters = ["1"], []
+        for predicate in predicates:
+            condition, condition_parameters = _condition(predicate)
+            conditions.append(condition)
+            parameters += condition_parameters
+        sql = (
+            f"SELECT data FROM employees WHERE {' AND '.join(conditions)} ORDER BY seq"
+        )
+        steps = [
+            {"operation": "sqlite", "detail": detail}
+            for *_, detail in self._connection().execute(
+                f"EXPLAIN QUERY PLAN {sql}", parameters
+            )
+        ]
+        rows = self._query(sql, parameters)
+        return rows, {
+            "steps": steps,
+            "sql": sql,
+            "rows_examined": None,
+            "rows_returned": len(rows),
+        }
+
+    def changes(self, since, limit):
+        """
+        Returns the changes after a sequence number from the changes table.
+
+        The head and the changes are read in one transaction, so they agree
+        even while another worker writes.
+
+        Args:
+            since (int): The last sequence number the caller has applied, or None.
+            limit (int): The maximum number of changes to return.
+
+        Returns:
+            tuple: The changes in sequence order and the latest sequence number.
+
+        Raises:
+            ChangesExpiredError: If changes after since are no longer kept.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN")
+        try:
+            row = connection.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'changes'"
+            ).fetchone()
+            head = row[0] if row else 0
+            if since is None:
+                return [], head
+            (oldest,) = connection.execute("SELECT MIN(seq) FROM changes").fetchone()
+            floor = oldest - 1 if oldest is not None else head
+            if not floor <= since <= head:
+                raise ChangesExpiredError(since)
+            rows = connection.execute(
+                "SELECT seq, op, emp_id, data FROM changes "
+                "WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        finally:
+            connection.execute("COMMIT")
+        return [
+            change_event(seq, op, id, json.loads(data) if data is not None else None)
+            for seq, op, id, data in rows
+        ], head
+
+    def top(self, field, n):
+        """this function will return the n records with the highest value of field"""
+        if field not in SORTED_COLUMNS:
+            raise KeyError(field)
+        return self._query(
+            f"SELECT data FROM employees WHERE {field} IS NOT NULL "
+            f"ORDER BY {field} DESC, emp_id DESC LIMIT ?",
+            (n,),
+        )
+
+    def bottom(self, field, n):
+        """this function will return the n records with the lowest value of field"""
+        if field not in SORTED_COLUMNS:
+            raise KeyError(field)
+        return self._query(
+            f"SELECT data FROM employees WHERE {field} IS NOT NULL "
+            f"ORDER BY {field}, emp_id LIMIT ?",
+            (n,),
+        )
+
+    def percentile(self, field, percent):
+        """this function will return the nearest-rank percentile of field, or None"""
+        if field not in SORTED_COLUMNS:
+            raise KeyError(field)
+        connection = self._connection()
+        (count,) = connection.execute(
+            f"SELECT COUNT(*) FROM employees WHERE {field} IS NOT NULL"
+        ).fetchone()
+        if not count:
+            return None
+        rank = max(math.ceil(percent / 100 * count), 1)
+        row = connection.execute(
+            f"SELECT {field} FROM employees WHERE {field} IS NOT NULL "
+            f"ORDER BY {field} LIMIT 1 OFFSET ?",
+            (rank - 1,),
+        ).fetchone()
+        return row[0]
+
+    def value_counts(self, field):
+        """this function will return the number of records for each value of field"""
+        if field == "emp_skills":
+            sql = "SELECT skill, COUNT(*) FROM employee_skills GROUP BY skill"
+        elif field in HASH_COLUMNS:
+            sql = (
+                f"SELECT {field}, COUNT(*) FROM employees "
+                f"GROUP BY {field} ORDER BY MIN(seq)"
+            )
+        else:
+            raise KeyError(field)
+        return dict(self._connection().execute(sql).fetchall())
+
+    def department_salary_stats(self):
+        """this function will return the count and salary statistics of every department"""
+        rows = self._connection().execute("""
+            SELECT emp_department, COUNT(*), SUM(emp_salary), AVG(emp_salary),
+                MIN(emp_salary), MAX(emp_salary)
+            FROM employees WHERE emp_salary IS NOT NULL
+            GROUP BY emp_department ORDER BY MIN(seq)
+            """)
+        return {
+            department: {
+                "count": count,
+                "total": total,
+                "average": average,
+                "min": minimum,
+                "max": maximum,
+            }
+            for department, count, total, average, minimum, maximum in rows
+        }
+
+    def salary_bucket_counts(self):
+        """this function will return the number of employees in each non-empty salary range"""
+        counts = {}
+        for low, high in SALARY_RANGES:
+            (count,) = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*) FROM employees WHERE emp_salary >= ? AND emp_salary < ?",
+                    (low, high if math.isfinite(high) else 1e308),
+                )
+                .fetchone()
+            )
+            if count:
+                counts[f"{low}-{high}"] = count
+        return counts
+
+    def add_many(self, new_employees):
+        """this function will add several employee records in one transaction"""
+        return self._write(
+            self._apply_create, [(employee,) for employee in new_employees]
+        )
+
+    def update_many(self, updates):
+        """this function will update several employee records in one transaction"""
+        return self._write(self._apply_update, updates)
+
+    def delete_many(self, ids):
+        """this function will delete several employee records in one transaction"""
+        return self._write(self._apply_delete, [(id,) for id in ids])
+
+    def import_many(self, employees):
+        """
+        Stores employees copied from another store without logging them as changes.
+
+        The changes table is emptied and its sequence restarts at the new
+        data version, like the change log of the JSON store on load, so a
+        client holding a sequence number from before the import reloads
+        instead of replaying the whole roster.
+
+        Args:
+            employees (list): The employee records to store.
+        """
+        connection = self._connection()
+        with STORAGE_LATENCY.time(backend="sqlite", operation="write"):
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for employee in employees:
+                    self._upsert(connection, normalize_record(employee))
+                connection.execute(
+                    "UPDATE meta SET value = value + 1 WHERE key = 'version'"
+                )
+                connection.execute("DELETE FROM changes")
+                (version,) = connection.execute(
+                    "SELECT value FROM meta WHERE key = 'version'"
+                ).fetchone()
+                restarted = connection.execute(
+                    "UPDATE sqlite_sequence SET seq = MAX(seq + 1, ?) "
+                    "WHERE name = 'changes'",
+                    (version,),
+                )
+                if restarted.rowcount == 0:
+                    connection.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES ('changes', ?)",
+                        (version,),
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+
+def migrate_from_json(json_path, sqlite_path, journal_path=None):
+    """
+    Copies every employee from the JSON store into an SQLite database.
+
+    The copied rows are not logged as changes; the change log of the
+    database starts over at the migrated version.
+
+    Args:
+        json_path (str): The JSON data file to read.
+        sqlite_path (str): The SQLite database to create or fill.
+        journal_path (str): The journal to replay on top of the JSON file, if any.
+
+    Returns:
+        int: The number of employees migrated.
+    """
+    source = EmployeeStore(json_path, journal_path=journal_path)
+    source.load()
+    employees = source.all()
+    source.close()
+
+    target = SqliteStore(sqlite_path)
+    target.load()
+    target.import_many(employees)
+    target.close()
+    return len(employees)
+
+
+if __name__ == "__main__":
+    import helpers.features as f
+
+    parser = argparse.ArgumentParser(description="Migrate emp.json to SQLite")
+    parser.add_argument("json_path", nargs="?", default=f.JSON_PATH)
+    parser.add_argument("sqlite_path", nargs="?", default=f.SQLITE_PATH)
+    parser.add_argument(
+        "--journal",
+        default=f.JOURNAL_PATH if os.path.exists(f.JOURNAL_PATH) else None,
+        help="journal to replay on top of the JSON file",
+    )
+    args = parser.parse_args()
+    count = migrate_from_json(args.json_path, args.sqlite_path, args.journal)
+    print(f"Migrated {count} employees to {args.sqlite_path}")
@@ -0,0 +1,238 @@
+"""
+Storage backend interface shared by the JSON and SQLite employee stores
+
+"""
+
+from abc import ABC, abstractmethod
+from enum import Enum
+
+from models.employee import EmployeeUpdate
+
+
+class ReadOnlyStoreError(Exception):
+    """Raised when a write reaches a backend that only serves reads."""
+
+
+class ChangesExpiredError(Exception):
+    """Raised when the changes after a sequence number are no longer kept."""
+
+    def __init__(self, since):
+        super().__init__(
+            f"Changes after {since} are no longer available, reload the employees"
+        )
+        self.since = since
+
+
+def normalize_record(record):
+    """
+    Returns a plain copy of an employee record that is safe to keep in the store.
+
+    Enum members (gender, status) are replaced by their values and the skills
+    list is copied, so the stored record looks exactly like one read back from
+    the JSON file and is not shared with the caller.
+
+    Args:
+        record (dict): The employee record to normalize.
+
+    Returns:
+        dict: The normalized copy of the record.
+    """
+    normalized = {}
+    for key, value in record.items():
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, list):
+            value = list(value)
+        normalized[key] = value
+    return normalized
+
+
+def validate_record(record):
+    """
+    Rebuilds an employee record read from disk through the Employee model.
+
+    Records loaded from the data file, a binary snapshot, the journal or a
+    record file are served as they are, without the per-response validation
+    of the API, so each one is validated once, as it is loaded.
+
+    Args:
+        record (dict): The employee record read from disk.
+
+    Returns:
+        dict: The validated record, shaped like one stored by the API.
+
+    Raises:
+        ValueError: If the record is not a valid employee.
+    """
+    try:
+        return EmployeeUpdate.model_validate(record).model_dump(mode="json")
+    except ValueError as e:
+        id = record.get("emp_id") if isinstance(record, dict) else None
+        raise ValueError(f"Invalid employee record {id or '(no emp_id)'}: {e}") from e
+
+
+def validate_records(records):
+    """this function will validate loaded records and return them keyed by emp_id"""
+    validated = {}
+    for record in records:
+        record = validate_record(record)
+        validated[record["emp_id"]] = record
+    return validated
+
+
+class StorageBackend(ABC):
+    """
+    The operations helpers/features.py needs from an employee store.
+
+    Records are plain dicts shaped like the Employee model. Indexed lookups
+    take the Employee field name: emp_department, emp_designation, emp_status
+    and emp_gender for equality, emp_skills for skills and emp_salary for
+    ranges and order statistics. Orderings for pagination are the keys of
+    helpers.pagination.ORDER_KEYS.
+
+    Backends whose reads return the very dict they keep for a record, until
+    the record changes, set stable_records, so caches keyed on the record
+    object can be used with them.
+    """
+
+    stable_records = False
+
+    @abstractmethod
+    def load(self):
+        """this function will open the backend and make its data available"""
+
+    def close(self):
+        """this function will release the resources held by the backend"""
+
+    def compact(self):
+        """this function will fold pending changes into the main data file, if any"""
+
+    @abstractmethod
+    def version(self):
+        """this function will return a data version that advances on every change"""
+
+    @abstractmethod
+    def all(self):
+        """this function will return all the employee records in insertion order"""
+
+    @abstractmethod
+    def get(self, id: str):
+        """this function will return the employee record with the given id, or None"""
+
+    @abstractmethod
+    def page(self, order_by, after, limit, predicates=()):
+        """this function will return up to limit records satisfying the predicates following the sort key after"""
+
+    @abstractmethod
+    def find_by(self, field, value):
+        """this function will return the records whose indexed field matches value"""
+
+    @abstractmethod
+    def find_by_skills(self, all_skills=(), any_skills=()):
+        """this function will return the records having all and/or any of the skills"""
+
+    @abstractmethod
+    def find_by_name(self, text, mode, limit, threshold):
+        """this function will return up to limit records whose name matches text"""
+
+    @abstractmethod
+    def find_in_range(self, field, low, high):
+        """this function will return the records with low <= field <= high, ascending"""
+
+    @abstractmethod
+    def search(self, predicates):
+        """
+        Returns the records satisfying every predicate, with the plan used to find them.
+
+        Args:
+            predicates (list): Predicates built by helpers.query.search_predicates.
+
+        Returns:
+            tuple: The matching records and a dict describing the query plan.
+        """
+
+    @abstractmethod
+    def changes(self, since, limit):
+        """
+        Returns the changes made after a sequence number, oldest first.
+
+        Each change is a dict with its seq, the op ("create", "update" or
+        "delete"), the emp_id and the employee record after the change, which
+        is None for a delete.
+
+        Args:
+            since (int): The last sequence number the caller has applied, or
+                None to only learn the current head.
+            limit (int): The maximum number of changes to return.
+
+        Returns:
+            tuple: The changes and the sequence number of the latest change.
+
+        Raises:
+            ChangesExpiredError: If changes after since are no longer kept.
+        """
+
+    @abstractmethod
+    def top(self, field, n):
+        """this function will return the n records with the highest value of field"""
+
+    @abstractmethod
+    def bottom(self, field, n):
+        """this function will return the n records with the lowest value of field"""
+
+    @abstractmethod
+    def percentile(self, field, percent):
+        """this function will return the nearest-rank percentile of field, or None"""
+
+    @abstractmethod
+    def value_counts(self, field):
+        """this function will return the number of records for each value of field"""
+
+    @abstractmethod
+    def department_salary_stats(self):
+        """this function will return the count and salary statistics of every department"""
+
+    @abstractmethod
+    def salary_bucket_counts(self):
+        """this function will return the number of employees in each salary range"""
+
+    @abstractmethod
+    def add_many(self, new_employees):
+        """this function will add several records and return them as stored"""
+
+    @abstractmethod
+    def update_many(self, updates):
+        """this function will apply (id, data) updates and return the updated records or None"""
+
+    @abstractmethod
+    def delete_many(self, ids):
+        """this function will delete several records and return them or None"""
+
+    def add(self, new_employee):
+        """this function will add a new employee record"""
+        return self.add_many([new_employee])[0]
+
+    def update(self, id: str, updated_employee):
+        """
+        Updates the employee record with the given id.
+
+        Args:
+            id (str): The id of the employee to update.
+            updated_employee (dict): The new values; emp_id is never changed.
+
+        Returns:
+            dict: The updated record, or None if there is no such employee.
+        """
+        return self.update_many([(id, updated_employee)])[0]
+
+    def delete(self, id: str):
+        """
+        Deletes the employee record with the given id.
+
+        Args:
+            id (str): The id of the employee to delete.
+
+        Returns:
+            dict: The deleted record, or None if there is no such employee.
+        """
+        return self.delete_many([id])[0]
@@ -0,0 +1,616 @@
+"""
+JSON storage backend: an in-memory employee store backed by the JSON data file
+
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from helpers.journal import (
+    CREATE,
+    DELETE,
+    UPDATE,
+    Journal,
+    dump_snapshot,
+    write_snapshot,
+)
+from helpers.aggregates import GroupSalaryStats, SalaryBuckets
+from helpers.changes import ChangeLog
+from helpers.indexes import HashIndex, InvertedIndex, SortedIndex, TrigramIndex
+from helpers.locks import RWLock
+from helpers.metrics import STORAGE_LATENCY, STORAGE_PAYLOAD
+from helpers.pagination import ORDER_KEYS
+from helpers.query import execute, matching_ids
+from helpers.snapshot import convert, read_records
+from helpers.storage import StorageBackend, normalize_record, validate_records
+
+# Failures of the background compactor are logged through the API's logger
+logger = logging.getLogger("emp-data.store")
+
+# Journal thresholds that trigger folding the journal into a fresh snapshot
+COMPACT_MAX_BYTES = 1024 * 1024
+COMPACT_MAX_ENTRIES = 1000
+
+# Categorical Employee fields that get a secondary hash index
+HASH_INDEXED_FIELDS = ("emp_department", "emp_designation", "emp_status", "emp_gender")
+
+
+class EmployeeStore(StorageBackend):
+    """
+    Process-wide store that keeps the employee roster resident in memory.
+
+    The data file is parsed once and every read is served from memory. Writes
+    update memory and then the file. If the file is changed outside of the
+    store (detected through its mtime and size) it is reloaded on next access.
+
+    When a journal path is given, writes are appended to the journal instead
+    of rewriting the whole file. The journal is replayed on top of the
+    snapshot on load and folded into a fresh snapshot by a background
+    compactor once it grows past the configured thresholds.
+
+    When a binary path is given, snapshots are kept in the binary format of
+    helpers/snapshot.py at that path, which loads several times faster than
+    JSON. The JSON data file is imported once if no binary snapshot exists
+    yet and is not written to afterwards.
+
+    Reads share a reader/writer lock and run in parallel, while writes,
+    reloads and compaction take it exclusively.
+
+    Records are kept in a dictionary keyed by emp_id, which acts as a hash
+    index that preserves insertion order, so lookups, updates and deletes by
+    id take constant time. Secondary indexes in `indexes` and the report
+    aggregates in `aggregates` are kept in step with every create, update
+    and delete, and every change is recorded in the `change_log` feed.
+    """
+
+    stable_records = True
+
+    def __init__(
+        self,
+        json_path,
+        journal_path=None,
+        compact_max_bytes=COMPACT_MAX_BYTES,
+        compact_max_entries=COMPACT_MAX_ENTRIES,
+        binary_path=None,
+        eager_name_index=False,
+    ):
+        self.json_path = json_path
+        self.binary_path = binary_path
+        # The snapshot file the store reads, watches and writes
+        self.data_path = binary_path or json_path
+        self.journal = Journal(journal_path) if journal_path else None
+        self.compact_max_bytes = compact_max_bytes
+        self.compact_max_entries = compact_max_entries
+        self._records = {}
+        self._signature = None
+        self._loaded = False
+        self._lock = RWLock()
+        self._compactor = None
+        self._version = 0
+        self.indexes = {field: HashIndex(field) for field in HASH_INDEXED_FIELDS}
+        self.indexes["emp_skills"] = InvertedIndex("emp_skills")
+        self.indexes["emp_salary"] = SortedIndex("emp_salary")
+        # The name index is built on the first name search unless eager
+        self.name_index = TrigramIndex("emp_name")
+        self._name_index_built = eager_name_index
+        self.orderings = {
+            order_by: SortedIndex(order_by, key=key)
+            for order_by, key in ORDER_KEYS.items()
+        }
+        self.aggregates = {
+            "department_salary": GroupSalaryStats("emp_department"),
+            "salary_buckets": SalaryBuckets(),
+        }
+        self.change_log = ChangeLog()
+
+    @property
+    def _binary(self):
+        """whether snapshots are written in the binary format"""
+        return self.binary_path is not None
+
+    @property
+    def _backend(self):
+        """the backend label of the storage metrics, after the snapshot format"""
+        return "binary" if self._binary else "json"
+
+    def _file_signature(self):
+        """this function will return the (mtime, size) pair of the data file"""
+        try:
+            stat = os.stat(self.data_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        """this function will read the data file into memory"""
+        with STORAGE_LATENCY.time(backend=self._backend, operation="load"):
+            self._read_data()
+
+    def _read_data(self):
+        """this function will parse the data file, replay the journal and rebuild the indexes"""
+        if (
+            self.binary_path is not None
+            and not os.path.exists(self.binary_path)
+            and os.path.exists(self.json_path)
+        ):
+            convert(self.json_path, self.binary_path, binary=True)
+        signature = self._file_signature()
+        if signature is not None and signature[1] > 0:
+            with STORAGE_LATENCY.time(backend=self._backend, operation="parse"):
+                records = read_records(self.data_path)
+            STORAGE_PAYLOAD.observe(
+                signature[1], backend=self._backend, operation="parse"
+            )
+        else:
+            records = []
+        if self.journal is not None:
+            records = validate_records(self.journal.replay(records).values())
+            if os.path.exists(self.journal.old_path):
+                # A previous compaction did not finish, fold it in right away
+                write_snapshot(self.data_path, list(records.values()), self._binary)
+                self.journal.discard_old()
+                signature = self._file_signature()
+            self.journal.open()
+        else:
+            records = validate_records(records)
+        self._records = records
+        self._rebuild_indexes()
+        # Changes made outside the store are unknown, so clients must reload
+        self.change_log.reset()
+        self._signature = signature
+        self._loaded = True
+        self._version = self._new_version(signature)
+
+    def _new_version(self, signature):
+        """
+        Returns the data version of freshly loaded data.
+
+        The version is seeded from the clock in microseconds, so it keeps
+        increasing across reloads and restarts and an ETag handed out by an
+        earlier process never matches data loaded by a later one.
+        """
+        return max(time.time_ns() // 1000, self._version + 1)
+
+    def _structures(self):
+        """this function will return every index and aggregate kept by the store"""
+        structures = [
+            *self.indexes.values(),
+            *self.orderings.values(),
+            *self.aggregates.values(),
+        ]
+        if self._name_index_built:
+            structures.append(self.name_index)
+        return structures
+
+    def _index(self, field):
+        """this function will return the secondary index of a field"""
+        return self.indexes[field]
+
+    def _ordering(self, order_by):
+        """this function will return the sorted index of an ordering"""
+        return self.orderings[order_by]
+
+    def _aggregate(self, name):
+        """this function will return a report aggregate"""
+        return self.aggregates[name]
+
+    def _search_indexes(self, predicates):
+        """this function will return the index of every predicate field, the creation date's being its ordering"""
+        return {
+            predicate.field: (
+                self._ordering(predicate.field)
+                if predicate.field == "created_date"
+                else self._index(predicate.field)
+            )
+            for predicate in predicates
+        }
+
+    def _build_name_index(self):
+        """this function will build the name index on the first name search"""
+        if self._name_index_built:
+            return
+        with self._lock.write():
+            if self._name_index_built:
+                return
+            self._refresh()
+            self.name_index.build(self._records.values())
+            self._name_index_built = True
+
+    def _rebuild_indexes(self):
+        """this function will rebuild every index and aggregate from the records"""
+        with STORAGE_LATENCY.time(backend=self._backend, operation="index_rebuild"):
+            for index in self._structures():
+                index.build(self._records.values())
+
+    def _is_stale(self):
+        """this function will check whether the data file changed on disk"""
+        return not self._loaded or self._file_signature() != self._signature
+
+    def _refresh(self):
+        """this function will reload the data if the file changed on disk"""
+        if self._is_stale():
+            self._load()
+
+    @contextmanager
+    def _reading(self):
+        """this function will hold the read lock over fresh data for the duration of the block"""
+        if self._is_stale():
+            with self._lock.write():
+                self._refresh()
+        with self._lock.read():
+            yield
+
+    def _persist(self, entries):
+        """this function will record (op, emp_id, data) changes in the journal or the data file"""
+        if not entries:
+            return
+        self._version += 1
+        if self.journal is None:
+            with STORAGE_LATENCY.time(backend=self._backend, operation="write"):
+                write_snapshot(
+                    self.data_path, list(self._records.values()), self._binary
+                )
+            self._signature = self._file_signature()
+            STORAGE_PAYLOAD.observe(
+                self._signature[1], backend=self._backend, operation="write"
+            )
+            return
+        with STORAGE_LATENCY.time(backend=self._backend, operation="write"):
+            written = self.journal.append_many(entries)
+        STORAGE_PAYLOAD.observe(written, backend=self._backend, operation="write")
+        if (
+            self.journal.size >= self.compact_max_bytes
+            or self.journal.entry_count >= self.compact_max_entries
+        ):
+            self._start_compaction()
+
+    def _start_compaction(self):
+        """this function will fold the journal into the snapshot in the background"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self.journal.rotate()
+        # Records are replaced rather than mutated, so a shallow copy is stable
+        snapshot = list(self._records.values())
+        self._compactor = threading.Thread(
+            target=self._compact, args=(snapshot,), name="emp-compactor", daemon=True
+        )
+        self._compactor.start()
+
+    def _compact(self, snapshot):
+        """
+        Writes the snapshot and drops the compacted journal segment.
+
+        A failure is logged and leaves the segment in place, so the journal
+        still holds every change; the next compaction folds it in.
+        """
+        tmp_path = f"{self.data_path}.compact"
+        try:
+            with STORAGE_LATENCY.time(backend=self._backend, operation="compact"):
+                dump_snapshot(tmp_path, snapshot, self._binary)
+            STORAGE_PAYLOAD.observe(
+                os.path.getsize(tmp_path), backend=self._backend, operation="compact"
+            )
+            with self._lock.write():
+                os.replace(tmp_path, self.data_path)
+                self._signature = self._file_signature()
+                self.journal.discard_old()
+        except Exception:
+            logger.exception("Compaction of %s failed", self.data_path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def compact(self):
+        """this function will synchronously fold the journal into the snapshot"""
+        if self.journal is None:
+            return
+        with self._lock.write():
+            self._refresh()
+            self._start_compaction()
+            compactor = self._compactor
+        compactor.join()
+
+    def close(self):
+        """this function will wait for compaction and close the journal"""
+        if self.journal is None:
+            return
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock.write():
+            self.journal.close()
+
+    def load(self):
+        """this function will (re)load the data file into memory"""
+        with self._lock.write():
+            self._load()
+
+    def version(self):
+        """
+        Returns the data version, which advances on every load and every change.
+
+        Returns:
+            int: The current data version.
+        """
+        with self._reading():
+            return self._version
+
+    def all(self):
+        """this function will return all the employee records"""
+        with self._reading():
+            return list(self._records.values())
+
+    def get(self, id: str):
+        """this function will return the employee record with the given id"""
+        with self._reading():
+            return self._records.get(id)
+
+    def page(self, order_by, after, limit, predicates=()):
+        """
+        Returns records in keyset order starting after a sort key.
+
+        With predicates, the matching ids are found from the indexes alone.
+        A match set small enough to sort for less than walking the ordering
+        is sorted by its keys; otherwise the ordering is walked from after,
+        keeping the matching ids, so a page never builds or sorts the whole
+        result.
+
+        Args:
+            order_by (str): One of the supported orderings.
+            after (tuple): The sort key to start after, or None for the first page.
+            limit (int): The maximum number of records to return.
+            predicates (list): Predicates every returned record must satisfy.
+
+        Returns:
+            list: Up to limit employee records.
+        """
+        with self._reading():
+            ordering = self._ordering(order_by)
+            if not predicates:
+                ids = ordering.after(after, limit)
+            else:
+                wanted = matching_ids(self._search_indexes(predicates), predicates)
+                if len(wanted) * len(wanted) <= limit * len(ordering):
+                    key = ORDER_KEYS[order_by]
+                    keys = (key(self._records[id]) for id in wanted)
+                    ids = [
+                        key[-1]
+                        for key in heapq.nsmallest(
+                            limit, (key for key in keys if after is None or key > after)
+                        )
+                    ]
+                else:
+                    ids = ordering.after_matching(after, limit, wanted)
+            return [self._records[id] for id in ids]
+
+    def find_by(self, field, value):
+        """
+        Returns the employee records whose indexed field equals the given value.
+
+        Args:
+            field (str): One of the indexed Employee fields.
+            value (str): The value to match.
+
+        Returns:
+            list: The matching employee records.
+        """
+        with self._reading():
+            return [self._records[id] for id in self._index(field).lookup(value)]
+
+    def find_by_skills(self, all_skills=(), any_skills=()):
+        """
+        Returns the employee records matching a multi-skill query.
+
+        Args:
+            all_skills (list): Skills every returned employee must have.
+            any_skills (list): Skills of which each returned employee must have at least one.
+
+        Returns:
+            list: The matching employee records.
+        """
+        with self._reading():
+            index = self._index("emp_skills")
+            if all_skills:
+                ids = index.all_of(all_skills)
+                if any_skills:
+                    wanted = set(index.any_of(any_skills))
+                    ids = [id for id in ids if id in wanted]
+            else:
+                ids = index.any_of(any_skills)
+            return [self._records[id] for id in ids]
+
+    def find_by_name(self, text, mode, limit, threshold):
+        """
+        Returns the employee records whose name matches a text, from the trigram index.
+
+        The index is built on the first call unless the store was created
+        with eager_name_index, so stores never searched by name skip its
+        build time and memory.
+
+        Args:
+            text (str): The name, or part of it, searched for; case is ignored.
+            mode (str): "prefix", "substring" or "fuzzy".
+            limit (int): The maximum number of records to return.
+            threshold (float): The lowest similarity of a fuzzy match.
+
+        Returns:
+            list: The matching records, in name order or most similar first.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        self._build_name_index()
+        with self._reading():
+            index = self.name_index
+            if mode == "prefix":
+                ids = index.prefix(text, limit)
+            elif mode == "substring":
+                ids = index.substring(text, limit)
+            elif mode == "fuzzy":
+                ids = index.fuzzy(text, limit, threshold)
+            else:
+                raise ValueError(f"Unknown name search mode: {mode}")
+            return [self._records[id] for id in ids]
+
+    def find_in_range(self, field, low, high):
+        """
+        Returns the employee records whose sorted field lies in [low, high].
+
+        Args:
+            field (str): A field with a sorted index.
+            low (float): The lowest value to include.
+            high (float): The highest value to include.
+
+        Returns:
+            list: The matching employee records in ascending order of the field.
+        """
+        with self._reading():
+            return [self._records[id] for id in self._index(field).range(low, high)]
+
+    def search(self, predicates):
+        """
+        Returns the records satisfying every predicate, with the plan used to find them.
+
+        The planner drives the search from the most selective index; the
+        creation date range is answered by the created_date ordering.
+
+        Args:
+            predicates (list): Predicates built by helpers.query.search_predicates.
+
+        Returns:
+            tuple: The matching records and a dict describing the query plan.
+        """
+        with self._reading():
+            return execute(self._records, self._search_indexes(predicates), predicates)
+
+    def changes(self, since, limit):
+        """this function will return the changes after a sequence number and the head"""
+        with self._reading():
+            return self.change_log.since(since, limit)
+
+    def top(self, field, n):
+        """this function will return the n records with the highest value of a sorted field"""
+        with self._reading():
+            return [self._records[id] for id in self._index(field).top(n)]
+
+    def bottom(self, field, n):
+        """this function will return the n records with the lowest value of a sorted field"""
+        with self._reading():
+            return [self._records[id] for id in self._index(field).bottom(n)]
+
+    def percentile(self, field, percent):
+        """this function will return the value of a sorted field at the given percentile"""
+        with self._reading():
+            return self._index(field).percentile(percent)
+
+    def value_counts(self, field):
+        """this function will return the number of records for each value of an indexed field"""
+        with self._reading():
+            return self._index(field).counts()
+
+    def department_salary_stats(self):
+        """this function will return the count and salary statistics of every department"""
+        with self._reading():
+            return self._aggregate("department_salary").stats()
+
+    def salary_bucket_counts(self):
+        """this function will return the number of employees in each salary range"""
+        with self._reading():
+            return self._aggregate("salary_buckets").counts()
+
+    def _apply_create(self, new_employee):
+        """this function will add a record in memory and return it with its journal entry"""
+        record = normalize_record(new_employee)
+        previous = self._records.get(record["emp_id"])
+        self._records[record["emp_id"]] = record
+        for index in self._structures():
+            if previous is not None:
+                index.update(previous, record)
+            else:
+                index.add(record)
+        return record, (CREATE, record["emp_id"], record)
+
+    def _apply_update(self, id, updated_employee):
+        """this function will update a record in memory and return it with its journal entry"""
+        employee = self._records.get(id)
+        if employee is None:
+            return None, None
+        # Exclude updating emp_id field
+        updated_data = {
+            key: value
+            for key, value in normalize_record(updated_employee).items()
+            if key != "emp_id"
+        }
+        previous, employee = employee, {**employee, **updated_data}
+        self._records[id] = employee
+        for index in self._structures():
+            index.update(previous, employee)
+        return employee, (UPDATE, id, updated_data)
+
+    def _apply_delete(self, id):
+        """this function will delete a record in memory and return it with its journal entry"""
+        employee_data = self._records.pop(id, None)
+        if employee_data is None:
+            return None, None
+        for index in self._structures():
+            index.remove(employee_data)
+        return employee_data, (DELETE, id, None)
+
+    def _apply_batch(self, apply, items):
+        """this function will apply a mutation to every item and persist them once"""
+        with self._lock.write():
+            self._refresh()
+            results, entries, changes = [], [], []
+            with STORAGE_LATENCY.time(backend=self._backend, operation="index"):
+                for item in items:
+                    result, entry = apply(*item)
+                    results.append(result)
+                    if entry is not None:
+                        entries.append(entry)
+                        op, id, _ = entry
+                        changes.append((op, id, None if op == DELETE else result))
+            self._persist(entries)
+            for change in changes:
+                self.change_log.append(*change)
+            return results
+
+    def add_many(self, new_employees):
+        """
+        Adds several employee records with a single write to disk.
+
+        Args:
+            new_employees (list): The employee records to add.
+
+        Returns:
+            list: The stored records, in the same order.
+        """
+        return self._apply_batch(
+            self._apply_create, [(employee,) for employee in new_employees]
+        )
+
+    def update_many(self, updates):
+        """
+        Updates several employee records with a single write to disk.
+
+        Args:
+            updates (list): (id, updated_employee) pairs.
+
+        Returns:
+            list: The updated records, with None for unknown ids.
+        """
+        return self._apply_batch(self._apply_update, updates)
+
+    def delete_many(self, ids):
+        """
+        Deletes several employee records with a single write to disk.
+
+        Args:
+            ids (list): The ids of the employees to delete.
+
+        Returns:
+            list: The deleted records, with None for unknown ids.
+        """
+        return self._apply_batch(self._apply_delete, [(id,) for id in ids])
@@ -14,7 +14,10 @@ if __name__ == "__main__":
         print("9. Filter Employees by Salary Range")
         print("10. Generate Report salary wise")
         print("11. Generate Report department wise")
-        print("12. Quit")
+        print("12. Add Employees from file")
+        print("13. Edit Employees from file")
+        print("14. Remove Employees from file")
+        print("15. Quit")
 
         choice = int(input("Enter your choice: "))
         match choice:
@@ -44,6 +47,14 @@ if __name__ == "__main__":
             case 11:
                 print(f.generate_report_department_wise())
             case 12:
+                print(f.bulk_add_employees())
+            case 13:
+                print(f.bulk_update_employees())
+            case 14:
+                print(f.bulk_delete_employees())
+            case 15:
                 break
             case _:
                 print("Invalid choice")
+
+    f.close()
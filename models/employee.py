@@ -62,3 +62,22 @@ class Employee(BaseModel):
                 }
             ]
         }
+
+
+# Define an item of a batch update, which must name the employee it updates
+class EmployeeUpdate(Employee):
+    emp_id: str = Field(description="The ID of the employee to update")
+
+
+class BatchStatusEnum(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+
+
+# Define the per-item result of a batch create, update or delete
+class BatchItemResult(BaseModel):
+    emp_id: str
+    status: BatchStatusEnum
+    employee: Optional[Employee] = None
@@ -1,5 +1,16 @@
+import os
+
 import uvicorn
-from apis import app
+
+import helpers.features as f
+
+# Several workers need a backend that can be shared between processes
+WORKERS = int(os.environ.get("EMP_WORKERS", "1"))
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    if WORKERS > 1 and f.STORAGE_BACKEND not in ("sqlite", "mmap"):
+        raise SystemExit(
+            "Set EMP_STORAGE_BACKEND=sqlite, or mmap for a read-only replica, "
+            "to run several workers"
+        )
+    uvicorn.run("apis:app", host="127.0.0.1", port=8000, workers=WORKERS)
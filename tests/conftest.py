@@ -0,0 +1,99 @@
+"""
+Shared fixtures: throwaway stores, the API wired to them, and sample employees
+
+"""
+
+import os
+import tempfile
+
+import pytest
+
+# The API logs to a throwaway file, so logs/emp_log.log is left untouched
+os.environ.setdefault(
+    "EMP_LOG_PATH", os.path.join(tempfile.mkdtemp(prefix="emp-logs-"), "emp_log.log")
+)
+
+import apis  # noqa: E402
+import helpers.features as f  # noqa: E402
+import helpers.report_functions as rep  # noqa: E402
+from benchmarks.generate_roster import generate_roster  # noqa: E402
+from helpers.journal import write_snapshot  # noqa: E402
+from helpers.store import EmployeeStore  # noqa: E402
+from models.employee import Employee  # noqa: E402
+
+ROSTER_SIZE = 300
+
+EMPLOYEE = {
+    "emp_name": "Alice",
+    "emp_gender": "female",
+    "emp_status": "active",
+    "emp_email": "alice@example.com",
+    "emp_address": "123 Main Street",
+    "emp_phone": "9876543210",
+    "emp_designation": "software engineer",
+    "emp_department": "ESBU",
+    "emp_salary": 50000.0,
+    "emp_skills": ["Communication"],
+}
+
+
+@pytest.fixture
+def new_employee():
+    """A valid employee payload without an emp_id."""
+    return dict(EMPLOYEE, emp_skills=list(EMPLOYEE["emp_skills"]))
+
+
+@pytest.fixture
+def make_record():
+    """Builds a complete employee record, with a new emp_id, as the API would store it."""
+
+    def make(**changes):
+        return Employee(**{**EMPLOYEE, **changes}).model_dump(mode="json")
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def roster():
+    """A seeded, Employee-valid roster."""
+    return generate_roster(ROSTER_SIZE)
+
+
+@pytest.fixture
+def data_dir(tmp_path, roster):
+    """A temporary data directory holding the roster as emp.json."""
+    write_snapshot(str(tmp_path / "emp.json"), roster)
+    return tmp_path
+
+
+@pytest.fixture
+def store(data_dir):
+    """A loaded, journaled JSON store over the temporary data directory."""
+    store = EmployeeStore(
+        str(data_dir / "emp.json"), journal_path=str(data_dir / "emp.journal")
+    )
+    store.load()
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def app_store(store, tmp_path, monkeypatch):
+    """The store, installed as the store of the API, with reports written under tmp_path."""
+    monkeypatch.setattr(f, "store", store)
+    monkeypatch.setattr(
+        rep, "DEPARTMENT_EMPLOYEES_REPORT", str(tmp_path / "employees.csv")
+    )
+    monkeypatch.setattr(rep, "DEPARTMENT_SALARY_REPORT", str(tmp_path / "salary.csv"))
+    monkeypatch.setattr(rep, "_built_versions", {})
+    apis.response_cache.clear()
+    yield store
+    apis.response_cache.clear()
+
+
+@pytest.fixture
+def client(app_store):
+    """A test client of the API backed by app_store."""
+    from fastapi.testclient import TestClient
+
+    return TestClient(apis.app)
@@ -0,0 +1,105 @@
+"""
+Batch endpoints: per-item results and validation of whole batches
+
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+import apis
+import helpers.functions as functions
+
+
+def test_batch_create_stores_every_employee(client, app_store, new_employee):
+    response = client.post("/employees:batchCreate", json=[new_employee] * 3)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == ["created"] * 3
+    assert len({result["emp_id"] for result in results}) == 3
+    for result in results:
+        assert app_store.get(result["emp_id"])["emp_name"] == new_employee["emp_name"]
+
+
+def test_batch_update_reports_each_item(client, app_store, roster, new_employee):
+    known = roster[0]["emp_id"]
+    items = [
+        dict(new_employee, emp_id=known, emp_salary=12345.0),
+        dict(new_employee, emp_id="no-such-employee"),
+    ]
+    response = client.post("/employees:batchUpdate", json=items)
+    assert response.status_code == 200
+    assert [(result["emp_id"], result["status"]) for result in response.json()] == [
+        (known, "updated"),
+        ("no-such-employee", "not_found"),
+    ]
+    assert app_store.get(known)["emp_salary"] == 12345.0
+    assert app_store.get("no-such-employee") is None
+
+
+def test_batch_update_requires_an_emp_id_on_every_item(
+    client, app_store, roster, new_employee
+):
+    known = roster[0]["emp_id"]
+    before = app_store.get(known)
+    items = [dict(new_employee, emp_id=known, emp_salary=1.0), new_employee]
+    response = client.post("/employees:batchUpdate", json=items)
+    assert response.status_code == 422
+    assert app_store.get(known) == before
+
+
+def test_batch_delete_reports_each_item(client, app_store, roster):
+    known = roster[1]["emp_id"]
+    response = client.post("/employees:batchDelete", json=[known, "no-such-employee"])
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == [
+        "deleted",
+        "not_found",
+    ]
+    assert app_store.get(known) is None
+
+
+def test_batch_size_is_bounded(client, monkeypatch):
+    assert client.post("/employees:batchDelete", json=[]).status_code == 400
+    monkeypatch.setattr(apis, "MAX_BATCH_SIZE", 2)
+    response = client.post("/employees:batchDelete", json=["a", "b", "c"])
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def cli(client, tmp_path, monkeypatch):
+    """Runs the terminal client's file-based actions against the test API."""
+    path = tmp_path / "employees.json"
+    monkeypatch.setattr(functions, "client", client)
+    monkeypatch.setattr(functions, "take_file_path", lambda: str(path))
+
+    def run(action, items):
+        path.write_text(json.dumps(items), encoding="utf-8")
+        return action()
+
+    return run
+
+
+def test_cli_bulk_update_updates_by_emp_id(cli, app_store, roster, new_employee):
+    known = roster[2]["emp_id"]
+    item = dict(new_employee, emp_id=known, emp_salary=2222.0)
+    results = cli(functions.bulk_update_employees, [item])
+    assert [(result["emp_id"], result["status"]) for result in results] == [
+        (known, "updated")
+    ]
+    assert app_store.get(known)["emp_salary"] == 2222.0
+
+
+def test_cli_bulk_update_rejects_an_item_without_emp_id(
+    cli, client, app_store, roster, new_employee, monkeypatch
+):
+    posted = []
+    monkeypatch.setattr(client, "post", lambda *args, **kwargs: posted.append(args))
+    known = roster[2]["emp_id"]
+    before = app_store.get(known)
+    items = [dict(new_employee, emp_id=known, emp_salary=1.0), new_employee]
+    with pytest.raises(ValidationError):
+        cli(functions.bulk_update_employees, items)
+    assert posted == []
+    assert app_store.get(known) == before
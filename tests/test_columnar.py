@@ -0,0 +1,62 @@
+"""
+Columnar analytics: the EMP_ANALYTICS=columnar path against the store's indexes
+
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import helpers.features as f  # noqa: E402
+
+
+@pytest.fixture
+def columnar(app_store, monkeypatch):
+    """Switches the features to the columnar path, with no copy built yet."""
+    monkeypatch.setattr(f, "_columnar", (None, None))
+
+    def use(analytics):
+        monkeypatch.setattr(f, "ANALYTICS", analytics)
+
+    return use
+
+
+def both(columnar, function, *args):
+    columnar("store")
+    expected = function(*args)
+    columnar("columnar")
+    return expected, function(*args)
+
+
+def test_salary_range_matches_the_index(columnar, roster):
+    salaries = sorted(record["emp_salary"] for record in roster)
+    low, high = salaries[30], salaries[200]
+    expected, actual = both(columnar, f.get_employees_by_salary_range, low, high)
+    assert actual == expected
+    assert len(actual) >= 171
+
+
+def test_department_salary_stats_match_the_aggregates(columnar):
+    expected, actual = both(columnar, f.generate_report_department_salary)
+    assert actual.keys() == expected.keys()
+    for department, stats in expected.items():
+        assert actual[department] == pytest.approx(stats)
+    expected, actual = both(columnar, f.generate_report_department_wise)
+    assert actual == expected
+
+
+def test_salary_buckets_match_the_aggregates(columnar):
+    expected, actual = both(columnar, f.generate_report_salary_wise)
+    assert actual == expected
+
+
+def test_columnar_copy_follows_changes(columnar, app_store, make_record):
+    columnar("columnar")
+    before = f.get_columnar_roster()
+    assert f.get_columnar_roster() is before
+    record = make_record(emp_department="Newly Formed", emp_salary=123.0)
+    app_store.add_many([record])
+    assert f.generate_report_department_salary()["Newly Formed"]["count"] == 1
+    assert f.get_employees_by_salary_range(123.0, 123.0) == [record]
+    app_store.delete_many([record["emp_id"]])
+    assert "Newly Formed" not in f.generate_report_department_salary()
@@ -0,0 +1,40 @@
+"""
+Concurrency check: simultaneous creates through the API are never lost
+
+"""
+
+import asyncio
+
+import httpx
+
+from apis import app
+from helpers.store import EmployeeStore
+
+REQUESTS = 200
+
+
+async def fire_creates(count, employee):
+    """this function will send count create requests at once and return the created ids"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *(client.post("/create_employee", json=employee) for _ in range(count))
+        )
+    return [response.json()["emp_id"] for response in responses if response.is_success]
+
+
+def test_concurrent_creates_survive_compaction(app_store, data_dir, new_employee):
+    # A small threshold makes background compaction run during the burst
+    app_store.compact_max_entries = 50
+    created = asyncio.run(fire_creates(REQUESTS, new_employee))
+    app_store.close()
+
+    reloaded = EmployeeStore(
+        str(data_dir / "emp.json"), journal_path=str(data_dir / "emp.journal")
+    )
+    reloaded.load()
+    stored = {employee["emp_id"] for employee in reloaded.all()}
+    reloaded.close()
+
+    assert len(created) == REQUESTS
+    assert set(created) <= stored
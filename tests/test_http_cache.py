@@ -0,0 +1,104 @@
+"""
+Conditional GET: data-version ETags and the response byte cache
+
+"""
+
+import helpers.features as f
+from helpers.http_cache import ResponseCache
+from helpers.mmap_store import MmapStore, write_record_file
+from helpers.sqlite_store import SqliteStore
+from helpers.store import EmployeeStore
+
+
+def test_unchanged_data_answers_304(client):
+    etag = client.get("/employees").headers["etag"]
+    response = client.get("/employees", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_write_changes_the_etag(client, new_employee):
+    etag = client.get("/employees").headers["etag"]
+    assert client.post("/create_employee", json=new_employee).status_code == 200
+    response = client.get("/employees", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_etag_of_an_earlier_process_never_matches(
+    client, app_store, data_dir, make_record, monkeypatch
+):
+    app_store.add_many([make_record(), make_record()])
+    etag = client.get("/employees").headers["etag"]
+    count = len(app_store.all())
+    app_store.close()
+
+    # A restarted server loads the same files and then takes as many writes
+    restarted = EmployeeStore(
+        str(data_dir / "emp.json"), journal_path=str(data_dir / "emp.journal")
+    )
+    restarted.load()
+    monkeypatch.setattr(f, "store", restarted)
+    restarted.add_many([make_record(), make_record()])
+    try:
+        response = client.get("/employees", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()) == count + 2
+    finally:
+        restarted.close()
+
+
+def test_mmap_workers_share_the_version_of_their_file(tmp_path, roster):
+    path = str(tmp_path / "emp.records")
+    write_record_file(path, roster)
+    workers = [MmapStore(path), MmapStore(path)]
+    for worker in workers:
+        worker.load()
+    before = workers[0].version()
+    assert workers[1].version() == before
+
+    # Each worker maps the republished file on next access
+    write_record_file(path, roster[:10])
+    after = workers[1].version()
+    assert after != before
+    assert workers[0].version() == after
+    for worker in workers:
+        worker.close()
+
+
+def test_new_sqlite_database_starts_from_a_clock_version(tmp_path):
+    store = SqliteStore(str(tmp_path / "emp.sqlite3"))
+    store.load()
+    try:
+        # Far above any count of writes an earlier database could have reached
+        assert store.version() > 10**15
+    finally:
+        store.close()
+
+
+def test_cache_keeps_only_the_current_version():
+    cache = ResponseCache()
+    cache.put("a", 1, b"one", {})
+    cache.put("b", 2, b"two", {})
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 2) == (b"two", {})
+    assert cache.get("b", 1) is None
+
+
+def test_cache_stays_within_its_byte_budget():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", 1, b"12345", {})
+    cache.put("b", 1, b"12345", {})
+    cache.put("c", 1, b"123", {})
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 1) is not None
+    assert cache.get("c", 1) is not None
+
+    cache.put("huge", 1, b"x" * 11, {})
+    assert cache.get("huge", 1) is None
+    assert cache.get("c", 1) is not None
+
+
+def test_cache_stays_within_its_entry_count():
+    cache = ResponseCache(max_responses=2)
+    for key in "abc":
+        cache.put(key, 1, b"x", {})
+    assert [cache.get(key, 1) is not None for key in "abc"] == [False, True, True]
@@ -0,0 +1,83 @@
+"""
+Secondary indexes and aggregates: sorted structures kept in step with changes
+
+"""
+
+import random
+from bisect import bisect_left, bisect_right, insort
+
+import pytest
+
+from helpers.aggregates import GroupSalaryStats
+from helpers.indexes import SortedIndex, SortedList
+
+
+def test_sorted_list_matches_a_plain_sorted_list():
+    rng = random.Random(3)
+    keys = [rng.randrange(500) for _ in range(300)]
+    expected = sorted(keys)
+    # A tiny chunk size makes chunks split and empty out during the test
+    actual = SortedList(keys, chunk_size=4)
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if rng.random() < 0.5:
+            insort(expected, key)
+            actual.add(key)
+        else:
+            position = bisect_left(expected, key)
+            if position < len(expected) and expected[position] == key:
+                del expected[position]
+            actual.discard(key)
+        probe = rng.randrange(-10, 510)
+        assert actual.bisect_left(probe) == bisect_left(expected, probe)
+        assert actual.bisect_right(probe) == bisect_right(expected, probe)
+        if expected:
+            position = rng.randrange(len(expected))
+            assert actual[position] == expected[position]
+            assert actual.slice(position, position + 9) == expected[position:][:9]
+    assert list(actual) == expected
+    assert len(actual) == len(expected)
+    assert actual[0] == expected[0] and actual[-1] == expected[-1]
+    for start, stop in [(0, 5), (3, 40), (len(expected) - 7, len(expected) + 5)]:
+        assert actual.slice(start, stop) == expected[start:stop]
+    with pytest.raises(IndexError):
+        actual[len(expected)]
+
+
+def salary_record(id, salary, department="ESBU"):
+    return {"emp_id": id, "emp_salary": salary, "emp_department": department}
+
+
+def test_sorted_index_queries_follow_updates_and_deletes():
+    index = SortedIndex("emp_salary")
+    index.build([salary_record(f"e{n}", float(n * 10)) for n in range(1, 101)])
+    assert index.range(100, 130) == ["e10", "e11", "e12", "e13"]
+    assert index.count_range(100, 130) == 4
+    assert index.top(2) == ["e100", "e99"]
+    assert index.bottom(2) == ["e1", "e2"]
+    assert index.percentile(50) == 500
+
+    index.update(salary_record("e1", 10.0), salary_record("e1", 5000.0))
+    index.remove(salary_record("e100", 1000.0))
+    index.add(salary_record("e0", 1.0))
+    assert index.top(1) == ["e1"]
+    assert index.bottom(1) == ["e0"]
+    assert index.after((990.0, "e99"), 5) == ["e1"]
+    assert len(index) == 100
+
+
+def test_group_salary_stats_survive_removing_the_extremes():
+    stats = GroupSalaryStats("emp_department")
+    records = [salary_record(f"e{n}", float(n)) for n in range(1, 6)]
+    stats.build(records)
+    stats.remove(records[0])
+    stats.remove(records[-1])
+    assert stats.stats()["ESBU"] == {
+        "count": 3,
+        "total": 9.0,
+        "average": 3.0,
+        "min": 2.0,
+        "max": 4.0,
+    }
+    stats.add(salary_record("e9", 0.5, "HR"))
+    assert stats.stats()["HR"]["min"] == 0.5
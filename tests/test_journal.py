@@ -0,0 +1,141 @@
+"""
+Journal: replay on top of the snapshot and recovery from torn or pending segments
+
+"""
+
+import json
+
+import helpers.store as store_module
+from helpers.journal import CREATE, DELETE, UPDATE, Journal
+from helpers.store import EmployeeStore
+
+
+def test_replay_applies_entries_in_order(tmp_path):
+    journal = Journal(str(tmp_path / "emp.journal"), fsync=False)
+    journal.append_many(
+        [
+            (CREATE, "b", {"emp_id": "b", "emp_name": "Bob"}),
+            (UPDATE, "a", {"emp_name": "Ann"}),
+            (UPDATE, "missing", {"emp_name": "Nobody"}),
+            (DELETE, "c", None),
+        ]
+    )
+    journal.close()
+    snapshot = [
+        {"emp_id": "a", "emp_name": "Alice", "emp_salary": 1.0},
+        {"emp_id": "c", "emp_name": "Carol"},
+    ]
+    records = journal.replay(snapshot)
+    assert records == {
+        "a": {"emp_id": "a", "emp_name": "Ann", "emp_salary": 1.0},
+        "b": {"emp_id": "b", "emp_name": "Bob"},
+    }
+    assert journal.entry_count == 4
+
+
+def test_torn_tail_is_ignored_and_cut_off(tmp_path):
+    path = tmp_path / "emp.journal"
+    journal = Journal(str(path), fsync=False)
+    journal.append(CREATE, "a", {"emp_id": "a"})
+    journal.close()
+    # A crash in the middle of an append leaves a partial last line
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"op": "create", "emp_id": "b", "da')
+
+    assert list(journal.replay([])) == ["a"]
+    journal.open()
+    journal.append(CREATE, "c", {"emp_id": "c"})
+    journal.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["emp_id"] for line in lines] == ["a", "c"]
+
+
+def test_store_reloads_journaled_changes(store, data_dir, make_record):
+    created = make_record(emp_name="Journaled")
+    store.add_many([created])
+    first = next(iter(store.all()))
+    store.update_many([(first["emp_id"], {"emp_salary": 4321.0})])
+    store.delete_many([store.all()[1]["emp_id"]])
+    expected = store.all()
+    store.close()
+
+    reloaded = EmployeeStore(
+        str(data_dir / "emp.json"), journal_path=str(data_dir / "emp.journal")
+    )
+    reloaded.load()
+    try:
+        assert reloaded.all() == expected
+        assert reloaded.get(first["emp_id"])["emp_salary"] == 4321.0
+    finally:
+        reloaded.close()
+
+
+def test_unfinished_compaction_is_folded_in_on_load(store, data_dir, make_record):
+    created = make_record(emp_name="Rotated")
+    store.add_many([created])
+    store.close()
+    # A crash after rotation leaves the old segment next to the snapshot
+    journal_path = data_dir / "emp.journal"
+    journal_path.rename(str(journal_path) + ".old")
+
+    reloaded = EmployeeStore(str(data_dir / "emp.json"), journal_path=str(journal_path))
+    reloaded.load()
+    try:
+        assert reloaded.get(created["emp_id"]) == created
+        assert not (data_dir / "emp.journal.old").exists()
+    finally:
+        reloaded.close()
+
+
+def test_rotate_keeps_the_segment_of_a_failed_compaction(tmp_path):
+    journal = Journal(str(tmp_path / "emp.journal"), fsync=False)
+    journal.append(CREATE, "a", {"emp_id": "a"})
+    journal.rotate()
+    journal.append(CREATE, "b", {"emp_id": "b"})
+    # The compaction of "a" never finished, so its segment is still there
+    journal.rotate()
+    journal.append(UPDATE, "a", {"emp_name": "Ann"})
+    journal.close()
+    assert journal.replay([]) == {
+        "a": {"emp_id": "a", "emp_name": "Ann"},
+        "b": {"emp_id": "b"},
+    }
+
+
+def test_failed_compactions_lose_no_write(store, data_dir, make_record, monkeypatch):
+    first, second = make_record(emp_name="First"), make_record(emp_name="Second")
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    def reload():
+        reloaded = EmployeeStore(
+            str(data_dir / "emp.json"), journal_path=str(data_dir / "emp.journal")
+        )
+        reloaded.load()
+        return reloaded
+
+    with monkeypatch.context() as patch:
+        patch.setattr(store_module, "dump_snapshot", fail)
+        store.add_many([first])
+        store.compact()
+        store.add_many([second])
+        store.compact()
+    assert not (data_dir / "emp.json.compact").exists()
+    store.close()
+
+    # A restart after both failures still finds every write in the journal
+    restarted = reload()
+    assert restarted.get(first["emp_id"]) == first
+    assert restarted.get(second["emp_id"]) == second
+
+    # and a compaction that succeeds folds them into the snapshot
+    restarted.compact()
+    restarted.close()
+    assert not (data_dir / "emp.journal.old").exists()
+    reloaded = reload()
+    try:
+        assert reloaded.get(first["emp_id"]) == first
+        assert reloaded.get(second["emp_id"]) == second
+    finally:
+        reloaded.close()
@@ -0,0 +1,61 @@
+"""
+Load validation: records read from disk are checked against the Employee model
+
+"""
+
+import json
+
+import pytest
+
+from helpers.journal import UPDATE, write_snapshot
+from helpers.mmap_store import MmapStore, write_record_file
+from helpers.store import EmployeeStore
+
+
+def test_valid_records_load_unchanged(store, roster):
+    assert store.all() == roster
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"emp_email": "not an email"},
+        {"emp_salary": -1},
+        {"emp_status": "on leave"},
+        {"emp_id": None},
+    ],
+)
+@pytest.mark.parametrize("binary", [False, True])
+def test_a_malformed_record_in_the_data_file_fails_the_load(
+    tmp_path, roster, change, binary
+):
+    records = [dict(record) for record in roster[:5]]
+    records[3].update(change)
+    path = str(tmp_path / "emp.json")
+    write_snapshot(path, records, binary)
+    store = EmployeeStore(path, journal_path=str(tmp_path / "emp.journal"))
+    with pytest.raises(ValueError, match="Invalid employee record"):
+        store.load()
+    store.close()
+
+
+def test_a_malformed_journal_entry_fails_the_load(data_dir, roster):
+    id = roster[0]["emp_id"]
+    entry = {"op": UPDATE, "emp_id": id, "data": {"emp_phone": "12"}}
+    (data_dir / "emp.journal").write_text(json.dumps(entry) + "\n")
+    store = EmployeeStore(
+        str(data_dir / "emp.json"), journal_path=str(data_dir / "emp.journal")
+    )
+    with pytest.raises(ValueError, match=id):
+        store.load()
+    store.close()
+
+
+def test_a_malformed_record_file_fails_the_load(tmp_path, roster):
+    records = [dict(record) for record in roster[:5]]
+    records[2]["emp_skills"] = "Communication"
+    write_record_file(str(tmp_path / "emp.records"), records)
+    store = MmapStore(str(tmp_path / "emp.records"))
+    with pytest.raises(ValueError, match=records[2]["emp_id"]):
+        store.load()
+    store.close()
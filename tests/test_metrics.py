@@ -0,0 +1,40 @@
+"""
+Metrics: the Prometheus exposition and the labels recorded by the stores
+
+"""
+
+from helpers.journal import write_snapshot
+from helpers.metrics import STORAGE_LATENCY, Registry
+from helpers.store import EmployeeStore
+
+
+def test_counter_headers_and_samples_share_one_name():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs run.", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs run.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="a"} 3',
+    ]
+
+
+def test_http_counters_are_exposed_under_their_header(client):
+    client.get("/employees")
+    lines = client.get("/metrics").text.splitlines()
+    assert "# TYPE emp_http_requests_total counter" in lines
+    assert any(
+        line.startswith('emp_http_requests_total{method="GET",route="/employees"')
+        for line in lines
+    )
+
+
+def test_storage_metrics_name_the_snapshot_format(tmp_path, roster):
+    write_snapshot(str(tmp_path / "emp.json"), roster)
+    store = EmployeeStore(
+        str(tmp_path / "emp.json"), binary_path=str(tmp_path / "emp.snapshot")
+    )
+    store.load()
+    store.close()
+    assert ("binary", "parse") in STORAGE_LATENCY._series
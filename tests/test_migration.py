@@ -0,0 +1,50 @@
+"""
+Migration of the JSON store into SQLite and the change log it leaves behind
+
+"""
+
+import pytest
+
+from helpers.sqlite_store import SqliteStore, migrate_from_json
+from helpers.storage import ChangesExpiredError
+
+
+@pytest.fixture
+def sqlite_path(data_dir):
+    return str(data_dir / "emp.sqlite3")
+
+
+def test_migration_copies_the_roster_without_logging_it(data_dir, sqlite_path, roster):
+    assert migrate_from_json(str(data_dir / "emp.json"), sqlite_path) == len(roster)
+    target = SqliteStore(sqlite_path)
+    target.load()
+    assert target.all() == roster
+    _, head = target.changes(None, 10)
+    assert head == target.version()
+    assert target.changes(head, 10) == ([], head)
+    count = target._connection().execute("SELECT COUNT(*) FROM changes").fetchone()
+    assert count == (0,)
+    target.close()
+
+
+def test_changes_after_a_migration_continue_from_its_version(
+    data_dir, sqlite_path, make_record
+):
+    target = SqliteStore(sqlite_path)
+    target.load()
+    target.add_many([make_record()])
+    _, before = target.changes(None, 10)
+
+    migrate_from_json(str(data_dir / "emp.json"), sqlite_path)
+    _, head = target.changes(None, 10)
+    assert head > before
+    # A client still at a sequence number from before the migration reloads
+    with pytest.raises(ChangesExpiredError):
+        target.changes(before, 10)
+
+    record = make_record()
+    target.add_many([record])
+    changes, latest = target.changes(head, 10)
+    assert latest == head + 1
+    assert [change["emp_id"] for change in changes] == [record["emp_id"]]
+    target.close()
@@ -0,0 +1,71 @@
+"""
+Memory-mapped store: opt-in resident structures answer like the JSON store
+
+"""
+
+import pytest
+
+from helpers.mmap_store import MmapStore, write_record_file
+from helpers.pagination import ORDER_KEYS
+from helpers.query import search_predicates
+
+ALL = (
+    "emp_department",
+    "emp_designation",
+    "emp_status",
+    "emp_gender",
+    "emp_skills",
+    "emp_salary",
+    "emp_id",
+    "created_date",
+    "department_salary",
+    "salary_buckets",
+)
+
+
+@pytest.fixture(params=[ALL, ("emp_id",), ()], ids=["all", "default", "none"])
+def mapped(request, data_dir, roster):
+    write_record_file(str(data_dir / "emp.records"), roster)
+    store = MmapStore(str(data_dir / "emp.records"), resident=request.param)
+    store.load()
+    yield store
+    store.close()
+
+
+def test_only_the_listed_structures_are_resident(data_dir, roster):
+    write_record_file(str(data_dir / "emp.records"), roster)
+    store = MmapStore(str(data_dir / "emp.records"), resident=("emp_skills",))
+    store.load()
+    assert list(store.indexes) == ["emp_skills"]
+    assert store.orderings == {} and store.aggregates == {}
+    assert len(store.indexes["emp_skills"].any_of(roster[0]["emp_skills"])) > 0
+    store.close()
+    with pytest.raises(ValueError):
+        MmapStore(str(data_dir / "emp.records"), resident=("emp_address",))
+
+
+def test_reads_match_the_json_store(mapped, store, roster):
+    record = roster[0]
+    department = record["emp_department"]
+    skill = record["emp_skills"][0]
+    predicates = search_predicates(department=department, min_salary=40000)
+    assert mapped.find_by("emp_department", department) == store.find_by(
+        "emp_department", department
+    )
+    assert mapped.find_by_skills(any_skills=[skill]) == store.find_by_skills(
+        any_skills=[skill]
+    )
+    assert mapped.find_in_range("emp_salary", 30000, 60000) == store.find_in_range(
+        "emp_salary", 30000, 60000
+    )
+    assert mapped.search(predicates) == store.search(predicates)
+    assert mapped.top("emp_salary", 5) == store.top("emp_salary", 5)
+    assert mapped.percentile("emp_salary", 90) == store.percentile("emp_salary", 90)
+    assert mapped.value_counts("emp_status") == store.value_counts("emp_status")
+    assert mapped.department_salary_stats() == store.department_salary_stats()
+    assert mapped.salary_bucket_counts() == store.salary_bucket_counts()
+    for order_by in ORDER_KEYS:
+        first = store.page(order_by, None, 3, predicates)
+        assert mapped.page(order_by, None, 3, predicates) == first
+        after = ORDER_KEYS[order_by](first[-1])
+        assert mapped.page(order_by, after, 4) == store.page(order_by, after, 4)
@@ -0,0 +1,83 @@
+"""
+Name searches: the trigram index, its lazy build and the by-name endpoint
+
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import apis
+import helpers.features as f
+import helpers.indexes as indexes
+from helpers.indexes import TrigramIndex, normalize_name, similarity, trigrams
+
+
+def names_of(roster, ids):
+    by_id = {record["emp_id"]: record for record in roster}
+    return [normalize_name(by_id[id]["emp_name"]) for id in ids]
+
+
+@pytest.fixture
+def index(roster):
+    index = TrigramIndex("emp_name")
+    index.build(roster)
+    return index
+
+
+def test_prefix_and_substring_match_a_scan(index, roster):
+    names = sorted(normalize_name(record["emp_name"]) for record in roster)
+    sample = names[len(names) // 2]
+    for text in (sample[:1], sample[:4], sample):
+        expected = [name for name in names if name.startswith(text)][:20]
+        assert names_of(roster, index.prefix(text, 20)) == expected
+    for text in (sample[1:3], sample[2:7], sample[-4:]):
+        expected = [name for name in names if text in name][:20]
+        assert names_of(roster, index.substring(text, 20)) == expected
+
+
+def test_fuzzy_finds_a_name_despite_a_typo(index, roster):
+    name = normalize_name(roster[7]["emp_name"])
+    typo = name[:2] + name[3:]
+    found = names_of(roster, index.fuzzy(typo, 5))
+    assert name in found
+    query = trigrams(typo)
+    scores = [similarity(query, trigrams(match)) for match in found]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_fuzzy_stays_within_its_budget(index, roster, monkeypatch):
+    # Budgets far below the roster size still find an exact name
+    monkeypatch.setattr(indexes, "FUZZY_MAX_READS", 10)
+    monkeypatch.setattr(indexes, "FUZZY_MAX_CANDIDATES", 5)
+    name = normalize_name(roster[11]["emp_name"])
+    assert names_of(roster, index.fuzzy(name, 1)) == [name]
+    # and no more names than the candidate budget are scored
+    assert len(set(names_of(roster, index.fuzzy(name[:4], 50, 0.1)))) <= 5
+
+
+def test_store_builds_the_name_index_on_first_search(store, make_record):
+    assert len(store.name_index._names) == 0
+    record = make_record(emp_name="Zelda Quartz")
+    store.add_many([make_record(emp_name="Early Bird")])
+    assert len(store.name_index._names) == 0
+
+    assert store.find_by_name("early", "prefix", 5, 0.3)[0]["emp_name"] == "Early Bird"
+    assert len(store.name_index._names) == len(store.all())
+
+    # Once built, the index is kept in step with changes
+    store.add_many([record])
+    assert store.find_by_name("zelda q", "prefix", 5, 0.3) == [record]
+    store.delete_many([record["emp_id"]])
+    assert store.find_by_name("zelda q", "prefix", 5, 0.3) == []
+
+
+def test_by_name_failures_other_than_bad_input_are_server_errors(
+    app_store, monkeypatch
+):
+    def broken(*args):
+        raise KeyError("emp_name")
+
+    monkeypatch.setattr(f, "search_employees_by_name", broken)
+    client = TestClient(apis.app, raise_server_exceptions=False)
+    response = client.get("/employees/by-name", params={"q": "al"})
+    assert response.status_code == 500
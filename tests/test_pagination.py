@@ -0,0 +1,99 @@
+"""
+Keyset pagination: filtered pages off the store orderings and the paged routes
+
+"""
+
+import pytest
+
+from helpers.mmap_store import MmapStore, write_record_file
+from helpers.pagination import DEFAULT_PAGE_SIZE, ORDER_KEYS
+from helpers.query import search_predicates
+from helpers.sqlite_store import SqliteStore
+
+
+@pytest.fixture(params=["json", "sqlite", "mmap"])
+def backend(request, store, data_dir, roster):
+    if request.param == "json":
+        yield store
+        return
+    if request.param == "sqlite":
+        backend = SqliteStore(str(data_dir / "emp.sqlite3"))
+        backend.load()
+        backend.add_many(roster)
+    else:
+        write_record_file(str(data_dir / "emp.records"), roster)
+        backend = MmapStore(str(data_dir / "emp.records"))
+        backend.load()
+    yield backend
+    backend.close()
+
+
+def walk(backend, order_by, limit, predicates):
+    records, after = [], None
+    while True:
+        page = backend.page(order_by, after, limit, predicates)
+        records += page
+        if len(page) < limit:
+            return records
+        after = ORDER_KEYS[order_by](page[-1])
+
+
+@pytest.mark.parametrize("order_by", ["emp_id", "created_date"])
+def test_filtered_pages_cover_the_sorted_matches(backend, roster, order_by):
+    department = roster[0]["emp_department"]
+    skills = sorted({skill for record in roster[:3] for skill in record["emp_skills"]})
+    for criteria in (
+        {"department": department},
+        {"any_skills": skills},
+        {"min_salary": 40000, "max_salary": 90000, "department": department},
+        # Matches nearly everything, so the ordering is walked
+        {"min_salary": 0},
+    ):
+        predicates = search_predicates(**criteria)
+        expected = sorted(
+            (
+                record
+                for record in roster
+                if all(predicate.matches(record) for predicate in predicates)
+            ),
+            key=ORDER_KEYS[order_by],
+        )
+        for limit in (1, 7, 1000):
+            found = walk(backend, order_by, limit, predicates)
+            assert [record["emp_id"] for record in found] == [
+                record["emp_id"] for record in expected
+            ], criteria
+
+
+def test_a_cursor_without_a_limit_returns_a_default_page(client):
+    url = "/salary/0/100000000"
+    first = client.get(url, params={"limit": 1})
+    second = client.get(url, params={"cursor": first.headers["X-Next-Cursor"]})
+    assert len(second.json()) == DEFAULT_PAGE_SIZE
+    assert second.json()[0]["emp_id"] > first.json()[0]["emp_id"]
+
+
+def test_paged_routes_match_their_unpaged_result(client, roster):
+    department = roster[0]["emp_department"]
+    skill = roster[0]["emp_skills"][0]
+    for url, params in (
+        (f"/department/{department}", {}),
+        ("/skills", {"any": skill}),
+        ("/salary/30000/80000", {}),
+        ("/employees/search", {"department": department}),
+    ):
+        whole = client.get(url, params=params).json()
+        paged, cursor = [], None
+        while True:
+            response = client.get(
+                url,
+                params={**params, "limit": 5, **({"cursor": cursor} if cursor else {})},
+            )
+            assert response.status_code == 200
+            paged += response.json()
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert [record["emp_id"] for record in paged] == sorted(
+            record["emp_id"] for record in whole
+        ), url
@@ -0,0 +1,66 @@
+"""
+Query planner: results equal to a scan, driven by the most selective index
+
+"""
+
+import pytest
+
+from helpers.query import Between, Equals, HasSkills, search_predicates
+
+
+def scan(store, predicates):
+    return [
+        record
+        for record in store.all()
+        if all(predicate.matches(record) for predicate in predicates)
+    ]
+
+
+def ids(records):
+    return sorted(record["emp_id"] for record in records)
+
+
+@pytest.mark.parametrize(
+    "criteria",
+    [
+        {},
+        {"department": "ESBU"},
+        {"department": "ESBU", "status": "active"},
+        {"gender": "female", "min_salary": 40000, "max_salary": 90000},
+        {"skills": ["python"], "status": "active"},
+        {"created_from": "2020-01-01", "created_to": "2022-12-31"},
+        {"department": "no such department", "gender": "male"},
+    ],
+)
+def test_search_matches_a_scan(store, criteria):
+    predicates = search_predicates(**criteria)
+    rows, plan = store.search(predicates)
+    assert ids(rows) == ids(scan(store, predicates))
+    assert plan["rows_returned"] == len(rows)
+
+
+def test_most_selective_predicate_drives_the_search(store, roster):
+    rare = roster[0]["emp_salary"]
+    predicates = [
+        Equals("emp_status", roster[0]["emp_status"]),
+        Between("emp_salary", rare, rare),
+    ]
+    rows, plan = store.search(predicates)
+    first = plan["steps"][0]
+    assert first["operation"] == "index lookup"
+    assert first["predicate"] == str(predicates[1])
+    assert roster[0]["emp_id"] in ids(rows)
+
+
+def test_broad_predicates_become_filters(store, roster):
+    department = roster[0]["emp_department"]
+    skill = roster[0]["emp_skills"][0]
+    rows, plan = store.search(
+        [HasSkills([skill]), Equals("emp_department", department)]
+    )
+    operations = [step["operation"] for step in plan["steps"]]
+    assert operations[0] == "index lookup"
+    assert set(operations[1:]) <= {"index intersect", "filter"}
+    assert ids(rows) == ids(
+        scan(store, [HasSkills([skill]), Equals("emp_department", department)])
+    )
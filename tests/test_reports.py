@@ -0,0 +1,64 @@
+"""
+CSV reports: contents and concurrent builds
+
+"""
+
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import helpers.report_functions as rep
+
+THREADS = 8
+ROUNDS = 5
+
+
+def read_report(path):
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_salary_report_has_one_row_per_department(app_store):
+    rows = read_report(rep.department_wise_salary_report())
+    departments = {record["emp_department"] for record in app_store.all()}
+    assert rows[0][0] == "Department"
+    assert {row[0] for row in rows[1:]} == departments
+
+
+def test_report_is_rebuilt_after_a_change(app_store, make_record):
+    path = rep.department_wise_employee_report()
+    before = os.stat(path).st_mtime_ns
+    assert rep.department_wise_employee_report() == path
+    assert os.stat(path).st_mtime_ns == before
+
+    app_store.add_many([make_record(emp_department="Brand New")])
+    rows = read_report(rep.department_wise_employee_report())
+    assert ["Brand New", "1", "Alice"] in [row[:3] for row in rows]
+
+
+def test_concurrent_builds_all_succeed(app_store, make_record):
+    reports = [rep.department_wise_employee_report, rep.department_wise_salary_report]
+    with ThreadPoolExecutor(THREADS) as executor:
+        for round in range(ROUNDS):
+            # Every round starts from a new data version, so every thread
+            # finds the reports out of date and tries to build them
+            app_store.add_many([make_record(emp_name=f"Round {round}")])
+            futures = [
+                executor.submit(reports[thread % len(reports)])
+                for thread in range(THREADS)
+            ]
+            paths = [future.result() for future in futures]
+            for path in paths:
+                assert read_report(path)[0][0] == "Department"
+
+    directory = os.path.dirname(rep.DEPARTMENT_EMPLOYEES_REPORT)
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+    names = ", ".join(row[2] for row in read_report(rep.DEPARTMENT_EMPLOYEES_REPORT))
+    assert f"Round {ROUNDS - 1}" in names
+
+
+def test_reports_are_published_readable_by_everyone(app_store):
+    umask = os.umask(0)
+    os.umask(umask)
+    path = rep.department_wise_salary_report()
+    assert os.stat(path).st_mode & 0o777 == 0o644 & ~umask
@@ -0,0 +1,42 @@
+"""
+Record encoding: the JSON bytes cache and the backends it can be used with
+
+"""
+
+import pytest
+
+from helpers.mmap_store import MmapStore, write_record_file
+from helpers.serialization import RecordEncoder
+from helpers.sqlite_store import SqliteStore
+
+
+@pytest.fixture(params=["json", "sqlite", "mmap"])
+def backend(request, store, data_dir, roster):
+    if request.param == "json":
+        yield store
+        return
+    if request.param == "sqlite":
+        backend = SqliteStore(str(data_dir / "emp.sqlite3"))
+        backend.load()
+        backend.add_many(roster)
+    else:
+        write_record_file(str(data_dir / "emp.records"), roster)
+        backend = MmapStore(str(data_dir / "emp.records"))
+        backend.load()
+    yield backend
+    backend.close()
+
+
+def test_stable_records_matches_what_reads_return(backend, roster):
+    id = roster[0]["emp_id"]
+    assert (backend.get(id) is backend.get(id)) == backend.stable_records
+
+
+def test_encoder_reuses_bytes_until_the_record_changes(make_record):
+    encoder = RecordEncoder()
+    record = make_record()
+    encoded = encoder.encode(record)
+    assert encoder.encode(record) is encoded
+    changed = {**record, "emp_salary": 1.0}
+    assert encoder.encode(changed) != encoded
+    assert encoder.encode_list([record, changed]).startswith(b"[" + encoded + b",")
@@ -0,0 +1,51 @@
+"""
+Binary snapshots: lossless round trips and format detection
+
+"""
+
+import pytest
+
+from helpers.journal import write_snapshot
+from helpers.snapshot import (
+    dumps_binary,
+    is_binary_snapshot,
+    loads_binary,
+    read_records,
+)
+
+
+def test_roster_round_trips(roster):
+    assert loads_binary(dumps_binary(roster)) == roster
+
+
+def test_missing_fields_and_odd_values_round_trip():
+    records = [
+        {"emp_id": "a", "emp_salary": 10.5, "emp_skills": ["x", "y"]},
+        {"emp_id": "b", "emp_salary": None, "emp_department": "HR"},
+        {"emp_id": "c", "emp_salary": 7, "emp_skills": [], "extra": {"k": [1]}},
+        {"emp_department": "HR", "emp_name": "Ünïcode"},
+    ]
+    decoded = loads_binary(dumps_binary(records))
+    assert decoded == records
+    assert [list(record) for record in decoded] == [list(record) for record in records]
+    # Decoded records never share their lists
+    assert decoded[0]["emp_skills"] is not records[0]["emp_skills"]
+
+
+def test_empty_rosters_round_trip():
+    assert loads_binary(dumps_binary([])) == []
+    assert loads_binary(dumps_binary([{}, {}])) == [{}, {}]
+
+
+def test_read_records_detects_the_format(tmp_path, roster):
+    json_path, binary_path = str(tmp_path / "emp.json"), str(tmp_path / "emp.snapshot")
+    write_snapshot(json_path, roster)
+    write_snapshot(binary_path, roster, binary=True)
+    assert not is_binary_snapshot(json_path)
+    assert is_binary_snapshot(binary_path)
+    assert read_records(json_path) == read_records(binary_path) == roster
+
+
+def test_other_data_is_rejected():
+    with pytest.raises(ValueError):
+        loads_binary(b"[]")